@@ -23,10 +23,11 @@ PLEX data provider for getting Halon response messages.
 # Third party
 import threading
 import json
-
 import time
+from collections import OrderedDict
+
+from twisted.internet import defer
 from twisted.internet import reactor
-from twisted.internet.task import deferLater
 
 # PLEX
 from plex.core import log
@@ -52,11 +53,20 @@ class ResponseProvider(BaseCastorProvider):
     Class to support Halond response message consumption.
     """
 
-    RESPONSE_POLLING_COUNT = 5
+    # Seconds a query waits for its response, as long as it was polled
+    RESPONSE_TIMEOUT = 15
+    # Responses kept for the queries still to come, and for how long
+    MAX_RESPONSES = 1000
+    RESPONSE_TTL = 300
+    TIMEOUT_MSG = "File System Status couldn't be retrieved"
 
     def __init__(self, name, description):
         super(ResponseProvider, self).__init__(name, description)
-        self.__message_dict = {}
+        # responseId -> (message, arrival time), oldest first.
+        # Only accessed from the reactor thread.
+        self.__message_dict = OrderedDict()
+        # messageId -> [(Deferred, timeout call)] of the waiting queries
+        self.__pending = {}
 
     def on_create(self):
         """
@@ -92,41 +102,78 @@ class ResponseProvider(BaseCastorProvider):
     def render_query(self, request):
         """ Render query for Response Provider
         """
-        defer_res = deferLater(
-            reactor,
-            1,
-            self._check_and_get_data,
-            ResponseProvider.RESPONSE_POLLING_COUNT,
-            request
-        )
+        defer_res = self._wait_for_response(
+            request.selection_args.get('messageId'))
         defer_res.addCallback(
             ResponseProvider.handle_success_response, request)
         defer_res.addErrback(
             ResponseProvider.handle_error_response, request)
 
-    def _check_and_get_data(self, count_down, request):
-        """ Fetch data from response cache
+    def _wait_for_response(self, message_id):
+        """ Returns a Deferred fired with the response to message_id,
+        right away if it already arrived, else when it arrives or with
+        TIMEOUT_MSG after RESPONSE_TIMEOUT seconds.
         """
-        poll_count = ResponseProvider.RESPONSE_POLLING_COUNT+1 - count_down
-        time.sleep(poll_count)
-        message_id = request.selection_args.get('messageId')
-        self.log_info('Polling for Response. MSG_ID: {}. Re-try_Count: {}'
-                      .format(message_id, poll_count))
-        if message_id in self.__message_dict.keys():
-            return json.dumps(self.__message_dict.get(message_id))
-        elif count_down > 0:
-            return self._check_and_get_data(count_down-1, request)
-        else:
-            err_msg = "File System Status couldn't be retrieved"
-            err_reply = "Timed out while waiting for response" \
-                        " with message=id :{} from halon".format(message_id)
-            self.log_warning(err_reply)
-            return err_msg
+        self._evict_responses()
+        if message_id in self.__message_dict:
+            message, _ = self.__message_dict[message_id]
+            return defer.succeed(json.dumps(message))
+
+        self.log_info('Waiting for Response. MSG_ID: {}'.format(message_id))
+        defer_res = defer.Deferred()
+        timeout_call = reactor.callLater(
+            ResponseProvider.RESPONSE_TIMEOUT,
+            self._response_timed_out,
+            message_id,
+            defer_res
+        )
+        self.__pending.setdefault(message_id, []).append(
+            (defer_res, timeout_call))
+        return defer_res
+
+    def _response_timed_out(self, message_id, defer_res):
+        """ Fires a query's Deferred when no response arrived in time
+        """
+        waiting = self.__pending.get(message_id, [])
+        waiting[:] = [wait for wait in waiting if wait[0] is not defer_res]
+        if not waiting:
+            self.__pending.pop(message_id, None)
+        err_reply = "Timed out while waiting for response" \
+                    " with message=id :{} from halon".format(message_id)
+        self.log_warning(err_reply)
+        defer_res.callback(ResponseProvider.TIMEOUT_MSG)
+
+    def _deliver_response(self, response_id, message):
+        """ Stores a response and fires the Deferreds of the queries
+        waiting for it. Runs on the reactor thread.
+        """
+        self.__message_dict.pop(response_id, None)
+        self.__message_dict[response_id] = (message, time.time())
+        self._evict_responses()
+        result = json.dumps(message)
+        for defer_res, timeout_call in self.__pending.pop(response_id, []):
+            timeout_call.cancel()
+            defer_res.callback(result)
+
+    def _evict_responses(self):
+        """ Drops the responses older than RESPONSE_TTL, then the oldest
+        ones above MAX_RESPONSES.
+        """
+        expired = time.time() - ResponseProvider.RESPONSE_TTL
+        while self.__message_dict:
+            response_id = next(iter(self.__message_dict))
+            _, arrival = self.__message_dict[response_id]
+            if arrival >= expired and \
+                    len(self.__message_dict) <= \
+                    ResponseProvider.MAX_RESPONSES:
+                break
+            del self.__message_dict[response_id]
 
     def put_response_message(self, body):
         """
-        Read the request extract message_id and put the response
-        message to file with file name as message_id.
+        Read the request extract message_id and hand the response
+        message over to the reactor thread, which answers the queries
+        waiting for it.
 
         @param body: message body consumed from rabbit-mq queue
         @type body: str
@@ -152,7 +199,8 @@ class ResponseProvider(BaseCastorProvider):
             log.info("Invalid Msg: response_id not found. Msg: {}".
                      format(message))
             return
-        self.__message_dict[response_id] = message
+        # Called on the consumer thread
+        reactor.callFromThread(self._deliver_response, response_id, message)
         log.info("Updated message dict with:{}:{}".format(
             response_id,
             message)
@@ -13,10 +13,9 @@
 # about this software or licensing, please email opensource@seagate.com or
 # cortx-questions@seagate.com.
 
-from twisted.internet.threads import deferToThread
-
 from sspl_hl.utils.base_castor_provider import BaseCastorProvider
-from sspl_hl.utils.s3admin.s3_utils import get_client
+from sspl_hl.utils.s3admin.s3_utils import get_client, defer_to_pool, \
+    CommandResponse
 from sspl_hl.utils.s3admin.access_key_handler import AccessKeyUtility
 from sspl_hl.utils.message_utils import S3CommandResponse
 from sspl_hl.utils.s3admin.s3_utils import Strings
@@ -33,7 +32,6 @@ class S3AccessKeyProvider(BaseCastorProvider):
         self.mandatory_args = ['command', 'action', 'access_key', 'secret_key',
                                'user_name']
         self.no_of_arguments = 7
-        self.client = None
         self.action = None
 
     def handleRequest(self, request):
@@ -64,30 +62,38 @@ class S3AccessKeyProvider(BaseCastorProvider):
         """
         access_key = request.selection_args.get(Strings.ACCESS_KEY, None)
         secret_key = request.selection_args.get(Strings.SECRET_KEY, None)
-        self.client, response = get_client(access_key, secret_key,
-                                           Strings.IAM_SERVICE)
-        if self.client is None:
+        deferred = defer_to_pool(get_client, access_key, secret_key,
+                                 Strings.IAM_SERVICE)
+        deferred.addCallback(self._handle_client, request)
+        deferred.addErrback(self._handle_failure, request)
+
+    def _handle_client(self, client_response, request):
+        """
+        Execute the request with the client, or reply why there is none.
+        """
+        client, response = client_response
+        if client is None:
             request.reply(S3CommandResponse().get_response_message(response))
         else:
-            self.execute_command(request)
+            self.execute_command(request, client)
 
-    def execute_command(self, request):
+    def execute_command(self, request, client):
         """
         Execute thread based on s3access_key operation request from client.
         """
 
         action = request.selection_args.get('action', None)
-        handler = AccessKeyUtility(self.client, request.selection_args)
+        handler = AccessKeyUtility(client, request.selection_args)
         if action == Strings.CREATE:
-            deferred = deferToThread(handler.create())
+            deferred = defer_to_pool(handler.create)
         elif action == Strings.LIST:
-            deferred = deferToThread(handler.list())
+            deferred = defer_to_pool(handler.list)
         elif action == Strings.MODIFY:
-            deferred = deferToThread(handler.modify())
+            deferred = defer_to_pool(handler.modify)
         elif action == Strings.REMOVE:
-            deferred = deferToThread(handler.remove())
+            deferred = defer_to_pool(handler.remove)
         deferred.addCallback(self._handle_success, request)
-        deferred.addErrback(self._handle_failure)
+        deferred.addErrback(self._handle_failure, request)
 
     def _handle_success(self, access_key_info, request):
         """Handle operation response received from S3 server.
@@ -98,9 +104,14 @@ class S3AccessKeyProvider(BaseCastorProvider):
         msg = response.get_response_message(access_key_info)
         request.reply(msg)
 
-    def _handle_failure(self, failure):
+    def _handle_failure(self, failure, request):
         """Handle failure case for  all operations.
 
-        This will be called when operation was failed due to unknwon reasons.
+        This will be called when operation was failed due to unknwon reasons,
+        the reason is sent back as an error response.
         """
-        self.log_info("Failed " + str(failure))
+        self.log_warning("Failed " + str(failure))
+        response = S3CommandResponse()
+        msg = response.get_response_message(
+            CommandResponse(status=-1, msg=failure.getErrorMessage()))
+        request.reply(msg)
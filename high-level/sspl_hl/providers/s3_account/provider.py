@@ -15,10 +15,9 @@
 
 
 
-from twisted.internet.threads import deferToThread
-
 from sspl_hl.utils.base_castor_provider import BaseCastorProvider
-from sspl_hl.utils.s3admin.s3_utils import get_client
+from sspl_hl.utils.s3admin.s3_utils import get_client, defer_to_pool, \
+    CommandResponse
 from sspl_hl.utils.s3admin.account_handler import AccountUtility
 from sspl_hl.utils.message_utils import S3CommandResponse
 from sspl_hl.utils.strings import Strings
@@ -36,7 +35,6 @@ class S3AccountProvider(BaseCastorProvider):
         self.valid_subcommands = [Strings.CREATE, Strings.LIST, Strings.REMOVE]
         self.mandatory_args = ['command', 'action']
         self.no_of_arguments = 7
-        self.client = None
 
     def handleRequest(self, request):
         try:
@@ -56,27 +54,35 @@ class S3AccountProvider(BaseCastorProvider):
         """
         Process the request bundle request based on the command.
         """
-        self.client, response = get_client(service=Strings.IAM_SERVICE)
-        if self.client is None:
+        deferred = defer_to_pool(get_client, service=Strings.IAM_SERVICE)
+        deferred.addCallback(self._handle_client, request)
+        deferred.addErrback(self._handle_failure, request)
+
+    def _handle_client(self, client_response, request):
+        """
+        Execute the request with the client, or reply why there is none.
+        """
+        client, response = client_response
+        if client is None:
             request.reply(S3CommandResponse().get_response_message(response))
         else:
-            self.execute_command(request)
+            self.execute_command(request, client)
 
-    def execute_command(self, request):
+    def execute_command(self, request, client):
         """
         Execute operation based on request.
         """
         action = request.selection_args.get('action', None)
-        account_handler = AccountUtility(self.client, request.selection_args)
+        account_handler = AccountUtility(client, request.selection_args)
         if action == Strings.CREATE:
-            deferred = deferToThread(account_handler.create())
+            deferred = defer_to_pool(account_handler.create)
         elif action == Strings.LIST:
-            deferred = deferToThread(account_handler.list())
+            deferred = defer_to_pool(account_handler.list)
         elif action == Strings.REMOVE:
-            deferred = deferToThread(account_handler.remove())
+            deferred = defer_to_pool(account_handler.remove)
 
         deferred.addCallback(self._handle_success, request)
-        deferred.addErrback(self._handle_failure)
+        deferred.addErrback(self._handle_failure, request)
 
     def _handle_success(self, account_info, request):
         """Handle operation response received from S3 server.
@@ -87,9 +93,14 @@ class S3AccountProvider(BaseCastorProvider):
         msg = response.get_response_message(account_info)
         request.reply(msg)
 
-    def _handle_failure(self, failure):
+    def _handle_failure(self, failure, request):
         """Handle failure case for  all operations.
 
-        This will be called when operation was failed due to unknwon reasons.
+        This will be called when operation was failed due to unknwon reasons,
+        the reason is sent back as an error response.
         """
-        self.log_info("Failed " + str(failure))
+        self.log_warning("Failed " + str(failure))
+        response = S3CommandResponse()
+        msg = response.get_response_message(
+            CommandResponse(status=-1, msg=failure.getErrorMessage()))
+        request.reply(msg)
@@ -23,10 +23,17 @@ import logging
 import socket
 import hmac
 import base64
+import threading
+import time
+from collections import OrderedDict
 from hashlib import sha1
 
 import yaml
 from boto3.session import Session
+from botocore.config import Config
+from twisted.internet import reactor
+from twisted.internet.threads import deferToThreadPool
+from twisted.python.threadpool import ThreadPool
 import plex.core.log as logger
 import boto3
 
@@ -35,6 +42,37 @@ from sspl_hl.utils.strings import Strings
 # Default timeout for checking server is available or not
 socket.setdefaulttimeout(15)
 
+# Threads running the S3 admin handlers off the reactor
+S3_THREAD_POOL_SIZE = 10
+# Seconds a reachable server is used before being checked again
+ENDPOINT_TTL = 60
+# Clients kept for reuse, one per service, endpoint and credentials
+MAX_CLIENTS = 32
+
+_thread_pool = None
+# service -> (url, expiry time)
+_endpoints = {}
+# (service, url, access key, secret key digest) -> client, oldest first
+_clients = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def defer_to_pool(func, *args, **kwargs):
+    """
+    Run func in the S3 admin thread pool.
+
+    Returns a Deferred fired on the reactor with its result. At most
+    S3_THREAD_POOL_SIZE calls run at once, the others are queued.
+    """
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPool(maxthreads=S3_THREAD_POOL_SIZE,
+                                  name='s3admin')
+        _thread_pool.start()
+        reactor.addSystemEventTrigger('during', 'shutdown',
+                                      _thread_pool.stop)
+    return deferToThreadPool(reactor, _thread_pool, func, *args, **kwargs)
+
 
 def enable_boto_logging():
     """
@@ -60,7 +98,14 @@ def get_session(access_key=None, secret_key=None, session_token=None):
 def get_endpoint(service):
     """
     This will find IAM Server endpoint.
+
+    The first server answering is used for ENDPOINT_TTL seconds.
     """
+    with _cache_lock:
+        url, expiry = _endpoints.get(service, (None, 0))
+    if time.time() < expiry:
+        return url
+
     endpoints_file = os.path.join(Strings.ENDPOINTS_CONFIG_PATH)
     with open(endpoints_file, 'r') as f:
         endpoints = yaml.safe_load(f)
@@ -80,6 +125,8 @@ def get_endpoint(service):
                 logger.debug("Checking %s " % url)
                 urllib.urlopen(url).getcode()
                 found = True
+                with _cache_lock:
+                    _endpoints[service] = (url, time.time() + ENDPOINT_TTL)
                 return url
             except Exception:
                 logger.debug("Server %s is not running. Trying next" % url)
@@ -95,12 +142,28 @@ def get_client(access_key=None, secret_key=None, service=None):
     Create IAM Client based on Access and Secret Key.
 
         This client will be used for all S3 related operations.
+        Clients are thread safe and keep their connections open, the
+        MAX_CLIENTS last used ones are reused.
     """
     try:
-        session = get_session(access_key, secret_key)
         url = get_endpoint(service)
-        return session.client(service, use_ssl='false',
-                              endpoint_url=url), None
+        key = (service, url, access_key,
+               sha1((secret_key or '').encode('UTF-8')).hexdigest())
+        with _cache_lock:
+            client = _clients.pop(key, None)
+            if client is not None:
+                _clients[key] = client
+                return client, None
+
+        session = get_session(access_key, secret_key)
+        config = Config(max_pool_connections=S3_THREAD_POOL_SIZE)
+        client = session.client(service, use_ssl='false',
+                                endpoint_url=url, config=config)
+        with _cache_lock:
+            _clients[key] = client
+            while len(_clients) > MAX_CLIENTS:
+                _clients.popitem(last=False)
+        return client, None
     except IOError as ex:
         logger.info("Endpoints File not found")
         response = CommandResponse(status=-1, msg="IAM Auth servers "
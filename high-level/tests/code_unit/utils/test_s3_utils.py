@@ -0,0 +1,66 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+from sspl_hl.utils.s3admin import s3_utils
+import unittest
+from mock import MagicMock, mock_open, patch
+
+ENDPOINTS = 'iam:\n  - http://iam1:9080\n  - http://iam2:9080\n'
+
+
+@patch('sspl_hl.utils.s3admin.s3_utils.open', mock_open(read_data=ENDPOINTS),
+       create=True)
+@patch('sspl_hl.utils.s3admin.s3_utils.urllib')
+class TestS3Utils(unittest.TestCase):
+    """Test cases for the S3 endpoint and client caches of s3_utils"""
+    def setUp(self):
+        s3_utils._endpoints.clear()
+        s3_utils._clients.clear()
+
+    def test_get_endpoint_skips_unreachable(self, urllib_mock):
+        urllib_mock.urlopen.side_effect = [IOError('refused'), MagicMock()]
+        self.assertEqual(s3_utils.get_endpoint('iam'), 'http://iam2:9080')
+
+    @patch('sspl_hl.utils.s3admin.s3_utils.time')
+    def test_get_endpoint_cached(self, time_mock, urllib_mock):
+        time_mock.time.return_value = 1000
+        s3_utils.get_endpoint('iam')
+        s3_utils.get_endpoint('iam')
+        self.assertEqual(urllib_mock.urlopen.call_count, 1)
+        time_mock.time.return_value = 1000 + s3_utils.ENDPOINT_TTL
+        s3_utils.get_endpoint('iam')
+        self.assertEqual(urllib_mock.urlopen.call_count, 2)
+
+    @patch('sspl_hl.utils.s3admin.s3_utils.get_session')
+    def test_get_client_reused(self, session_mock, urllib_mock):
+        client, _ = s3_utils.get_client('key', 'secret', 'iam')
+        self.assertEqual(s3_utils.get_client('key', 'secret', 'iam'),
+                         (client, None))
+        self.assertEqual(session_mock.call_count, 1)
+        s3_utils.get_client('key', 'other secret', 'iam')
+        self.assertEqual(session_mock.call_count, 2)
+
+    @patch('sspl_hl.utils.s3admin.s3_utils.get_session')
+    def test_get_client_evicted(self, session_mock, urllib_mock):
+        with patch.object(s3_utils, 'MAX_CLIENTS', 2):
+            for access_key in ('key1', 'key2', 'key3'):
+                s3_utils.get_client(access_key, 'secret', 'iam')
+            s3_utils.get_client('key3', 'secret', 'iam')
+            self.assertEqual(session_mock.call_count, 3)
+            s3_utils.get_client('key1', 'secret', 'iam')
+            self.assertEqual(session_mock.call_count, 4)
+
+if __name__ == '__main__':
+    unittest.main()
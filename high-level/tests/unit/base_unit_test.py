@@ -22,6 +22,7 @@ import json
 
 # Third party imports
 import mock
+from twisted.internet import defer
 
 # Local imports
 from plex.util.concurrent.single_thread_executor import SingleThreadExecutor
@@ -48,6 +49,21 @@ class _MyDatetime(datetime.datetime):
 datetime.datetime = _MyDatetime
 
 
+def call_in_caller(func, *args, **kwargs):
+    """ side_effect of a patched defer_to_pool calling func right away,
+    the mock returns its return_value
+    """
+    func(*args, **kwargs)
+    return mock.DEFAULT
+
+
+def defer_in_caller(func, *args, **kwargs):
+    """ side_effect of a patched defer_to_pool calling func right away
+    and returning its result in a Deferred
+    """
+    return defer.maybeDeferred(func, *args, **kwargs)
+
+
 class BaseUnitTest(unittest.TestCase):
     # pylint: disable=too-many-public-methods
 
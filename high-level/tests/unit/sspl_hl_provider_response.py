@@ -0,0 +1,122 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+""" Unit tests for sspl_hl.providers.response.provider """
+import json
+import unittest
+import mock
+from twisted.internet import task
+from base_unit_test import BaseUnitTest
+from sspl_hl.providers.response.provider import ResponseProvider
+
+
+# pylint: disable=too-many-public-methods
+class SsplHlProviderResponse(BaseUnitTest):
+    """
+    Test methods of the
+    sspl_hl.providers.response.provider.ResponseProvider object.
+    """
+
+    def setUp(self):
+        super(SsplHlProviderResponse, self).setUp()
+        # Drives the timeouts, callFromThread runs the call right away
+        self.clock = task.Clock()
+        self.clock.callFromThread = lambda fn, *args: fn(*args)
+        self._patch_reactor = mock.patch(
+            'sspl_hl.providers.response.provider.reactor', self.clock)
+        self._patch_reactor.start()
+        self.provider = ResponseProvider('response', '')
+
+    def tearDown(self):
+        self._patch_reactor.stop()
+        super(SsplHlProviderResponse, self).tearDown()
+
+    @staticmethod
+    def _response(response_id):
+        message = {'responseId': response_id, 'status': 'ok'}
+        return json.dumps({'message': message}), message
+
+    def _query(self, message_id):
+        request_mock = mock.MagicMock()
+        request_mock.selection_args = {'messageId': message_id}
+        self.provider.render_query(request=request_mock)
+        return request_mock
+
+    def test_response_before_query(self):
+        """ A response which already arrived is replied right away
+        """
+        body, message = self._response('msg_1')
+        self.provider.put_response_message(body)
+        request_mock = self._query('msg_1')
+        request_mock.reply.assert_called_once_with([json.dumps(message)])
+
+    def test_response_after_query(self):
+        """ All the queries waiting for a response are replied when it
+        arrives, without waiting for the timeout
+        """
+        first, second = self._query('msg_1'), self._query('msg_1')
+        self.assertEqual(first.reply.call_count, 0)
+        body, message = self._response('msg_1')
+        self.provider.put_response_message(body)
+        first.reply.assert_called_once_with([json.dumps(message)])
+        second.reply.assert_called_once_with([json.dumps(message)])
+        self.assertEqual(self.clock.getDelayedCalls(), [])
+
+    def test_timeout(self):
+        """ A query with no response is replied after RESPONSE_TIMEOUT
+        """
+        request_mock = self._query('msg_1')
+        self.clock.advance(ResponseProvider.RESPONSE_TIMEOUT - 1)
+        self.assertEqual(request_mock.reply.call_count, 0)
+        self.clock.advance(1)
+        request_mock.reply.assert_called_once_with(
+            [ResponseProvider.TIMEOUT_MSG])
+
+        # Late responses are kept for the next query
+        body, message = self._response('msg_1')
+        self.provider.put_response_message(body)
+        self.assertEqual(request_mock.reply.call_count, 1)
+        self._query('msg_1').reply.assert_called_once_with(
+            [json.dumps(message)])
+
+    def test_invalid_response(self):
+        """ Messages without a responseId are ignored
+        """
+        request_mock = self._query('msg_1')
+        self.provider.put_response_message('not json')
+        self.provider.put_response_message(json.dumps({'message': {}}))
+        self.assertEqual(request_mock.reply.call_count, 0)
+
+    def test_response_eviction(self):
+        """ Unclaimed responses are dropped after RESPONSE_TTL and above
+        MAX_RESPONSES
+        """
+        body, _ = self._response('msg_1')
+        with mock.patch('time.time', return_value=1000):
+            self.provider.put_response_message(body)
+        with mock.patch('time.time',
+                        return_value=1001 + ResponseProvider.RESPONSE_TTL):
+            request_mock = self._query('msg_1')
+        self.assertEqual(request_mock.reply.call_count, 0)
+
+        with mock.patch.object(ResponseProvider, 'MAX_RESPONSES', 2):
+            for response_id in ('msg_2', 'msg_3', 'msg_4'):
+                self.provider.put_response_message(
+                    self._response(response_id)[0])
+            self.assertEqual(self._query('msg_2').reply.call_count, 0)
+            self.assertEqual(self._query('msg_4').reply.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
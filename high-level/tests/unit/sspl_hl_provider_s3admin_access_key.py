@@ -17,8 +17,9 @@
 
 import unittest
 from twisted.internet import defer
+from twisted.python import failure
 from sspl_hl.providers.s3_access_key.provider import S3AccessKeyProvider
-from base_unit_test import BaseUnitTest
+from base_unit_test import BaseUnitTest, call_in_caller, defer_in_caller
 import mock
 
 
@@ -83,8 +84,10 @@ class SsplHlProviderS3AccessKey_create(BaseUnitTest):
         "SecretKey": "EChcJFni8rANscumlQnvCYUPtg3Yr2cT3lI_wx_i"
     }
 
+    @mock.patch('sspl_hl.providers.s3_access_key.provider.defer_to_pool',
+                side_effect=defer_in_caller)
     @mock.patch('sspl_hl.providers.s3_access_key.provider.get_client')
-    def test_process_s3admin_request_success(self, get_client_mock):
+    def test_process_s3admin_request_success(self, get_client_mock, _):
         """ Ensure process the request bundle request based on the command
         """
         get_client_mock.return_value = mock.MagicMock(), "Fake_response"
@@ -110,8 +113,10 @@ class SsplHlProviderS3AccessKey_create(BaseUnitTest):
             self.assertEqual(s3access_key_provider.execute_command.call_count,
                              1)
 
+    @mock.patch('sspl_hl.providers.s3_access_key.provider.defer_to_pool',
+                side_effect=defer_in_caller)
     @mock.patch('sspl_hl.providers.s3_access_key.provider.get_client')
-    def test_process_s3admin_request_failure(self, get_client_mock):
+    def test_process_s3admin_request_failure(self, get_client_mock, _):
         """ Ensure process the request bundle request based on the command
         """
         get_client_mock.return_value = None, "Fake_response"
@@ -154,14 +159,16 @@ class SsplHlProviderS3AccessKey_create(BaseUnitTest):
                                                     "handling access_key")
         s3access_key_provider._handle_success = mock.MagicMock()
         with mock.patch(
-                "sspl_hl.providers.s3_access_key.provider.deferToThread",
+                "sspl_hl.providers.s3_access_key.provider.defer_to_pool",
+                side_effect=call_in_caller,
                 return_value=defer.succeed(
                     self.access_key_create_response)):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "access_key_handler",
                                               "AccessKeyUtility.create")) \
                     as access_key_create_handler_mock:
-                s3access_key_provider.execute_command(request_mock)
+                s3access_key_provider.execute_command(request_mock,
+                                                      mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'create')
                 s3access_key_provider._handle_success.assert_called_once_with(
@@ -184,13 +191,15 @@ class SsplHlProviderS3AccessKey_create(BaseUnitTest):
                                                     "handling access_key")
         s3access_key_provider._handle_failure = mock.MagicMock()
         with mock.patch(
-                "sspl_hl.providers.s3_access_key.provider.deferToThread",
+                "sspl_hl.providers.s3_access_key.provider.defer_to_pool",
+                side_effect=call_in_caller,
                 return_value=defer.fail(FakeError('error'))):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "access_key_handler",
                                               "AccessKeyUtility.create")) \
                     as access_key_create_handler_mock:
-                s3access_key_provider.execute_command(request_mock)
+                s3access_key_provider.execute_command(request_mock,
+                                                      mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'create')
                 self.assertEqual(
@@ -214,6 +223,20 @@ class SsplHlProviderS3AccessKey_create(BaseUnitTest):
                 self.access_key_create_response)
             self.assertEqual(request_mock.reply.call_count, 1)
 
+    def test_handle_failure(self):
+        """ When access_key create fails, ensure that the reason of the failure is
+        sent back to the client.
+        """
+        request_mock = mock.MagicMock()
+        s3access_key_provider = S3AccessKeyProvider("access_key",
+                                                    "handling access_key")
+        s3access_key_provider._handle_failure(
+            failure.Failure(FakeError('error')), request_mock)
+        self.assertEqual(request_mock.reply.call_count, 1)
+        message = request_mock.reply.call_args[0][0]['message']
+        self.assertEqual(message['status'], -1)
+        self.assertIn('error', message['reason'])
+
 
 class SsplHlProviderS3AccessKey_list(BaseUnitTest):
     access_key_list_response = [{
@@ -244,14 +267,16 @@ class SsplHlProviderS3AccessKey_list(BaseUnitTest):
                                                     "handling access_key")
         s3access_key_provider._handle_success = mock.MagicMock()
         with mock.patch(
-                "sspl_hl.providers.s3_access_key.provider.deferToThread",
+                "sspl_hl.providers.s3_access_key.provider.defer_to_pool",
+                side_effect=call_in_caller,
                 return_value=defer.succeed(
                     self.access_key_list_response)):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "access_key_handler",
                                               "AccessKeyUtility.list")) \
                     as access_key_list_handler_mock:
-                s3access_key_provider.execute_command(request_mock)
+                s3access_key_provider.execute_command(request_mock,
+                                                      mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'list')
                 s3access_key_provider._handle_success.assert_called_once_with(
@@ -297,14 +322,16 @@ class SsplHlProviderS3AccessKey_modify(BaseUnitTest):
                                                     "handling access_key")
         s3access_key_provider._handle_success = mock.MagicMock()
         with mock.patch(
-                "sspl_hl.providers.s3_access_key.provider.deferToThread",
+                "sspl_hl.providers.s3_access_key.provider.defer_to_pool",
+                side_effect=call_in_caller,
                 return_value=defer.succeed(
                     SsplHlProviderS3AccessKey_list.access_key_list_response)):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "access_key_handler",
                                               "AccessKeyUtility.modify")) \
                     as access_key_modify_handler_mock:
-                s3access_key_provider.execute_command(request_mock)
+                s3access_key_provider.execute_command(request_mock,
+                                                      mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'modify')
                 s3access_key_provider._handle_success.assert_called_once_with(
@@ -349,14 +376,16 @@ class SsplHlProviderS3AccessKey_remove(BaseUnitTest):
                                                     "handling access_key")
         s3access_key_provider._handle_success = mock.MagicMock()
         with mock.patch(
-                "sspl_hl.providers.s3_access_key.provider.deferToThread",
+                "sspl_hl.providers.s3_access_key.provider.defer_to_pool",
+                side_effect=call_in_caller,
                 return_value=defer.succeed(
                     SsplHlProviderS3AccessKey_list.access_key_list_response)):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "access_key_handler",
                                               "AccessKeyUtility.remove")) \
                     as access_key_remove_handler_mock:
-                s3access_key_provider.execute_command(request_mock)
+                s3access_key_provider.execute_command(request_mock,
+                                                      mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'remove')
                 s3access_key_provider._handle_success.assert_called_once_with(
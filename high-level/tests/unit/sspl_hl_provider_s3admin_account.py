@@ -17,8 +17,9 @@
 
 import unittest
 from twisted.internet import defer
+from twisted.python import failure
 from sspl_hl.providers.s3_account.provider import S3AccountProvider
-from base_unit_test import BaseUnitTest
+from base_unit_test import BaseUnitTest, call_in_caller, defer_in_caller
 import mock
 
 
@@ -73,8 +74,10 @@ class SsplHlProviderS3Account_create(BaseUnitTest):
         "AccountId": "hzqUcLbrQ2ybs5Q3ycX9xA"
     }
 
+    @mock.patch('sspl_hl.providers.s3_account.provider.defer_to_pool',
+                side_effect=defer_in_caller)
     @mock.patch('sspl_hl.providers.s3_account.provider.get_client')
-    def test_process_s3admin_request_success(self, get_client_mock):
+    def test_process_s3admin_request_success(self, get_client_mock, _):
         """ Ensure request is parsed and directed towards further respective
         functions according to action parameter.
         """
@@ -94,8 +97,10 @@ class SsplHlProviderS3Account_create(BaseUnitTest):
             self.assertEqual(request_mock.reply.call_count, 0)
             self.assertEqual(s3account_provider.execute_command.call_count, 1)
 
+    @mock.patch('sspl_hl.providers.s3_account.provider.defer_to_pool',
+                side_effect=defer_in_caller)
     @mock.patch('sspl_hl.providers.s3_account.provider.get_client')
-    def test_process_s3admin_request_failure(self, get_client_mock):
+    def test_process_s3admin_request_failure(self, get_client_mock, _):
         """ Ensure request is parsed and directed towards further respective
         functions according to action parameter.
         """
@@ -126,14 +131,16 @@ class SsplHlProviderS3Account_create(BaseUnitTest):
         request_mock.selection_args = command_args
         s3account_provider = S3AccountProvider("account", "handling account")
         s3account_provider._handle_success = mock.MagicMock()
-        with mock.patch("sspl_hl.providers.s3_account.provider.deferToThread",
+        with mock.patch("sspl_hl.providers.s3_account.provider.defer_to_pool",
+                        side_effect=call_in_caller,
                         return_value=defer.succeed(
                             self.account_create_response)):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "account_handler",
                                               "AccountUtility.create")) \
                     as account_create_handler_mock:
-                s3account_provider.execute_command(request_mock)
+                s3account_provider.execute_command(request_mock,
+                                                   mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'create')
                 self.assertEqual(account_create_handler_mock.call_count, 1)
@@ -150,13 +157,15 @@ class SsplHlProviderS3Account_create(BaseUnitTest):
         request_mock.selection_args = command_args
         s3account_provider = S3AccountProvider("account", "handling account")
         s3account_provider._handle_failure = mock.MagicMock()
-        with mock.patch("sspl_hl.providers.s3_account.provider.deferToThread",
+        with mock.patch("sspl_hl.providers.s3_account.provider.defer_to_pool",
+                        side_effect=call_in_caller,
                         return_value=defer.fail(FakeError('error'))):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "account_handler",
                                               "AccountUtility.create")) \
                     as account_create_handler_mock:
-                s3account_provider.execute_command(request_mock)
+                s3account_provider.execute_command(request_mock,
+                                                   mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'create')
                 self.assertEqual(account_create_handler_mock.call_count, 1)
@@ -206,14 +215,16 @@ class SsplHlProviderS3Account_list(BaseUnitTest):
         request_mock.selection_args = command_args
         s3account_provider = S3AccountProvider("account", "handling account")
         s3account_provider._handle_success = mock.MagicMock()
-        with mock.patch("sspl_hl.providers.s3_account.provider.deferToThread",
+        with mock.patch("sspl_hl.providers.s3_account.provider.defer_to_pool",
+                        side_effect=call_in_caller,
                         return_value=defer.succeed(
                             self.account_list_response)):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "account_handler",
                                               "AccountUtility.list")) \
                     as account_list_handler_mock:
-                s3account_provider.execute_command(request_mock)
+                s3account_provider.execute_command(request_mock,
+                                                   mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'list')
                 self.assertEqual(account_list_handler_mock.call_count, 1)
@@ -231,13 +242,15 @@ class SsplHlProviderS3Account_list(BaseUnitTest):
         request_mock.selection_args = command_args
         s3account_provider = S3AccountProvider("account", "handling account")
         s3account_provider._handle_list_failure = mock.MagicMock()
-        with mock.patch("sspl_hl.providers.s3_account.provider.deferToThread",
+        with mock.patch("sspl_hl.providers.s3_account.provider.defer_to_pool",
+                        side_effect=call_in_caller,
                         return_value=defer.fail(FakeError('error'))):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "account_handler",
                                               "AccountUtility.list")) \
                     as account_list_handler_mock:
-                s3account_provider.execute_command(request_mock)
+                s3account_provider.execute_command(request_mock,
+                                                   mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'list')
                 self.assertEqual(account_list_handler_mock.call_count, 1)
@@ -262,8 +275,10 @@ class SsplHlProviderS3Account_list(BaseUnitTest):
 class SsplHlProviderS3Account_remove(BaseUnitTest):
     account_remove_response = "Fake_Response"
 
+    @mock.patch('sspl_hl.providers.s3_account.provider.defer_to_pool',
+                side_effect=defer_in_caller)
     @mock.patch('sspl_hl.providers.s3_account.provider.get_client')
-    def test_process_s3admin_request_success(self, get_client_mock):
+    def test_process_s3admin_request_success(self, get_client_mock, _):
         """ Ensure request is parsed and directed towards further respective
         functions according to action parameter.
         """
@@ -284,8 +299,10 @@ class SsplHlProviderS3Account_remove(BaseUnitTest):
             self.assertEqual(request_mock.reply.call_count, 0)
             self.assertEqual(s3account_provider.execute_command.call_count, 1)
 
+    @mock.patch('sspl_hl.providers.s3_account.provider.defer_to_pool',
+                side_effect=defer_in_caller)
     @mock.patch('sspl_hl.providers.s3_account.provider.get_client')
-    def test_process_s3admin_request_failure(self, get_client_mock):
+    def test_process_s3admin_request_failure(self, get_client_mock, _):
         """ Ensure request is parsed and directed towards further respective
         functions according to action parameter.
         """
@@ -318,14 +335,16 @@ class SsplHlProviderS3Account_remove(BaseUnitTest):
         request_mock.selection_args = command_args
         s3account_provider = S3AccountProvider("account", "handling account")
         s3account_provider._handle_success = mock.MagicMock()
-        with mock.patch("sspl_hl.providers.s3_account.provider.deferToThread",
+        with mock.patch("sspl_hl.providers.s3_account.provider.defer_to_pool",
+                        side_effect=call_in_caller,
                         return_value=defer.succeed(
                             self.account_remove_response)):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "account_handler",
                                               "AccountUtility.remove")) \
                     as account_remove_handler_mock:
-                s3account_provider.execute_command(request_mock)
+                s3account_provider.execute_command(request_mock,
+                                                   mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'remove')
                 self.assertEqual(account_remove_handler_mock.call_count, 1)
@@ -343,13 +362,15 @@ class SsplHlProviderS3Account_remove(BaseUnitTest):
         request_mock.selection_args = command_args
         s3account_provider = S3AccountProvider("account", "handling account")
         s3account_provider._handle_failure = mock.MagicMock()
-        with mock.patch("sspl_hl.providers.s3_account.provider.deferToThread",
+        with mock.patch("sspl_hl.providers.s3_account.provider.defer_to_pool",
+                        side_effect=call_in_caller,
                         return_value=defer.fail(FakeError('error'))):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "account_handler",
                                               "AccountUtility.remove")) \
                     as account_remove_handler_mock:
-                s3account_provider.execute_command(request_mock)
+                s3account_provider.execute_command(request_mock,
+                                                   mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'remove')
                 self.assertEqual(account_remove_handler_mock.call_count, 1)
@@ -371,6 +392,19 @@ class SsplHlProviderS3Account_remove(BaseUnitTest):
             response_mock.assert_called_once_with(self.account_remove_response)
             self.assertEqual(request_mock.reply.call_count, 1)
 
+    def test_handle_failure(self):
+        """ When account remove fails, ensure that the reason of the failure is
+        sent back to the client.
+        """
+        request_mock = mock.MagicMock()
+        s3account_provider = S3AccountProvider("account", "handling account")
+        s3account_provider._handle_failure(
+            failure.Failure(FakeError('error')), request_mock)
+        self.assertEqual(request_mock.reply.call_count, 1)
+        message = request_mock.reply.call_args[0][0]['message']
+        self.assertEqual(message['status'], -1)
+        self.assertIn('error', message['reason'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -17,8 +17,9 @@
 
 import unittest
 from twisted.internet import defer
+from twisted.python import failure
 from sspl_hl.providers.s3_users.provider import S3UsersProvider
-from base_unit_test import BaseUnitTest
+from base_unit_test import BaseUnitTest, call_in_caller, defer_in_caller
 import mock
 
 
@@ -70,8 +71,10 @@ class SsplHlProviderS3Users_create(BaseUnitTest):
         "Arn": "arn:aws:iam::1:user/admin"
     }
 
+    @mock.patch('sspl_hl.providers.s3_users.provider.defer_to_pool',
+                side_effect=defer_in_caller)
     @mock.patch('sspl_hl.providers.s3_users.provider.get_client')
-    def test_process_s3admin_request_success(self, get_client_mock):
+    def test_process_s3admin_request_success(self, get_client_mock, _):
         """ Ensure process the request bundle request based on the command
         """
         get_client_mock.return_value = mock.MagicMock(), "Fake_Response"
@@ -95,8 +98,10 @@ class SsplHlProviderS3Users_create(BaseUnitTest):
             self.assertEqual(request_mock.reply.call_count, 0)
             self.assertEqual(s3user_provider.execute_command.call_count, 1)
 
+    @mock.patch('sspl_hl.providers.s3_users.provider.defer_to_pool',
+                side_effect=defer_in_caller)
     @mock.patch('sspl_hl.providers.s3_users.provider.get_client')
-    def test_process_s3admin_request_failure(self, get_client_mock):
+    def test_process_s3admin_request_failure(self, get_client_mock, _):
         """ Ensure process the request bundle request based on the command
         """
         get_client_mock.return_value = None, "Fake_Response"
@@ -135,14 +140,15 @@ class SsplHlProviderS3Users_create(BaseUnitTest):
         request_mock.selection_args = command_args
         s3user_provider = S3UsersProvider("users", "handling users")
         s3user_provider._handle_success = mock.MagicMock()
-        with mock.patch("sspl_hl.providers.s3_users.provider.deferToThread",
+        with mock.patch("sspl_hl.providers.s3_users.provider.defer_to_pool",
+                        side_effect=call_in_caller,
                         return_value=defer.succeed(
                             self.user_create_response)):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "user_handler",
                                               "UsersUtility.create")) \
                     as user_create_handler_mock:
-                s3user_provider.execute_command(request_mock)
+                s3user_provider.execute_command(request_mock, mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'create')
                 s3user_provider._handle_success.assert_called_once_with(
@@ -163,13 +169,14 @@ class SsplHlProviderS3Users_create(BaseUnitTest):
         request_mock.selection_args = command_args
         s3user_provider = S3UsersProvider("users", "handling users")
         s3user_provider._handle_failure = mock.MagicMock()
-        with mock.patch("sspl_hl.providers.s3_users.provider.deferToThread",
+        with mock.patch("sspl_hl.providers.s3_users.provider.defer_to_pool",
+                        side_effect=call_in_caller,
                         return_value=defer.fail(FakeError('error'))):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "user_handler",
                                               "UsersUtility.create")) \
                     as user_create_handler_mock:
-                s3user_provider.execute_command(request_mock)
+                s3user_provider.execute_command(request_mock, mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'create')
                 self.assertEqual(s3user_provider._handle_failure.call_count, 1)
@@ -189,6 +196,19 @@ class SsplHlProviderS3Users_create(BaseUnitTest):
             response_mock.assert_called_once_with(self.user_create_response)
             self.assertEqual(request_mock.reply.call_count, 1)
 
+    def test_handle_failure(self):
+        """ When user create fails, ensure that the reason of the failure is
+        sent back to the client.
+        """
+        request_mock = mock.MagicMock()
+        s3user_provider = S3UsersProvider("users", "handling users")
+        s3user_provider._handle_failure(
+            failure.Failure(FakeError('error')), request_mock)
+        self.assertEqual(request_mock.reply.call_count, 1)
+        message = request_mock.reply.call_args[0][0]['message']
+        self.assertEqual(message['status'], -1)
+        self.assertIn('error', message['reason'])
+
 
 class SsplHlProviderS3Users_list(BaseUnitTest):
     user_list_response = [{
@@ -218,14 +238,15 @@ class SsplHlProviderS3Users_list(BaseUnitTest):
         request_mock.selection_args = command_args
         s3user_provider = S3UsersProvider("users", "handling users")
         s3user_provider._handle_success = mock.MagicMock()
-        with mock.patch("sspl_hl.providers.s3_users.provider.deferToThread",
+        with mock.patch("sspl_hl.providers.s3_users.provider.defer_to_pool",
+                        side_effect=call_in_caller,
                         return_value=defer.succeed(
                             self.user_list_response)):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "user_handler",
                                               "UsersUtility.list")) \
                     as user_list_handler_mock:
-                s3user_provider.execute_command(request_mock)
+                s3user_provider.execute_command(request_mock, mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'list')
                 s3user_provider._handle_success.assert_called_once_with(
@@ -264,14 +285,15 @@ class SsplHlProviderS3Users_modify(BaseUnitTest):
         request_mock.selection_args = command_args
         s3user_provider = S3UsersProvider("users", "handling users")
         s3user_provider._handle_success = mock.MagicMock()
-        with mock.patch("sspl_hl.providers.s3_users.provider.deferToThread",
+        with mock.patch("sspl_hl.providers.s3_users.provider.defer_to_pool",
+                        side_effect=call_in_caller,
                         return_value=defer.succeed(
                             SsplHlProviderS3Users_list.user_list_response)):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "user_handler",
                                               "UsersUtility.modify")) \
                     as user_modify_handler_mock:
-                s3user_provider.execute_command(request_mock)
+                s3user_provider.execute_command(request_mock, mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'modify')
                 s3user_provider._handle_success.assert_called_once_with(
@@ -311,14 +333,15 @@ class SsplHlProviderS3Users_remove(BaseUnitTest):
         request_mock.selection_args = command_args
         s3user_provider = S3UsersProvider("users", "handling users")
         s3user_provider._handle_success = mock.MagicMock()
-        with mock.patch("sspl_hl.providers.s3_users.provider.deferToThread",
+        with mock.patch("sspl_hl.providers.s3_users.provider.defer_to_pool",
+                        side_effect=call_in_caller,
                         return_value=defer.succeed(
                             SsplHlProviderS3Users_list.user_list_response)):
             with mock.patch('{}.{}.{}'.format("sspl_hl.utils.s3admin",
                                               "user_handler",
                                               "UsersUtility.remove")) \
                     as user_remove_handler_mock:
-                s3user_provider.execute_command(request_mock)
+                s3user_provider.execute_command(request_mock, mock.MagicMock())
                 action = request_mock.selection_args.get('action', None)
                 self.assertEqual(action, 'remove')
                 s3user_provider._handle_success.assert_called_once_with(
@@ -28,10 +28,15 @@
 #include <dirent.h>
 #include <sys/stat.h>
 #include <fcntl.h>
+#include <err.h>
+#include <unistd.h>
+#include <pthread.h>
+#include <limits.h>
 
 #include <openssl/bn.h>
 #include <openssl/rsa.h>
 #include <openssl/evp.h>
+#include <openssl/pem.h>
 
 
 const int _KEY_LENGTH_BITS = 1024;  // 1024 bit encryption.
@@ -46,6 +51,40 @@ DIR* _keydir = NULL;
 const EVP_MD* _md = NULL;
 const int HASH_TYPE = NID_sha256;
 
+/* Key files are kept this many session lengths after creation, so messages
+ * signed late in a session can still be verified. */
+const int _KEY_FILE_LIFETIME_SESSIONS = 2;
+
+/* Key parsed from the last token used for signing.  Callers reuse a session
+ * token until it expires, so the key is parsed and its first signature
+ * checked once per token rather than once per message. */
+unsigned char* _signing_token = NULL;
+RSA* _signing_rsa = NULL;
+int _signing_rsa_checked = 0;
+pthread_mutex_t _signing_lock = PTHREAD_MUTEX_INITIALIZER;
+
+/* Public keys of a user, parsed once and kept in memory so that verifying a
+ * message doesn't read the user's key files.  Refreshed when the user's key
+ * directory changes, new session keys are added and removed ones dropped. */
+struct _keyring_key
+{
+    char name[NAME_MAX + 1];    // key file name, unique per session
+    RSA* rsa;
+};
+
+struct _keyring
+{
+    char* username;
+    char* dirname;
+    struct timespec dir_mtime;  // key directory mtime at the last refresh
+    struct _keyring_key* keys;  // the key which last verified a message first
+    int key_count;
+    struct _keyring* next;
+};
+
+struct _keyring* _keyrings = NULL;
+pthread_mutex_t _keyring_lock = PTHREAD_MUTEX_INITIALIZER;
+
 
 unsigned int sspl_get_sig_length()
 {
@@ -106,7 +145,21 @@ int sspl_sign_message(
     const unsigned char* token,
     unsigned char* out_sig)
 {
-    RSA* rsa = _read_private_key_from_token(token);
+    assert(pthread_mutex_lock(&_signing_lock) == 0);
+
+    if (_signing_rsa == NULL
+            || memcmp(_signing_token, token, sspl_get_token_length()) != 0)
+    {
+        if (_signing_token == NULL)
+            _signing_token = malloc(sspl_get_token_length());
+
+        if (_signing_rsa != NULL)
+            RSA_free(_signing_rsa);
+
+        memcpy(_signing_token, token, sspl_get_token_length());
+        _signing_rsa = _read_private_key_from_token(token);
+        _signing_rsa_checked = 0;
+    }
 
     /* generate the message digest */
     unsigned char message_digest[EVP_MAX_MD_SIZE];
@@ -119,41 +172,129 @@ int sspl_sign_message(
     assert(
         RSA_sign(
             HASH_TYPE, message_digest, message_digest_len,
-            out_sig, &sig_len, rsa)
+            out_sig, &sig_len, _signing_rsa)
         == 1);
 
-    /* cleanup */
-    RSA_free(rsa);
+    /* sanity check - ensure we can verify the first sig created with a key. */
+    if (!_signing_rsa_checked)
+    {
+        assert(sspl_verify_message(msg_len, msg, username, out_sig) == 1);
+        _signing_rsa_checked = 1;
+    }
 
-    /* sanity check - ensure we can verify the sig we just created. */
-    assert(sspl_verify_message(msg_len, msg, username, out_sig) == 1);
+    assert(pthread_mutex_unlock(&_signing_lock) == 0);
 
     return 1;
 }
 
-int sspl_verify_message(
-    unsigned int msg_len, const unsigned char* msg,
-    const char* username,
-    const unsigned char* sig)
+/**
+ * @brief                         Return the keyring of a user, creating it
+ *                                the first time.  Returns NULL if the user
+ *                                has no key directory.
+ */
+struct _keyring* _get_keyring(const char* username)
 {
-    // TODO: validate username.  This is user supplied and cannot be trusted.
+    struct _keyring* keyring = NULL;
 
-    /* generate the message digest (ie the hash) */
-    unsigned char message_digest[EVP_MAX_MD_SIZE];
-    unsigned int message_digest_len = 0;
-    _hash_message(msg, msg_len, message_digest, &message_digest_len);
+    for (keyring = _keyrings; keyring != NULL; keyring = keyring->next)
+        if (strcmp(keyring->username, username) == 0)
+            return keyring;
 
-    /* iterate over the private keys for this user and attempt to verify the
-     * message with each. */
-    // TODO: use the public key rather than the private key.
-    char* dirname = malloc(
-                        strlen("/tmp/pki/")
-                        + strlen(username)
-                        + strlen("/pri")
-                        + 1);
-    sprintf(dirname, "/tmp/pki/%s/pri", username);
-    DIR* dir = opendir(dirname);
-    int ret_value = 0;
+    char* dirname = malloc(strlen("/tmp/pki/") + strlen(username) + 1);
+    sprintf(dirname, "/tmp/pki/%s", username);
+    struct stat dir_stat;
+
+    if (stat(dirname, &dir_stat) != 0 || !S_ISDIR(dir_stat.st_mode))
+    {
+        /* no keyring for unknown users, they can't be verified */
+        free(dirname);
+        return NULL;
+    }
+
+    keyring = calloc(1, sizeof(struct _keyring));
+    assert(keyring != NULL);
+    keyring->username = strdup(username);
+    keyring->dirname = dirname;
+    keyring->next = _keyrings;
+    _keyrings = keyring;
+    return keyring;
+}
+
+void _free_keyring_keys(struct _keyring_key* keys, int key_count)
+{
+    for (int i = 0; i < key_count; i++)
+        if (keys[i].rsa != NULL)
+            RSA_free(keys[i].rsa);
+
+    free(keys);
+}
+
+RSA* _read_public_key(DIR* dir, const char* name)
+{
+    int fd = openat(dirfd(dir), name, O_RDONLY);
+
+    if (fd == -1)
+        return NULL;
+
+    FILE* pub_file_stream = fdopen(fd, "r");
+    RSA* rsa = NULL;
+
+    /* fails for a key file still being written, it is read again on the
+     * next refresh */
+    PEM_read_RSAPublicKey(pub_file_stream, &rsa, NULL, NULL);
+    fclose(pub_file_stream);
+    return rsa;
+}
+
+/**
+ * @brief                         Bring the keyring in line with the user's
+ *                                key directory.  Nothing is read unless the
+ *                                directory changed since the last refresh:
+ *                                keys already parsed are kept, new keys are
+ *                                parsed and removed (expired) keys dropped.
+ */
+void _refresh_keyring(struct _keyring* keyring)
+{
+    struct stat dir_stat;
+
+    if (stat(keyring->dirname, &dir_stat) != 0)
+    {
+        _free_keyring_keys(keyring->keys, keyring->key_count);
+        keyring->keys = NULL;
+        keyring->key_count = 0;
+        bzero(&keyring->dir_mtime, sizeof(keyring->dir_mtime));
+        return;
+    }
+
+    if (dir_stat.st_mtim.tv_sec == keyring->dir_mtime.tv_sec
+            && dir_stat.st_mtim.tv_nsec == keyring->dir_mtime.tv_nsec)
+        return;
+
+    DIR* dir = opendir(keyring->dirname);
+
+    if (dir == NULL)
+        return;
+
+    /* keys are tried in order: the keys already known first, in their
+     * current order, then the new ones. */
+    struct _keyring_key* keys = calloc(
+                                    keyring->key_count + 1,
+                                    sizeof(struct _keyring_key));
+    int key_count = 0;
+    int capacity = keyring->key_count + 1;
+    int complete = 1;
+
+    for (int i = 0; i < keyring->key_count; i++)
+    {
+        struct stat key_stat;
+
+        if (fstatat(dirfd(dir), keyring->keys[i].name, &key_stat, 0) == 0
+                && S_ISREG(key_stat.st_mode))
+        {
+            keys[key_count++] = keyring->keys[i];
+            keyring->keys[i].rsa = NULL;
+        }
+    }
 
     while (1)
     {
@@ -162,37 +303,97 @@ int sspl_verify_message(
         if (dir_entry == NULL)
             // no more entries in this directory
             break;
-        else if (strcmp(dir_entry->d_name, ".") == 0
-                 || strcmp(dir_entry->d_name, "..") == 0)
-            // ignore '.' and '..'
+        struct stat key_stat;
+
+        if (fstatat(dirfd(dir), dir_entry->d_name, &key_stat, 0) != 0
+                || !S_ISREG(key_stat.st_mode))
+            // ignore '.', '..' and the pri subdir
             continue;
 
-        /* calculate full filename */
-        char* fname = malloc(
-                          strlen(dirname) + 1 + strlen(dir_entry->d_name) + 1);
-        sprintf(fname, "%s/%s", dirname, dir_entry->d_name);
-        FILE* pri_file_stream = fopen(fname, "r");
-        free(fname);
+        int known = 0;
 
-        /* load rsa private key */
-        RSA* rsa = NULL;
-        assert(PEM_read_RSAPrivateKey(pri_file_stream, &rsa, NULL, NULL));
-        fclose(pri_file_stream);
+        for (int i = 0; i < key_count && !known; i++)
+            known = strcmp(keys[i].name, dir_entry->d_name) == 0;
 
-        /* attempt to verify message */
-        ret_value = RSA_verify(HASH_TYPE, message_digest, message_digest_len,
-                               sig, sspl_get_sig_length(), rsa);
-        RSA_free(rsa);
+        if (known)
+            continue;
 
-        if (ret_value == 1)
-            break;
+        RSA* rsa = _read_public_key(dir, dir_entry->d_name);
+
+        if (rsa == NULL)
+        {
+            complete = 0;
+            continue;
+        }
+
+        if (key_count == capacity)
+        {
+            capacity *= 2;
+            keys = realloc(keys, capacity * sizeof(struct _keyring_key));
+            assert(keys != NULL);
+        }
+
+        strcpy(keys[key_count].name, dir_entry->d_name);
+        keys[key_count].rsa = rsa;
+        key_count++;
     }
 
-    /* cleanup */
-    free(dirname);
     assert(closedir(dir) == 0);
 
-    return ret_value;
+    _free_keyring_keys(keyring->keys, keyring->key_count);
+    keyring->keys = keys;
+    keyring->key_count = key_count;
+
+    /* when a key could not be read yet, refresh again next time */
+    if (complete)
+        keyring->dir_mtime = dir_stat.st_mtim;
+    else
+        bzero(&keyring->dir_mtime, sizeof(keyring->dir_mtime));
+}
+
+int sspl_verify_message(
+    unsigned int msg_len, const unsigned char* msg,
+    const char* username,
+    const unsigned char* sig)
+{
+    // TODO: validate username.  This is user supplied and cannot be trusted.
+
+    /* generate the message digest (ie the hash) */
+    unsigned char message_digest[EVP_MAX_MD_SIZE];
+    unsigned int message_digest_len = 0;
+    _hash_message(msg, msg_len, message_digest, &message_digest_len);
+
+    assert(pthread_mutex_lock(&_keyring_lock) == 0);
+
+    struct _keyring* keyring = _get_keyring(username);
+    int ret_value = 0;
+
+    if (keyring != NULL)
+    {
+        _refresh_keyring(keyring);
+
+        /* attempt to verify the message with the user's public keys */
+        for (int i = 0; i < keyring->key_count; i++)
+        {
+            ret_value = RSA_verify(
+                            HASH_TYPE, message_digest, message_digest_len,
+                            sig, sspl_get_sig_length(), keyring->keys[i].rsa);
+
+            if (ret_value == 1)
+            {
+                /* the current session's key is then tried first */
+                struct _keyring_key key = keyring->keys[i];
+                memmove(&keyring->keys[1], &keyring->keys[0],
+                        i * sizeof(struct _keyring_key));
+                keyring->keys[0] = key;
+                break;
+            }
+        }
+    }
+
+    assert(pthread_mutex_unlock(&_keyring_lock) == 0);
+
+    return ret_value == 1;
 }
 
 /**
@@ -262,6 +463,63 @@ void _create_empty_key_files(const char* username, int* pri_fd, int* pub_fd)
     free(template);
 }
 
+/**
+ * @brief                         Remove the key files of the user's expired
+ *                                sessions.
+ * @param username                The user whose keys are removed.
+ * @param session_length          Session length in seconds, key files older
+ *                                than _KEY_FILE_LIFETIME_SESSIONS session
+ *                                lengths are removed.  Nothing is removed if
+ *                                it is not positive.
+ */
+void _remove_expired_key_files(const char* username, time_t session_length)
+{
+    if (session_length <= 0)
+        return;
+
+    char* dirname = malloc(
+                        strlen("/tmp/pki/")
+                        + strlen(username)
+                        + strlen("/pri")
+                        + 1);
+    sprintf(dirname, "/tmp/pki/%s/pri", username);
+    DIR* pri_dir = opendir(dirname);
+    assert(pri_dir != NULL);
+    sprintf(dirname, "/tmp/pki/%s", username);
+    DIR* pub_dir = opendir(dirname);
+    assert(pub_dir != NULL);
+
+    time_t expired = time(NULL) - _KEY_FILE_LIFETIME_SESSIONS * session_length;
+
+    while (1)
+    {
+        struct dirent* dir_entry = readdir(pri_dir);
+
+        if (dir_entry == NULL)
+            // no more entries in this directory
+            break;
+        else if (strcmp(dir_entry->d_name, ".") == 0
+                 || strcmp(dir_entry->d_name, "..") == 0)
+            // ignore '.' and '..'
+            continue;
+
+        struct stat key_stat;
+
+        if (fstatat(dirfd(pri_dir), dir_entry->d_name, &key_stat, 0) != 0
+                || key_stat.st_mtime >= expired)
+            continue;
+
+        /* the public key has the same name one directory up */
+        unlinkat(dirfd(pub_dir), dir_entry->d_name, 0);
+        unlinkat(dirfd(pri_dir), dir_entry->d_name, 0);
+    }
+
+    /* cleanup */
+    free(dirname);
+    assert(closedir(pub_dir) == 0);
+    assert(closedir(pri_dir) == 0);
+}
+
 RSA* _create_rsa_key()
 {
     BIGNUM* exponent = BN_new();
@@ -307,7 +565,7 @@ void sspl_generate_session_token(
     const char* username,
     __attribute__((unused)) unsigned int authn_token_len,
     __attribute__((unused)) const unsigned char* authn_token,
-    __attribute__((unused)) time_t session_length,
+    time_t session_length,
     unsigned char* out_token)
 {
     /* TODO: validate username, authn_token.  These are user supplied values
@@ -316,6 +574,7 @@ void sspl_generate_session_token(
     /* TODO: check creds */
 
     _ensure_user_key_dir_exists(username);
+    _remove_expired_key_files(username, session_length);
 
     int pri_fd = -1;
     int pub_fd = -1;
@@ -366,5 +625,20 @@ void __attribute__((destructor)) fini()
     if (_keydir)
         closedir(_keydir);
 
+    if (_signing_rsa)
+        RSA_free(_signing_rsa);
+
+    free(_signing_token);
+
+    while (_keyrings != NULL)
+    {
+        struct _keyring* keyring = _keyrings;
+        _keyrings = keyring->next;
+        _free_keyring_keys(keyring->keys, keyring->key_count);
+        free(keyring->username);
+        free(keyring->dirname);
+        free(keyring);
+    }
+
     EVP_cleanup();
 }
@@ -131,6 +131,127 @@ START_TEST(test_sign_and_verify_message)
 }
 END_TEST
 
+START_TEST(test_sign_reuses_session_token)
+{
+    /* ensure we're using PKI */
+    ck_assert_int_eq(sspl_sec_get_method(), SSPL_SEC_METHOD_PKI);
+
+    /* ensure empty state dir */
+    ck_assert_int_eq(system("rm -rf /tmp/pki/*"), 0);
+
+    const char* username = "validuser";
+    const char* password = "validpasswd";
+
+    /* generate the session token */
+    time_t session_length = 60 * 60;
+    unsigned char token[sspl_get_token_length()];
+    bzero(token, sspl_get_token_length());
+    sspl_generate_session_token(
+        username,
+        strlen(password) + 1, (const unsigned char*)password,
+        session_length,
+        token);
+
+    /* sign several messages with the same token */
+    const char* msgs[] = {"Hello, World!", "Goodbye, World!"};
+    unsigned char sig[sspl_get_sig_length()];
+
+    for (int i = 0; i < 2; i++)
+    {
+        int status = sspl_sign_message(
+                         strlen(msgs[i]), msgs[i], username, token, sig);
+        ck_assert_int_eq(status, 1);
+        status = sspl_verify_message(strlen(msgs[i]), msgs[i], username, sig);
+        ck_assert_int_eq(status, 1);
+    }
+
+    /* no key was created for the second message */
+    _ensure_one_file_present_in_dir("/tmp/pki/validuser/pri");
+}
+END_TEST
+
+
+START_TEST(test_expired_key_files_removed)
+{
+    /* ensure we're using PKI */
+    ck_assert_int_eq(sspl_sec_get_method(), SSPL_SEC_METHOD_PKI);
+
+    /* ensure empty state dir */
+    ck_assert_int_eq(system("rm -rf /tmp/pki/*"), 0);
+
+    const char* username = "validuser";
+    const char* password = "validpasswd";
+
+    time_t session_length = 60 * 60;
+    unsigned char token[sspl_get_token_length()];
+    bzero(token, sspl_get_token_length());
+    sspl_generate_session_token(
+        username,
+        strlen(password) + 1, (const unsigned char*)password,
+        session_length,
+        token);
+
+    /* age the keys of the first session past their lifetime */
+    ck_assert_int_eq(
+        system("touch -d '3 hours ago' /tmp/pki/validuser/* "
+               "/tmp/pki/validuser/pri/*"), 0);
+
+    sspl_generate_session_token(
+        username,
+        strlen(password) + 1, (const unsigned char*)password,
+        session_length,
+        token);
+
+    /* only the keys of the new session remain */
+    _ensure_one_file_present_in_dir("/tmp/pki/validuser");
+    _ensure_one_file_present_in_dir("/tmp/pki/validuser/pri");
+}
+END_TEST
+
+void _generate_token(const char* username, unsigned char* token)
+{
+    const char* password = "validpasswd";
+    bzero(token, sspl_get_token_length());
+    sspl_generate_session_token(
+        username,
+        strlen(password) + 1, (const unsigned char*)password,
+        60 * 60,
+        token);
+}
+
+
+START_TEST(test_verify_across_sessions)
+{
+    /* ensure we're using PKI */
+    ck_assert_int_eq(sspl_sec_get_method(), SSPL_SEC_METHOD_PKI);
+
+    /* ensure empty state dir */
+    ck_assert_int_eq(system("rm -rf /tmp/pki/*"), 0);
+
+    const char* username = "validuser";
+    unsigned char token[sspl_get_token_length()];
+    unsigned char old_sig[sspl_get_sig_length()];
+    unsigned char new_sig[sspl_get_sig_length()];
+    const char* msg = "Hello, World!";
+
+    /* sign with the key of an older session and of the current one */
+    _generate_token(username, token);
+    ck_assert_int_eq(
+        sspl_sign_message(strlen(msg), msg, username, token, old_sig), 1);
+    _generate_token(username, token);
+    ck_assert_int_eq(
+        sspl_sign_message(strlen(msg), msg, username, token, new_sig), 1);
+
+    ck_assert_int_eq(sspl_verify_message(strlen(msg), msg, username, new_sig), 1);
+    ck_assert_int_eq(sspl_verify_message(strlen(msg), msg, username, old_sig), 1);
+    ck_assert_int_eq(sspl_verify_message(strlen(msg), msg, "nouser", new_sig), 0);
+
+    /* removed keys no longer verify */
+    ck_assert_int_eq(system("rm -rf /tmp/pki/validuser/*"), 0);
+    ck_assert_int_eq(sspl_verify_message(strlen(msg), msg, username, new_sig), 0);
+}
+END_TEST
+
 Suite* basic_tests()
 {
     Suite* s = suite_create("basic tests");
@@ -140,6 +261,9 @@ Suite* basic_tests()
 
     tcase_add_test(tc_core, test_generate_session_token);
     tcase_add_test(tc_core, test_sign_and_verify_message);
+    tcase_add_test(tc_core, test_sign_reuses_session_token);
+    tcase_add_test(tc_core, test_expired_key_files_removed);
+    tcase_add_test(tc_core, test_verify_across_sessions);
     suite_add_tcase(s, tc_core);
 
     return s;
@@ -26,6 +26,7 @@ import json
 from actuators.impl.actuator import Actuator
 from framework.base.debug import Debug
 from framework.utils.service_logging import logger
+from framework.utils.sdr_cache import sdr_cache
 from framework.base.sspl_constants import AlertTypes, SensorTypes, SeverityTypes, COMMON_CONFIGS
 
 
@@ -84,10 +85,15 @@ class NodeHWactuator(Actuator, Debug):
         try:
             if self.sensor_id_map:
                 fru_dict = self.sensor_id_map[fru.lower()]
-                for sensor_id in fru_dict.values():
-                    if sensor_id == '':
-                        continue
-                    sensor_common_info, sensor_specific_info = self._executor.get_sensor_props(sensor_id)
+                sensor_ids = [sensor_id for sensor_id in fru_dict.values()
+                              if sensor_id != '']
+                sensor_props = sdr_cache.get(
+                    ("sensor props", fru.lower()) + tuple(sensor_ids),
+                    lambda: self._executor.get_sensor_props_bulk(sensor_ids), fru,
+                    valid=lambda props: all(common is not False
+                                            for common, _ in props.values()))
+                for sensor_id, (sensor_common_info, sensor_specific_info) in \
+                        sensor_props.items():
                     self.fru_specific_info[sensor_id] = sensor_specific_info
                 if self.fru_specific_info is not None:
                     resource_info = self._parse_fru_info(fru)
@@ -162,7 +168,10 @@ class NodeHWactuator(Actuator, Debug):
         if fru_instance.isdigit() and isinstance(int(fru_instance), int):
             fru_dict = self.sensor_id_map.get(fru.lower())
             sensor_id = fru_dict[int(fru_instance)]
-            common, specific = self._executor.get_sensor_props(sensor_id)
+            common, specific = sdr_cache.get(
+                ("sensor props", sensor_id),
+                lambda: self._executor.get_sensor_props(sensor_id), fru,
+                valid=lambda props: props[0] is not False)
             response = self._create_node_fru_json_message(specific, sensor_id)
             response['instance_id'] = fru_instance
             response['info']['resource_id'] = sensor_id
@@ -240,7 +249,10 @@ class NodeHWactuator(Actuator, Debug):
          Deassertions Enabled  : unc+ ucr+
         """
         try:
-            sensor_get_response, return_code = self._executor._run_ipmitool_subcommand("sensor get '{0}'".format(sensor_name))
+            sensor_get_response, return_code = sdr_cache.get(
+                ("sensor get", sensor_name),
+                lambda: self._executor._run_ipmitool_subcommand("sensor get '{0}'".format(sensor_name)),
+                self._sensor_type, valid=lambda result: result[1] == 0)
             if return_code == 0:
                 return self._response_to_dict(sensor_get_response)
             else:
@@ -300,15 +312,22 @@ class NodeHWactuator(Actuator, Debug):
         :return:
         """
         many_sensors = False
+        # Not shared with NodeHWsensor, which checks its listings for
+        # channel errors
+        sdr_type_response, return_code = sdr_cache.get(
+            ("sdr type", sensor_type, self.ACTUATOR_NAME),
+            lambda: self._executor._run_ipmitool_subcommand("sdr type '{0}'".format(sensor_type)),
+            sensor_type, valid=lambda result: result[1] == 0)
         if sensor_name == "*":
             many_sensors = True
-            sdr_type_response, return_code = self._executor._run_ipmitool_subcommand(
-                "sdr type '{0}'".format(sensor_type))
-
-        else:
-            sdr_type_response, return_code = self._executor._run_ipmitool_subcommand(
-                "sdr type '{0}'".format(sensor_type),
-                grep_args=sensor_name)
+        elif return_code == 0:
+            # Same as piping the listing through grep
+            lines = [line for line in sdr_type_response[0].split(b"\n")
+                     if sensor_name.encode() in line]
+            if lines:
+                sdr_type_response = (b"\n".join(lines) + b"\n", b"")
+            else:
+                sdr_type_response, return_code = (b"", b""), 1
 
         if return_code != 0:
             msg = "sdr type '{0}' : command failed with error {1}".format(sensor_type, sdr_type_response)
@@ -20,6 +20,9 @@
                     another.
  ****************************************************************************
 """
+import queue
+import time
+
 from framework.utils.service_logging import logger
 
 class InternalMsgQ(object):
@@ -37,11 +40,13 @@ class InternalMsgQ(object):
         q = self._msgQlist[self.name()]
         return q.empty()
 
-    def _read_my_msgQ(self):
-        """Blocks on reading from this module's queue placed by another thread"""
+    def _read_my_msgQ(self, timeout=None):
+        """Blocks on reading from this module's queue placed by another thread.
+           If timeout (seconds) is given and nothing arrives in time
+           (None, None) is returned."""
         try:
             q = self._msgQlist[self.name()]
-            jsonMsg, event = q.get()
+            jsonMsg, event = q.get(timeout=timeout)
 
             if jsonMsg is None:
                 return None, None
@@ -54,6 +59,8 @@ class InternalMsgQ(object):
             self._log_debug("_read_my_msgQ: %s, Msg:%s" % (self.name(), jsonMsg))
             return jsonMsg, event
 
+        except queue.Empty:
+            pass
         except Exception as e:
             logger.exception("_read_my_msgQ: %r" % e)
 
@@ -85,8 +92,29 @@ class InternalMsgQ(object):
         except Exception as e:
             logger.exception("_read_my_msgQ_noWait: %r" % e)
 
+    def _wait_my_msgQ(self, timeout, last_count):
+        """Blocks up to timeout seconds until a message is written to this
+           module's queue after it had seen last_count writes. Messages are
+           left in the queue. Returns the current number of writes."""
+        q = self._msgQlist.get(self.name())
+        if q is None:
+            time.sleep(timeout)
+            return last_count
+
+        # Nobody calls task_done() on these queues, so unfinished_tasks
+        # counts every put() since the queue was created
+        deadline = time.time() + timeout
+        with q.not_empty:
+            while q.unfinished_tasks == last_count:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                q.not_empty.wait(remaining)
+            return q.unfinished_tasks
+
     def _write_internal_msgQ(self, toModule, jsonMsg, event=None):
-        """writes a json message to an internal message queue"""
+        """writes a json message to an internal message queue, a module
+           in event driven dispatch mode is woken up by the write"""
         self._log_debug("_write_internal_msgQ: From %s, To %s, Msg:%s" %
                        (self.name(), toModule, jsonMsg))
 
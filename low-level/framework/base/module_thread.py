@@ -65,22 +65,67 @@ class ScheduledModuleThread(ModuleThread, Debug):
     SUSPENDED = 2
     HALTED = 3
 
+    # Section and key in configuration file
+    SSPL_LL_SETTING       = 'SSPL-LL_SETTING'
+    EVENT_DRIVEN_DISPATCH = 'event_driven_dispatch'
+
+    # Set by the message handlers and processors, whose run() is moved up
+    # when a message is written to their internal msgQ in event driven
+    # dispatch mode. Sensors keep their polling schedule.
+    DISPATCH_ON_MSGQ = False
+
     def __init__(self, module_name, priority):
         super(ScheduledModuleThread, self).__init__()
 
-        self._scheduler   = scheduler(time.time, time.sleep)
+        self._scheduler   = scheduler(time.time, self._scheduler_delay)
         self._module_name = module_name
         self._priority    = priority
         self._running     = False
 
+        # Event driven dispatch: wake up on writes to our internal msgQ
+        self._event_driven = False
+        self._msgQ_writes  = 0
+
     def initialize(self, conf_reader):
         """Initialize the monitoring thread"""
         # Set the configuration file reader located in /etc/sspl-ll.conf
         self._conf_reader = conf_reader
 
+        # Message handlers and processors consume their queue as soon as a
+        # message is written, sensors keep their polling schedule
+        dispatch = conf_reader._get_value_with_default(self.SSPL_LL_SETTING,
+                                                       self.EVENT_DRIVEN_DISPATCH,
+                                                       'true')
+        self._event_driven = str(dispatch).lower() == 'true' and \
+                                self.DISPATCH_ON_MSGQ and hasattr(self, '_wait_my_msgQ')
+
         # Set the scheduler to fire the thread right away
         self._scheduler.enter(1, self._priority, self.run, ())
 
+    def _scheduler_delay(self, delay):
+        """Delay function of the scheduler. In event driven dispatch mode
+           the wait ends early when a message is written to this module's
+           queue and the pending run() is moved up to handle it right away.
+           The scheduler is still used for periodic work."""
+        if delay <= 0 or not self._event_driven or \
+                getattr(self, '_msgQlist', None) is None:
+            time.sleep(delay)
+            return
+
+        writes = self._wait_my_msgQ(delay, self._msgQ_writes)
+        if writes == self._msgQ_writes:
+            return
+        self._msgQ_writes = writes
+
+        for event in self._scheduler.queue:
+            if event.action == self.run:
+                try:
+                    self._scheduler.cancel(event)
+                except ValueError:
+                    continue
+                self._scheduler.enter(0, event.priority, self.run, event.argument)
+                break
+
     def start(self):
         """Run the scheduler"""
         self._running = True
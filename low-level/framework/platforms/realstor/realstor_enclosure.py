@@ -22,11 +22,12 @@
 import errno
 import json
 import hashlib
-import time
+import threading
 
 from framework.target.enclosure import StorageEnclosure
 from framework.utils.service_logging import logger
 from framework.utils.webservices import WebServices
+from framework.platforms.realstor.realstor_poller import RealStorPoller
 from framework.utils.store_factory import store
 from framework.utils import encryptor
 from framework.base.sspl_constants import ServiceTypes, COMMON_CONFIGS
@@ -112,6 +113,9 @@ class RealStorEnclosure(StorageEnclosure):
         self.ws = WebServices()
         self.common_reqheaders = {}
 
+        # Serializes login and MC failover between sensor threads
+        self._mc_lock = threading.RLock()
+
         self.encl_conf = self.CONF_SECTION_MC
 
         self.system_persistent_cache = self.encl_cache + "system/"
@@ -141,6 +145,10 @@ class RealStorEnclosure(StorageEnclosure):
         self.pollfreq = int(self.conf_reader._get_value_with_default(
             self.CONF_REALSTORSENSORS, "polling_frequency", self.DEFAULT_POLL))
 
+        # Fetches each CLI API resource once per cycle for all sensors
+        self.poller = RealStorPoller(self)
+        self.poller.subscribe(self.URI_CLIAPI_SHOWSYSTEM, self.pollfreq)
+
         self.site_id = self.conf_reader._get_value_with_default(
                                                 self.SYSTEM_INFORMATION,
                                                 COMMON_CONFIGS.get(self.SYSTEM_INFORMATION).get(self.SITE_ID),
@@ -191,25 +199,37 @@ class RealStorEnclosure(StorageEnclosure):
 
         return url
 
-    def switch_to_alt_mc(self):
+    def switch_to_alt_mc(self, failed_ip=None):
         """Switches active ip between primary and secondary management controller
-           ips"""
+           ips. With failed_ip, nothing is done if another thread already
+           switched away from it."""
 
         if self.mc1 == self.mc2 and \
             self.mc1_wsport == self.mc2_wsport:
             return
 
-        if self.active_ip == self.mc1:
-            self.active_ip = self.mc2
-            self.active_wsport = self.mc2_wsport
-        elif self.active_ip == self.mc2:
-            self.active_ip = self.mc1
-            self.active_wsport = self.mc1_wsport
+        with self._mc_lock:
+            if failed_ip is not None and failed_ip != self.active_ip:
+                return
 
-        self.login()
+            if self.active_ip == self.mc1:
+                self.active_ip = self.mc2
+                self.active_wsport = self.mc2_wsport
+            elif self.active_ip == self.mc2:
+                self.active_ip = self.mc1
+                self.active_wsport = self.mc1_wsport
+
+            self.login()
         logger.debug("Current MC active ip {0}, active wsport {1}. Logged-in\
             ".format(self.active_ip, self.active_wsport))
 
+    def relogin(self, failed_session_key):
+        """Logs in again unless another thread did since the session key
+           failed_session_key was rejected"""
+        with self._mc_lock:
+            if self.common_reqheaders.get('sessionKey') == failed_session_key:
+                self.login()
+
     def ws_request(self, url, method, retry_count=MAX_RETRIES,
             post_data=""):
         """Make webservice requests using common utils"""
@@ -219,13 +239,18 @@ class RealStorEnclosure(StorageEnclosure):
         tried_alt_ip = False
 
         while retry_count:
-            if tried_alt_ip:
-                # Extract show fru name from old URL to update alternative IP.
-                url = self.build_url(url[url.index('/api/'):].replace('/api',''))
-
+            # Extract show fru name from URL, to update alternative IP
+            # and to name the endpoint in the latency metrics.
+            uri = url[url.find('/api/'):].replace('/api','') \
+                      if '/api/' in url else None
+            if tried_alt_ip and uri:
+                url = self.build_url(uri)
+
+            request_ip = self.active_ip
+            session_key = self.common_reqheaders.get('sessionKey')
             response = self.ws.ws_request(method, url,
-                       self.common_reqheaders, post_data,
-                       self.WEBSERVICE_TIMEOUT)
+                       dict(self.common_reqheaders), post_data,
+                       self.WEBSERVICE_TIMEOUT, uri)
 
             retry_count -= 1
 
@@ -259,7 +284,7 @@ class RealStorEnclosure(StorageEnclosure):
                 need_relogin) and retried_login is False:
                 logger.info("%s failed, retrying after login " % (url))
 
-                self.login()
+                self.relogin(session_key)
                 retried_login = True
                 need_relogin = False
                 continue
@@ -268,7 +293,7 @@ class RealStorEnclosure(StorageEnclosure):
                      response.status_code == self.ws.HTTP_CONN_REFUSED or \
                      response.status_code == self.ws.HTTP_NO_ROUTE_TO_HOST) \
                      and tried_alt_ip is False:
-                self.switch_to_alt_mc()
+                self.switch_to_alt_mc(request_ip)
                 tried_alt_ip = True
                 self.mc_timeout_counter += 1
                 continue
@@ -277,6 +302,16 @@ class RealStorEnclosure(StorageEnclosure):
 
         return response
 
+    def ws_request_many(self, urls, method=WebServices.HTTP_GET):
+        """Makes ws_request for several urls concurrently over pooled
+           connections, returns the responses in the order of urls"""
+        return self.ws.run_concurrent(
+            lambda url: self.ws_request(url, method), urls)
+
+    def get_ws_metrics(self):
+        """Request count, errors and latency of each CLI API endpoint"""
+        return self.ws.get_metrics()
+
     def login(self):
         """Perform realstor login to get session key & make it available
            in common request headers"""
@@ -288,7 +323,7 @@ class RealStorEnclosure(StorageEnclosure):
         headers = {'datatype':'json'}
 
         response = self.ws.ws_get(url + auth_hash, headers, \
-                       self.WEBSERVICE_TIMEOUT)
+                       self.WEBSERVICE_TIMEOUT, self.URI_CLIAPI_LOGIN)
 
         if not response:
             logger.warn("Login webservice request failed {0}".format(url))
@@ -372,24 +407,16 @@ class RealStorEnclosure(StorageEnclosure):
     def get_system_status(self):
         """Retreive realstor system state info using cli api /show/system"""
 
-        # poll system would get invoked through multiple realstor sensors
-        # with less frequency compared to configured polling frequency
-        # adding check to comply with polling frequency
-        elapsed = time.time() - self.poll_system_ts
-
-        if elapsed < self.pollfreq:
-            logger.warn("/show/system request came in {0} seconds,"
-                "while configured polling frequency is {1} seconds,"
-                "ignoring".format(elapsed, self.pollfreq))
+        # poll system may get invoked through multiple realstor sensors,
+        # the poller fetches /show/system at most once per polling frequency
+        # and a fetch already processed is skipped
+        poll = self.poller.get(self.URI_CLIAPI_SHOWSYSTEM)
+        if poll.timestamp == self.poll_system_ts:
             return
 
         system = None
-
-        # make ws request
         url = self.build_url(self.URI_CLIAPI_SHOWSYSTEM)
-        #logger.info("show system url: %s" % url)
-
-        response = self.ws_request(url, self.ws.HTTP_GET)
+        response = poll.response
 
         if not response:
             logger.warn("System status unavailable as ws request failed")
@@ -401,12 +428,8 @@ class RealStorEnclosure(StorageEnclosure):
                 response.status_code))
             return
 
-        self.poll_system_ts = time.time()
-
-        try:
-            jresponse = json.loads(response.content)
-        except ValueError as badjson:
-            logger.error("%s returned mal-formed json:\n%s" % (url, badjson))
+        self.poll_system_ts = poll.timestamp
+        jresponse = poll.data
 
         if jresponse:
             api_resp = self.get_api_status(jresponse['status'])
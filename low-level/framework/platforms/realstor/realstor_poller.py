@@ -0,0 +1,139 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Poll coordinator fetching each RealStor CLI API resource
+                    once per polling cycle for all the realstor sensors
+ ****************************************************************************
+"""
+
+import json
+import time
+import threading
+from collections import namedtuple
+
+from framework.utils.service_logging import logger
+
+# response:   requests.Response of the last fetch, None if it could not be made
+# data:       parsed JSON of the last fetch, None if it failed
+# generation: incremented each time data differs from the previous fetch
+# timestamp:  time of the last fetch
+# changes:    {"added": [...], "removed": [...], "changed": [...]} durable-ids
+#             of the items which differ from the previous generation
+PollResult = namedtuple("PollResult",
+                        ["response", "data", "generation", "timestamp", "changes"])
+
+
+class RealStorPoller(object):
+    """Caches the parsed CLI API responses shared by the realstor sensors.
+
+       A resource is fetched when a sensor asks for it and its data is older
+       than its polling interval. All other subscribed resources past half
+       their interval are fetched with it, concurrently, so sensors polling
+       at the same frequency are served by a single cycle.
+    """
+
+    # Data fetched this many seconds early is still used, absorbing the
+    # drift between the sensors' schedulers
+    INTERVAL_SLACK = 1
+    ITEM_ID_KEY = "durable-id"
+
+    def __init__(self, rssencl):
+        """rssencl: RealStorEnclosure used to reach the MC"""
+        self._rssencl = rssencl
+        self._intervals = {}
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, uri, interval):
+        """Registers interest in a resource, e.g. /show/power-supplies,
+           polled every interval seconds"""
+        with self._lock:
+            self._intervals[uri] = min(interval, self._intervals.get(uri, interval))
+
+    def get(self, uri):
+        """Returns the PollResult of a resource, fetching the due
+           resources first if it is older than its interval"""
+        result = self._results.get(uri)
+        if result is not None and not self._is_due(uri, result, 1):
+            return result
+
+        with self._lock:
+            # Fetched by another sensor while waiting for the lock
+            result = self._results.get(uri)
+            if result is not None and not self._is_due(uri, result, 1):
+                return result
+
+            due = [uri] + [subscribed for subscribed in self._intervals
+                           if subscribed != uri and self._is_due(
+                               subscribed, self._results.get(subscribed), 0.5)]
+            self._fetch(due)
+            return self._results[uri]
+
+    def _is_due(self, uri, result, fraction):
+        if result is None:
+            return True
+        interval = self._intervals.get(uri, self._rssencl.pollfreq)
+        return time.time() - result.timestamp >= \
+            interval * fraction - self.INTERVAL_SLACK
+
+    def _fetch(self, uris):
+        urls = [self._rssencl.build_url(uri) for uri in uris]
+        responses = self._rssencl.ws_request_many(urls)
+        now = time.time()
+
+        for uri, url, response in zip(uris, urls, responses):
+            previous = self._results.get(uri)
+            generation = previous.generation if previous else 0
+            data = None
+            if response is not None and \
+                    response.status_code == self._rssencl.ws.HTTP_OK:
+                try:
+                    data = json.loads(response.content)
+                except ValueError as badjson:
+                    logger.error(f"{url} returned mal-formed json:\n{badjson}")
+
+            changes = None
+            if data is not None:
+                changes = self._get_changes(previous.data if previous else None, data)
+                if previous is None or previous.data is None or \
+                        any(changes.values()):
+                    generation += 1
+            self._results[uri] = PollResult(response, data, generation, now, changes)
+
+        logger.debug(f"RealStorPoller, fetched {uris}")
+
+    def _get_items(self, data):
+        """Returns {item id: item} for the resource objects of a response"""
+        items = {}
+        if not data:
+            return items
+        for key, value in data.items():
+            if key == "status" or not isinstance(value, list):
+                continue
+            for index, item in enumerate(value):
+                if isinstance(item, dict):
+                    items[item.get(self.ITEM_ID_KEY, f"{key}[{index}]")] = item
+        return items
+
+    def _get_changes(self, old_data, new_data):
+        old, new = self._get_items(old_data), self._get_items(new_data)
+        return {
+            "added": [item_id for item_id in new if item_id not in old],
+            "removed": [item_id for item_id in old if item_id not in new],
+            "changed": [item_id for item_id in new
+                        if item_id in old and new[item_id] != old[item_id]]
+        }
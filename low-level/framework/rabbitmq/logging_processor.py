@@ -58,6 +58,7 @@ class LoggingProcessor(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "LoggingProcessor"
     PRIORITY    = 2
+    DISPATCH_ON_MSGQ = True
 
     # Section and keys in configuration file
     LOGGINGPROCESSOR    = MODULE_NAME.upper()
@@ -28,6 +28,7 @@ import time
 from framework.base.module_thread import ScheduledModuleThread
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.utils.service_logging import logger
+from framework.utils.message_signer import MessageSigner
 from .rabbitmq_connector import RabbitMQSafeConnection
 from json_msgs.messages.actuators.thread_controller import ThreadControllerMsg
 from json_msgs.messages.actuators.ack_response import AckResponseMsg
@@ -46,6 +47,7 @@ class PlaneCntrlRMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "PlaneCntrlRMQegressProcessor"
     PRIORITY    = 1
+    DISPATCH_ON_MSGQ = True
 
     # Section and keys in configuration file
     RABBITMQPROCESSOR       = MODULE_NAME.upper()
@@ -167,6 +169,12 @@ class PlaneCntrlRMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
             self._signature_expires = self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
                                                                  self.SIGNATURE_EXPIRES,
                                                                  "3600")
+            # Session token reused for signing until it expires
+            self._signer = None
+            if use_security_lib:
+                self._signer = MessageSigner(SSPL_SEC, self._signature_user,
+                                             self._signature_token,
+                                             int(self._signature_expires))
             self._primary_rabbitMQ_server   = self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
                                                                  self.PRIMARY_RABBITMQ,
                                                                  'localhost')
@@ -189,21 +197,11 @@ class PlaneCntrlRMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
         self._jsonMsg["time"]     = str(int(time.time()))
 
         if use_security_lib:
-            authn_token_len = len(self._signature_token) + 1
-            session_length  = int(self._signature_expires)
-            token = ctypes.create_string_buffer(SSPL_SEC.sspl_get_token_length())
-
-            SSPL_SEC.sspl_generate_session_token(
-                                    self._signature_user, authn_token_len,
-                                    self._signature_token, session_length, token)
-
             # Generate the signature
             msg_len = len(self._jsonMsg) + 1
-            sig = ctypes.create_string_buffer(SSPL_SEC.sspl_get_sig_length())
-            SSPL_SEC.sspl_sign_message(msg_len, str(self._jsonMsg), self._signature_user,
-                                       token, sig)
+            sig = self._signer.sign(msg_len, str(self._jsonMsg))
 
-            self._jsonMsg["signature"] = str(sig.raw)
+            self._jsonMsg["signature"] = str(sig)
         else:
             self._jsonMsg["signature"] = "SecurityLibNotInstalled"
 
@@ -26,9 +26,6 @@ import os
 
 from socket import gethostname
 
-from jsonschema import Draft3Validator
-from jsonschema import validate
-
 from pika.exceptions import AMQPError
 
 from framework.base.module_thread import ScheduledModuleThread
@@ -36,6 +33,7 @@ from framework.base.internal_msgQ import InternalMsgQ
 from framework.utils.service_logging import logger
 from .rabbitmq_connector import RabbitMQSafeConnection
 from framework.rabbitmq.plane_cntrl_rmq_egress_processor import PlaneCntrlRMQegressProcessor
+from json_msgs.schema_registry import schema_registry
 from framework.base.sspl_constants import RESOURCE_PATH
 
 from json_msgs.messages.actuators.ack_response import AckResponseMsg
@@ -54,6 +52,7 @@ class PlaneCntrlRMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "PlaneCntrlRMQingressProcessor"
     PRIORITY    = 1
+    DISPATCH_ON_MSGQ = True
 
     # Section and keys in configuration file
     RABBITMQPROCESSOR   = MODULE_NAME.upper()
@@ -66,8 +65,8 @@ class PlaneCntrlRMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
     PRIMARY_RABBITMQ    = 'primary_rabbitmq_server'
     SECONDARY_RABBITMQ  = 'secondary_rabbitmq_server'
 
-    JSON_ACTUATOR_SCHEMA = "SSPL-LL_Actuator_Request.json"
-    JSON_SENSOR_SCHEMA   = "SSPL-LL_Sensor_Request.json"
+    JSON_ACTUATOR_SCHEMA = schema_registry.ACTUATOR_REQUEST
+    JSON_SENSOR_SCHEMA   = schema_registry.SENSOR_REQUEST
 
     @staticmethod
     def name():
@@ -78,29 +77,10 @@ class PlaneCntrlRMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
         super(PlaneCntrlRMQingressProcessor, self).__init__(self.MODULE_NAME,
                                                        self.PRIORITY)
 
-        # Read in the actuator schema for validating messages
-        schema_file = os.path.join(RESOURCE_PATH + '/actuators',
-                                   self.JSON_ACTUATOR_SCHEMA)
-        self._actuator_schema = self._load_schema(schema_file)
-
-        # Read in the sensor schema for validating messages
-        schema_file = os.path.join(RESOURCE_PATH + '/sensors',
-                                    self.JSON_SENSOR_SCHEMA)
-        self._sensor_schema = self._load_schema(schema_file)
-
-    def _load_schema(self, schema_file):
-        """Loads a schema from a file and validates
-
-        @param string schema_file     location of schema on the file system
-        @return string                Trimmed and validated schema
-        """
-        with open(schema_file, 'r') as f:
-            schema = json.load(f)
-
-        # Validate the schema to conform to Draft 3 specification
-        Draft3Validator.check_schema(schema)
-
-        return schema
+        # Compile the request schemas up front so that a broken schema
+        #  fails the module at start up rather than on the first message
+        schema_registry.get_validator(self.JSON_ACTUATOR_SCHEMA)
+        schema_registry.get_validator(self.JSON_SENSOR_SCHEMA)
 
     def initialize(self, conf_reader, msgQlist, products):
         """initialize configuration reader and internal msg queues"""
@@ -174,13 +154,13 @@ class PlaneCntrlRMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
                 msgType = message.get("actuator_request_type")
 
                 # Validate against the actuator schema
-                validate(ingressMsg, self._actuator_schema)
+                schema_registry.validate(ingressMsg, self.JSON_ACTUATOR_SCHEMA)
 
             elif message.get("sensor_request_type") is not None:
                 msgType = message.get("sensor_request_type")
 
                 # Validate against the sensor schema
-                validate(ingressMsg, self._sensor_schema)
+                schema_registry.validate(ingressMsg, self.JSON_SENSOR_SCHEMA)
 
             else:
                 # We only handle incoming actuator and sensor requests, ignore everything else
@@ -93,6 +93,7 @@ class RabbitMQSafeConnection:
         self.routing_key = routing_key
         self.queue_name = queue_name
         self.wait_time = 10
+        self._tx_selected = False
         self.connection = self._establish_connection(raise_err=False)
 
     def _retry_connection(self):
@@ -128,6 +129,36 @@ class RabbitMQSafeConnection:
             self._establish_connection()
             self.publish(exchange, routing_key, properties, body)
 
+    def publish_batch(self, exchange, routing_key, properties, bodies):
+        """Publishes all the bodies inside a single channel transaction so
+        that the broker accepts either all or none of them. Returns the list
+        of bodies which were not committed, the connection is re-established
+        for the next batch in that case.
+        """
+        try:
+            if not self._tx_selected:
+                self._channel.tx_select()
+                self._tx_selected = True
+            for body in bodies:
+                self._channel.basic_publish(
+                    exchange=exchange,
+                    routing_key=routing_key,
+                    properties=properties,
+                    body=body,
+                )
+            self._channel.tx_commit()
+            return []
+        except connection_exceptions as e:
+            logger.error(connection_error_msg.format(e))
+            logger.error(f'Connection closed while publishing a batch of {len(bodies)} messages')
+        except pika.exceptions.AMQPError as e:
+            logger.error(f'Batch of {len(bodies)} messages not committed: {repr(e)}')
+        try:
+            self._establish_connection()
+        except Exception as e:
+            logger.error(f'Unable to re-establish RabbitMQ connection: {repr(e)}')
+        return list(bodies)
+
     def consume(self, callback):
         """Consumes based on routing key. Retries if fails."""
         try:
@@ -162,6 +193,7 @@ class RabbitMQSafeConnection:
     def _establish_connection(self, raise_err=True):
         """Connects to a RabbitMQ node and binds the queues if available.
         """
+        self._tx_selected = False
         try:
             self._connection = get_cluster_connection(
                 self.username, self.password, self.virtual_host
@@ -41,6 +41,7 @@ class RabbitMQEgressAccumulatedMsgsProcessor(ScheduledModuleThread, InternalMsgQ
 
     SENSOR_NAME = "RabbitMQEgressAccumulatedMsgsProcessor"
     PRIORITY    = 1
+    DISPATCH_ON_MSGQ = True
 
     #TODO: read egress config from comman place
     # Section and keys in configuration file
@@ -27,6 +27,7 @@ import sys
 from framework.base.module_thread import ScheduledModuleThread
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.utils.service_logging import logger
+from framework.utils.message_signer import MessageSigner
 from .rabbitmq_connector import RabbitMQSafeConnection, connection_exceptions
 from framework.utils import encryptor
 from framework.utils.store_factory import store
@@ -48,6 +49,7 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "RabbitMQegressProcessor"
     PRIORITY    = 1
+    DISPATCH_ON_MSGQ = True
 
     # Section and keys in configuration file
     RABBITMQPROCESSOR       = MODULE_NAME.upper()
@@ -68,6 +70,8 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
     SIGNATURE_EXPIRES       = 'message_signature_expires'
     IEM_ROUTE_ADDR          = 'iem_route_addr'
     IEM_ROUTE_EXCHANGE_NAME = 'iem_route_exchange_name'
+    PUBLISH_BATCH_SIZE      = 'publish_batch_size'
+    PUBLISH_BATCH_WAIT_MS   = 'publish_batch_wait_ms'
 
     SYSTEM_INFORMATION_KEY = 'SYSTEM_INFORMATION'
     CLUSTER_ID_KEY = 'cluster_id'
@@ -96,6 +100,20 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
 
         self._product = product
 
+        # Sensor messages waiting to be published in one transaction
+        self._batch = []
+        self._batch_started = 0
+        self._publish_stats = {
+            "batches": 0,
+            "messages": 0,
+            "failed": 0,
+            "last_batch_size": 0,
+            "max_batch_size": 0,
+            "batch_latency_ms": 0,
+            "confirm_lag_ms": 0,
+            "max_confirm_lag_ms": 0
+        }
+
         # Configure RabbitMQ Exchange to transmit messages
         self._connection = None
         self._read_config()
@@ -136,6 +154,21 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
                 if self._jsonMsg is not None:
                     self._transmit_msg_on_exchange()
 
+                if len(self._batch) >= self._publish_batch_size:
+                    self._flush_batch()
+
+            # Give a burst of alerts the chance to fill up the batch
+            while self._batch and len(self._batch) < self._publish_batch_size:
+                remaining = self._batch_started + self._publish_batch_wait - time.time()
+                if remaining <= 0:
+                    break
+                self._jsonMsg, self._event = self._read_my_msgQ(timeout=remaining)
+                if self._jsonMsg is None:
+                    break
+                self._transmit_msg_on_exchange()
+
+            self._flush_batch()
+
         except Exception:
             # Log it and restart the whole process when a failure occurs
             logger.error("RabbitMQegressProcessor restarting")
@@ -195,12 +228,24 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
             self._signature_expires = self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
                                                                  self.SIGNATURE_EXPIRES,
                                                                  "3600")
+            # Session token reused for signing until it expires
+            self._signer = None
+            if use_security_lib:
+                self._signer = MessageSigner(SSPL_SEC, self._signature_user,
+                                             self._signature_token,
+                                             int(self._signature_expires))
             self._iem_route_addr = self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
                                                                  self.IEM_ROUTE_ADDR,
                                                                  '')
             self._iem_route_exchange_name = self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
                                                                  self.IEM_ROUTE_EXCHANGE_NAME,
                                                                  'sspl-in')
+            self._publish_batch_size = int(self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
+                                                                 self.PUBLISH_BATCH_SIZE,
+                                                                 100))
+            self._publish_batch_wait = int(self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
+                                                                 self.PUBLISH_BATCH_WAIT_MS,
+                                                                 50)) / 1000.0
 
             cluster_id = self._conf_reader._get_value_with_default(self.SYSTEM_INFORMATION_KEY,
                                                                    COMMON_CONFIGS.get(self.SYSTEM_INFORMATION_KEY).get(self.CLUSTER_ID_KEY),
@@ -224,21 +269,11 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
         self._jsonMsg["time"]     = str(int(time.time()))
 
         if use_security_lib:
-            authn_token_len = len(self._signature_token) + 1
-            session_length  = int(self._signature_expires)
-            token = ctypes.create_string_buffer(SSPL_SEC.sspl_get_token_length())
-
-            SSPL_SEC.sspl_generate_session_token(
-                                    self._signature_user, authn_token_len,
-                                    self._signature_token, session_length, token)
-
             # Generate the signature
             msg_len = len(self._jsonMsg) + 1
-            sig = ctypes.create_string_buffer(SSPL_SEC.sspl_get_sig_length())
-            SSPL_SEC.sspl_sign_message(msg_len, str(self._jsonMsg), self._signature_user,
-                                       token, sig)
+            sig = self._signer.sign(msg_len, str(self._jsonMsg))
 
-            self._jsonMsg["signature"] = str(sig.raw, encoding='utf-8')
+            self._jsonMsg["signature"] = str(sig, encoding='utf-8')
         else:
             self._jsonMsg["signature"] = "SecurityLibNotInstalled"
 
@@ -291,6 +326,10 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
             else:
                 self._add_signature()
                 jsonMsg = json.dumps(self._jsonMsg).encode('utf8')
+                if self._publish_batch_size > 1:
+                    # Published and its event set by _flush_batch()
+                    self._add_to_batch(jsonMsg)
+                    return
                 try:
                     self._connection.publish(exchange=self._exchange_name,
                                             routing_key=self._routing_key,
@@ -313,6 +352,62 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
         except Exception as ex:
             logger.error(f'RabbitMQegressProcessor, _transmit_msg_on_exchange, problem while publishing the message:{ex}, adding message to consul: {self._jsonMsg}')
 
+    def _add_to_batch(self, jsonMsg):
+        """Queue a signed sensor message for the next batched publish"""
+        if not self._batch:
+            self._batch_started = time.time()
+        self._batch.append((jsonMsg, self._event))
+
+    def _flush_batch(self):
+        """Publish the pending batch in a single channel transaction,
+           messages which are not committed go to the persistent store"""
+        if not self._batch:
+            return
+
+        msg_props = pika.BasicProperties()
+        msg_props.content_type = "text/plain"
+        bodies = [jsonMsg for jsonMsg, _ in self._batch]
+
+        publish_start = time.time()
+        try:
+            failed = self._connection.publish_batch(exchange=self._exchange_name,
+                                                    routing_key=self._routing_key,
+                                                    properties=msg_props,
+                                                    bodies=bodies)
+        except Exception as err:
+            logger.error(f'RabbitMQegressProcessor, _flush_batch, Unknown error {err} while publishing batch')
+            failed = bodies
+        publish_end = time.time()
+
+        if failed:
+            logger.error("RabbitMQegressProcessor, _flush_batch, %d messages not delivered, " \
+                         "adding them to persistent store" % len(failed))
+            for jsonMsg in failed:
+                store_queue.put(jsonMsg)
+
+        for _, event in self._batch:
+            if event:
+                event.set()
+
+        stats = self._publish_stats
+        stats["batches"] += 1
+        stats["messages"] += len(bodies)
+        stats["failed"] += len(failed)
+        stats["last_batch_size"] = len(bodies)
+        stats["max_batch_size"] = max(stats["max_batch_size"], len(bodies))
+        stats["batch_latency_ms"] = int((publish_end - self._batch_started) * 1000)
+        stats["confirm_lag_ms"] = int((publish_end - publish_start) * 1000)
+        stats["max_confirm_lag_ms"] = max(stats["max_confirm_lag_ms"], stats["confirm_lag_ms"])
+        self._log_debug("_flush_batch, publish stats: %s" % stats)
+
+        self._batch = []
+
+    def get_publish_stats(self):
+        """Returns the counters of the batched publish path"""
+        return dict(self._publish_stats)
+
     def shutdown(self):
         """Clean up scheduler queue and gracefully shutdown thread"""
+        self._flush_batch()
+        store_queue.close()
         super(RabbitMQegressProcessor, self).shutdown()
@@ -27,8 +27,6 @@ import time
 from cortx.utils.security.cipher import Cipher
 import pika
 
-from jsonschema import Draft3Validator
-from jsonschema import validate
 from framework.base.module_thread import ScheduledModuleThread
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.utils.service_logging import logger
@@ -36,6 +34,7 @@ from .rabbitmq_connector import RabbitMQSafeConnection
 from framework.utils import encryptor
 from framework.rabbitmq.rabbitmq_egress_processor import RabbitMQegressProcessor
 from json_msgs.messages.actuators.ack_response import AckResponseMsg
+from json_msgs.schema_registry import schema_registry
 from framework.base.sspl_constants import RESOURCE_PATH, ServiceTypes, COMMON_CONFIGS
 
 
@@ -53,6 +52,7 @@ class RabbitMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "RabbitMQingressProcessor"
     PRIORITY = 1
+    DISPATCH_ON_MSGQ = True
 
     # Section and keys in configuration file
     RABBITMQPROCESSOR = MODULE_NAME.upper()
@@ -68,8 +68,8 @@ class RabbitMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
     CLUSTER_ID_KEY = 'cluster_id'
     NODE_ID_KEY = 'node_id'
 
-    JSON_ACTUATOR_SCHEMA = "SSPL-LL_Actuator_Request.json"
-    JSON_SENSOR_SCHEMA = "SSPL-LL_Sensor_Request.json"
+    JSON_ACTUATOR_SCHEMA = schema_registry.ACTUATOR_REQUEST
+    JSON_SENSOR_SCHEMA = schema_registry.SENSOR_REQUEST
 
     @staticmethod
     def name():
@@ -80,15 +80,10 @@ class RabbitMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
         super(RabbitMQingressProcessor, self).__init__(self.MODULE_NAME,
                                                        self.PRIORITY)
 
-        # Read in the actuator schema for validating messages
-        schema_file = os.path.join(RESOURCE_PATH + '/actuators',
-                                   self.JSON_ACTUATOR_SCHEMA)
-        self._actuator_schema = self._load_schema(schema_file)
-
-        # Read in the sensor schema for validating messages
-        schema_file = os.path.join(RESOURCE_PATH + '/sensors',
-                                   self.JSON_SENSOR_SCHEMA)
-        self._sensor_schema = self._load_schema(schema_file)
+        # Compile the request schemas up front so that a broken schema
+        #  fails the module at start up rather than on the first message
+        schema_registry.get_validator(self.JSON_ACTUATOR_SCHEMA)
+        schema_registry.get_validator(self.JSON_SENSOR_SCHEMA)
 
         self._virtual_host = None
         self._queue_name = None
@@ -100,20 +95,6 @@ class RabbitMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
         self._password = None
         self._channel = None
 
-    def _load_schema(self, schema_file):
-        """Loads a schema from a file and validates
-
-        @param string schema_file     location of schema on the file system
-        @return string                Trimmed and validated schema
-        """
-        with open(schema_file, 'r') as f:
-            schema = json.load(f)
-
-        # Validate the schema to conform to Draft 3 specification
-        Draft3Validator.check_schema(schema)
-
-        return schema
-
     def initialize(self, conf_reader, msgQlist, product):
         """initialize configuration reader and internal msg queues"""
         # Initialize ScheduledMonitorThread
@@ -181,13 +162,13 @@ class RabbitMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
                 msgType = message.get("actuator_request_type")
 
                 # Validate against the actuator schema
-                validate(ingressMsg, self._actuator_schema)
+                schema_registry.validate(ingressMsg, self.JSON_ACTUATOR_SCHEMA)
 
             elif message.get("sensor_request_type") is not None:
                 msgType = message.get("sensor_request_type")
 
                 # Validate against the sensor schema
-                validate(ingressMsg, self._sensor_schema)
+                schema_registry.validate(ingressMsg, self.JSON_SENSOR_SCHEMA)
 
             else:
                 # We only handle incoming actuator and sensor requests, ignore
@@ -86,6 +86,7 @@ class ThreadController(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "ThreadController"
     PRIORITY = 1
+    DISPATCH_ON_MSGQ = True
 
     # Section and keys in configuration file
     THREADCONTROLLER = MODULE_NAME.upper()
@@ -0,0 +1,311 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Store serving reads from memory and writing behind to
+                    the file or consul store
+ ****************************************************************************
+"""
+
+import copy
+import time
+import atexit
+import threading
+
+from framework.utils.store import Store
+from framework.utils.service_logging import logger
+
+# Cache entry of a key deleted but not flushed yet
+_DELETED = object()
+
+
+class CachingStore(Store):
+    """Caches the data of the keys read or written through it.
+
+       A key read from the backend store is served from memory for
+       cache_ttl seconds, then read from the backend again. A missing key
+       is not cached, it is read from the backend again until another
+       process or a put creates it. Writes update the cache and are
+       flushed to the backend every flush_interval seconds, the writes of
+       a key in between are coalesced to the last one. A key written and
+       not flushed yet is always served from memory. Data is copied in
+       and out of the cache, so callers can change what they got or put
+       as with the backend.
+
+       Only the keys this process alone writes are safe to cache, such as
+       the sensor caches under DATA_PATH. Another process, e.g. SSPL on
+       the other node sharing consul, writing one of them is seen after
+       at most cache_ttl seconds, or right away after invalidate(). Keys
+       under uncached_prefixes, which other processes write such as the
+       configuration and the StoreQueue of the unsent messages, and values
+       put unpickled are passed through to the backend. Any other method
+       is delegated to the backend, e.g. FileStore.read().
+    """
+
+    DEFAULT_FLUSH_INTERVAL = 5
+    DEFAULT_CACHE_TTL = 60
+
+    # Operations per backend transaction, the consul limit
+    FLUSH_BATCH = 64
+
+    def __init__(self, backend, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 uncached_prefixes=(), cache_ttl=DEFAULT_CACHE_TTL):
+        """
+        backend:           FileStore or ConsulStore written behind
+        flush_interval:    seconds between two flushes of the pending writes
+        uncached_prefixes: prefixes of the keys not cached
+        cache_ttl:         seconds the data read or flushed is served from
+                           memory before being read from the backend again
+        """
+        super(CachingStore, self).__init__()
+        self.backend = backend
+        self._flush_interval = flush_interval
+        self._cache_ttl = cache_ttl
+        self._uncached_prefixes = tuple(prefix.lstrip("/") for prefix in uncached_prefixes)
+
+        # key -> data, or _DELETED
+        self._cache = {}
+        # keys written since the last flush
+        self._dirty = set()
+        # key -> time.monotonic() after which the data is read again, for
+        # the keys in sync with the backend
+        self._expiry = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        self._metrics = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "coalesced": 0,
+                         "flushes": 0, "flushed_keys": 0, "flush_errors": 0}
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="CachingStore", daemon=True)
+        self._thread.start()
+        # Last resort, shutdown_handler flushes before exiting
+        atexit.register(self.flush)
+
+    def __getattr__(self, name):
+        if name == "backend":
+            # Not set yet, e.g. while being copied
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    def _is_cached(self, key):
+        return not key.lstrip("/").startswith(self._uncached_prefixes)
+
+    def _is_fresh(self, key):
+        """True if key has data in the cache which can be served, called
+           with self._lock held"""
+        if key not in self._cache:
+            return False
+        if key in self._dirty or time.monotonic() < self._expiry.get(key, 0):
+            return True
+        # Expired, read from the backend again
+        self._metrics["expired"] += 1
+        del self._cache[key]
+        self._expiry.pop(key, None)
+        return False
+
+    def _set_clean(self, key, data):
+        """Caches data read from or flushed to the backend, called with
+           self._lock held"""
+        self._cache[key] = data
+        self._expiry[key] = time.monotonic() + self._cache_ttl
+
+    def get(self, key, *args, **kwargs):
+        """get data from the cache, loading it from the backend on a miss.
+           calls with extra arguments (config options, recurse) are not cached
+        """
+        if args or kwargs or not self._is_cached(key):
+            return self.backend.get(key, *args, **kwargs)
+
+        with self._lock:
+            if self._is_fresh(key):
+                self._metrics["hits"] += 1
+                data = self._cache[key]
+                return None if data is _DELETED else copy.deepcopy(data)
+            self._metrics["misses"] += 1
+
+        data = self.backend.get(key)
+        if data is not None:
+            with self._lock:
+                # Unless written while it was being read
+                if key not in self._cache:
+                    self._set_clean(key, copy.deepcopy(data))
+        return data
+
+    def put(self, value, key, pickled=True):
+        if not pickled or not self._is_cached(key):
+            # Raw values read back differently from each backend
+            with self._lock:
+                self._cache.pop(key, None)
+                self._expiry.pop(key, None)
+                self._dirty.discard(key)
+            self.backend.put(value, key, pickled)
+            return
+
+        with self._lock:
+            self._metrics["writes"] += 1
+            if key in self._dirty:
+                self._metrics["coalesced"] += 1
+            self._cache[key] = copy.deepcopy(value)
+            self._expiry.pop(key, None)
+            self._dirty.add(key)
+
+    def exists(self, key):
+        if self._is_cached(key):
+            with self._lock:
+                data = self._cache.get(key) if self._is_fresh(key) else None
+                if data is _DELETED:
+                    return False, "Success"
+                # A None put may be a key holding None, let the backend tell
+                if data is not None:
+                    return True, "Success"
+        return self.backend.exists(key)
+
+    def delete(self, key):
+        if not self._is_cached(key):
+            self.backend.delete(key)
+            return
+
+        with self._lock:
+            self._metrics["writes"] += 1
+            if key in self._dirty:
+                self._metrics["coalesced"] += 1
+            self._cache[key] = _DELETED
+            self._expiry.pop(key, None)
+            self._dirty.add(key)
+
+    def get_keys_with_prefix(self, prefix):
+        # The backend lists the keys, it must have the pending writes
+        self.flush()
+        return self.backend.get_keys_with_prefix(prefix)
+
+    def get_recursive(self, prefix):
+        self.flush()
+        return self.backend.get_recursive(prefix)
+
+    def get_many(self, keys):
+        values, missed = {}, []
+        for key in keys:
+            with self._lock:
+                cached = self._is_cached(key) and self._is_fresh(key)
+            if cached:
+                values[key] = self.get(key)
+            else:
+                missed.append(key)
+
+        if missed:
+            loaded, status = self.backend.get_many(missed)
+            if status != "Success":
+                return {}, status
+            with self._lock:
+                self._metrics["misses"] += len(missed)
+                for key, data in loaded.items():
+                    if data is not None and self._is_cached(key) and key not in self._cache:
+                        self._set_clean(key, copy.deepcopy(data))
+            values.update(loaded)
+        return values, "Success"
+
+    def txn(self, operations):
+        """applied to the backend right away, so that it stays atomic"""
+        self.flush()
+        committed = self.backend.txn(operations)
+        with self._lock:
+            for operation in operations:
+                if committed and operation[0] == "set":
+                    self._set_clean(operation[1], copy.deepcopy(operation[2]))
+                else:
+                    # Read from the backend again
+                    self._cache.pop(operation[1], None)
+                    self._expiry.pop(operation[1], None)
+        return committed
+
+    def watch(self, key, *args, **kwargs):
+        return self.backend.watch(key, *args, **kwargs)
+
+    def flush(self):
+        """writes the pending puts and deletes to the backend"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                operations = []
+                for key in sorted(self._dirty):
+                    data = self._cache[key]
+                    if data is _DELETED:
+                        operations.append(("delete", key))
+                    else:
+                        operations.append(("set", key, copy.deepcopy(data)))
+                self._dirty.clear()
+
+            failed = []
+            for start in range(0, len(operations), self.FLUSH_BATCH):
+                batch = operations[start:start + self.FLUSH_BATCH]
+                try:
+                    committed = self.backend.txn(batch)
+                except Exception as err:
+                    logger.error(f"CachingStore, flush failed: {err}")
+                    committed = False
+                if not committed:
+                    failed.extend(batch)
+
+            with self._lock:
+                self._metrics["flushes"] += 1
+                self._metrics["flushed_keys"] += len(operations) - len(failed)
+                if failed:
+                    # Retried with the next flush, unless written again since
+                    self._metrics["flush_errors"] += 1
+                    self._dirty.update(operation[1] for operation in failed)
+                for operation in operations:
+                    key = operation[1]
+                    if key in self._dirty:
+                        continue
+                    if self._cache.get(key) is _DELETED:
+                        # Read from the backend again from now on
+                        del self._cache[key]
+                    elif key in self._cache:
+                        # In sync with the backend, expires from now on
+                        self._expiry[key] = time.monotonic() + self._cache_ttl
+
+        logger.debug(f"CachingStore, flushed {len(operations) - len(failed)} keys, "
+                     f"metrics: {self.get_metrics()}")
+
+    def invalidate(self):
+        """drops the cached data already in the backend, e.g. after the other
+           node wrote the store, so that it is read again. The writes not
+           flushed yet are kept."""
+        with self._lock:
+            self._cache = {key: data for key, data in self._cache.items()
+                           if key in self._dirty}
+            self._expiry.clear()
+
+    def close(self):
+        """stops the flush thread and flushes the pending writes"""
+        self._stop.set()
+        self.flush()
+
+    def get_metrics(self):
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["pending"] = len(self._dirty)
+            metrics["cached_keys"] = len(self._cache)
+        return metrics
+
+    def _run(self):
+        while not self._stop.wait(self._flush_interval):
+            try:
+                self.flush()
+            except Exception as err:
+                logger.error(f"CachingStore, flush failed: {err}")
@@ -29,6 +29,7 @@ from framework.base.sspl_constants import (component, salt_provisioner_pillar_sl
         MAX_CONSUL_RETRY, WAIT_BEFORE_RETRY, CONSUL_ERR_STRING, CONSUL_HOST, PRODUCT_NAME)
 from framework.utils.consulstore import ConsulStore
 from framework.utils.filestore import FileStore
+from framework.utils.caching_store import CachingStore
 # Onward LDR_R2, consul and salt will be abstracted out and won't exist as hard dependencies of SSPL
 try:
     import salt.client
@@ -146,6 +147,10 @@ class ConfigReader(object):
         """
         print("Running via sspl service and taking key values from store factory")
         from framework.utils.store_factory import store
+        # Config is read from the file or consul store itself, it changes
+        # outside of SSPL
+        if isinstance(store, CachingStore):
+            store = store.backend
         self.store = store
 
     def _get_value(self, section, key):
@@ -24,12 +24,20 @@ import consul
 from framework.utils.store import Store
 from framework.utils.service_logging import logger
 import pickle
+import base64
+import threading
 from framework.base.sspl_constants import MAX_CONSUL_RETRY, WAIT_BEFORE_RETRY, CONSUL_ERR_STRING
 import time
 import requests
 
 class ConsulStore(Store):
 
+    # Consul rejects transactions of more operations
+    MAX_TXN_OPERATIONS = 64
+
+    # Longest time a watch blocks on consul before asking again
+    WATCH_WAIT = "60s"
+
     def __init__(self, host, port):
         super(Store, self).__init__()
         for retry_index in range(0, MAX_CONSUL_RETRY):
@@ -191,3 +199,169 @@ class ConsulStore(Store):
                     logger.warn("Error[{0}] while getting the keys from consul" \
                         .format(gerr))
                     break
+
+    def _retry(self, description, func, *args, **kwargs):
+        """call func, retrying while consul refuses connections.
+           returns (result, status)
+        """
+        for retry_index in range(0, MAX_CONSUL_RETRY):
+            try:
+                return func(*args, **kwargs), "Success"
+
+            except requests.exceptions.ConnectionError as connerr:
+                logger.warn("Error[{0}] consul connection refused Retry Index {1}" \
+                    .format(connerr, retry_index))
+                time.sleep(WAIT_BEFORE_RETRY)
+
+            except Exception as gerr:
+                consulerr = str(gerr)
+                if CONSUL_ERR_STRING == consulerr:
+                    logger.warn("Error[{0}] consul connection refused Retry Index {1}" \
+                        .format(gerr, retry_index))
+                    time.sleep(WAIT_BEFORE_RETRY)
+                else:
+                    logger.warn("Error[{0}] while {1}".format(gerr, description))
+                    break
+
+        return None, "Failure"
+
+    def _load(self, value):
+        """unpickle a consul value, values not pickled are returned as is"""
+        try:
+            return pickle.loads(value)
+        except:
+            return value
+
+    def _txn(self, operations):
+        """run KV operations of a consul transaction, returns their results"""
+        response = self.consul_conn.txn.put(operations)
+        return response.get("Results") or []
+
+    def get_many(self, keys):
+        """get data of several keys with transactions of get-tree
+           operations, MAX_TXN_OPERATIONS keys per round trip. get-tree
+           does not fail the transaction on a missing key like get does.
+           returns ({key: data}, status), keys not present map to None
+        """
+        values = dict.fromkeys(keys)
+        consul_keys = {self._get_key(key): key for key in keys}
+        pending = list(consul_keys)
+        for start in range(0, len(pending), self.MAX_TXN_OPERATIONS):
+            operations = [{"KV": {"Verb": "get-tree", "Key": key}}
+                          for key in pending[start:start + self.MAX_TXN_OPERATIONS]]
+            results, status = self._retry("reading keys from consul", self._txn, operations)
+            if status != "Success":
+                return {}, status
+
+            for result in results:
+                kv = result.get("KV") or {}
+                # get-tree also returns the keys the requested one prefixes
+                key = consul_keys.get(kv.get("Key"))
+                if key is not None and kv.get("Value") is not None:
+                    values[key] = self._load(base64.b64decode(kv["Value"]))
+
+        return values, "Success"
+
+    def put_many(self, values, pickled=True):
+        """write data of several keys, {key: value}, with transactions of
+           at most MAX_TXN_OPERATIONS keys. returns True if they were all
+           committed, the transactions after a failed one are not run
+        """
+        operations = []
+        for key, value in values.items():
+            if pickled:
+                value = pickle.dumps(value)
+            operations.append(("set", key, value))
+
+        for start in range(0, len(operations), self.MAX_TXN_OPERATIONS):
+            if not self._run_txn(operations[start:start + self.MAX_TXN_OPERATIONS], pickled=False):
+                logger.error(f"ConsulStore, failed to write {len(operations) - start} "
+                             f"of {len(operations)} keys")
+                return False
+        return True
+
+    def txn(self, operations):
+        """atomically apply a list of ("set", key, value) and ("delete", key)
+           operations, at most MAX_TXN_OPERATIONS. returns True if the
+           transaction was committed
+        """
+        if len(operations) > self.MAX_TXN_OPERATIONS:
+            raise ValueError(f"consul transactions are limited to "
+                             f"{self.MAX_TXN_OPERATIONS} operations")
+        return self._run_txn(operations)
+
+    def _run_txn(self, operations, pickled=True):
+        consul_operations = []
+        for operation in operations:
+            key = self._get_key(operation[1])
+            if operation[0] == "set":
+                value = pickle.dumps(operation[2]) if pickled else operation[2]
+                if isinstance(value, str):
+                    value = value.encode("utf-8")
+                consul_operations.append({"KV": {"Verb": "set", "Key": key,
+                                          "Value": base64.b64encode(value).decode("ascii")}})
+            elif operation[0] == "delete":
+                consul_operations.append({"KV": {"Verb": "delete", "Key": key}})
+            else:
+                raise ValueError(f"unknown store operation {operation[0]}")
+
+        _, status = self._retry("running consul transaction", self._txn, consul_operations)
+        return status == "Success"
+
+    def get_recursive(self, prefix):
+        """ get {key: data} of all the keys with given prefix in one request
+        """
+        data, status = self._retry("reading keys from consul",
+                                   self.consul_conn.kv.get, self._get_key(prefix), recurse=True)
+        if status != "Success":
+            return {}
+        return self._items_to_dict(prefix, data[1])
+
+    def _items_to_dict(self, prefix, items):
+        # Keys are returned with the leading '/' of the prefix, as they were put
+        lead = "/" if prefix[:1] == "/" else ""
+        return {lead + item["Key"]: self._load(item["Value"]) for item in items or []}
+
+    def watch(self, key, callback, interval=5, recurse=False):
+        """call callback(data) on a daemon thread each time the data of key,
+           or {key: data} of the keys it prefixes if recurse, changes. Uses
+           consul blocking queries, tracking the index of the last answer,
+           so changes are seen right away and interval is not used.
+           returns an Event stopping the watch when set.
+        """
+        stop = threading.Event()
+
+        def read(index):
+            result, status = self._retry(f"watching {key}", self.consul_conn.kv.get,
+                                         self._get_key(key), index=index,
+                                         wait=self.WATCH_WAIT, recurse=recurse)
+            if status != "Success":
+                return None, None, status
+            new_index, items = result
+            if recurse:
+                return new_index, self._items_to_dict(key, items), status
+            return new_index, self._load(items["Value"]) if items else None, status
+
+        # The current data, changes are reported from here on
+        index, last, _ = read(None)
+
+        def block():
+            nonlocal index, last
+            while not stop.is_set():
+                new_index, data, status = read(index)
+                if status != "Success":
+                    stop.wait(WAIT_BEFORE_RETRY)
+                    continue
+
+                if data != last:
+                    callback(data)
+                last = data
+
+                # An index going backwards means the raft state was reset
+                if index is not None and new_index is not None and \
+                        int(new_index) < int(index):
+                    new_index = 0
+                index = new_index
+
+        threading.Thread(target=block, name=f"watch {key}", daemon=True).start()
+        return stop
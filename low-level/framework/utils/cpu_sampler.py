@@ -0,0 +1,170 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Samples /proc/stat on a background thread and keeps the
+                    CPU usage of the last interval and the 1, 5 and 15 minute
+                    exponentially weighted averages of each core
+ ****************************************************************************
+"""
+
+import math
+import time
+import threading
+
+from framework.utils.service_logging import logger
+
+
+class CpuSampler(object):
+    """Reads /proc/stat once per interval.
+
+       The usage of a cpu over an interval is the share of its non idle
+       time, computed as psutil.cpu_percent() does. Each sample is folded
+       into the per core averages the way the kernel computes its load
+       averages, weighted by exp(-elapsed / period), so that only the last
+       counters and the averages are kept. The getters never block on a
+       sample.
+    """
+
+    DEFAULT_INTERVAL = 5
+    PROC_STAT = "/proc/stat"
+
+    # Periods in seconds of the per core averages
+    AVERAGE_PERIODS = (60, 300, 900)
+
+    # user nice system idle iowait irq softirq steal guest guest_nice
+    TIMES_FIELDS = 10
+    IDLE, IOWAIT, GUEST, GUEST_NICE = 3, 4, 8, 9
+
+    def __init__(self, interval=DEFAULT_INTERVAL, path=PROC_STAT):
+        """
+        interval: seconds between two reads of /proc/stat
+        path:     file read, for tests
+        """
+        self._interval = interval
+        self._path = path
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Counters and time of the last read, {"cpu": [...], "cpu0": [...]}
+        self._last_times = None
+        self._last_sample = None
+
+        # Percentages of the last interval of the whole system
+        self._usage = None
+        self._times_percent = None
+
+        # Core index -> [1 min, 5 min, 15 min] average usage
+        self._averages = {}
+
+    def start(self):
+        """Takes the first sample and samples on a daemon thread from then on"""
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="CpuSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            try:
+                self.sample()
+            except Exception as err:
+                logger.warn(f"CpuSampler, failed to sample {self._path}: {err}")
+
+    def sample(self):
+        """Reads the counters and updates the usage and averages"""
+        times = self._read_times()
+        now = time.time()
+
+        with self._lock:
+            last_times, last_sample = self._last_times, self._last_sample
+            self._last_times, self._last_sample = times, now
+            if last_times is None:
+                return
+
+            if "cpu" in last_times and "cpu" in times:
+                deltas = self._get_deltas(last_times["cpu"], times["cpu"])
+                total = sum(deltas[:self.GUEST])
+                if total > 0:
+                    self._times_percent = [delta * 100.0 / total for delta in deltas]
+                    self._usage = self._get_usage(deltas)
+
+            decays = [math.exp(-(now - last_sample) / period)
+                      for period in self.AVERAGE_PERIODS]
+            for name, core_times in times.items():
+                if name == "cpu" or name not in last_times:
+                    continue
+                usage = self._get_usage(self._get_deltas(last_times[name], core_times))
+                if usage is None:
+                    continue
+                core = int(name[3:])
+                averages = self._averages.get(core)
+                if averages is None:
+                    # Seeded with the first interval rather than ramping up from 0
+                    self._averages[core] = [usage] * len(self.AVERAGE_PERIODS)
+                else:
+                    self._averages[core] = [average * decay + usage * (1 - decay)
+                                            for average, decay in zip(averages, decays)]
+
+    def get_usage(self):
+        """Percentage of cpu time used over the last interval, 0.0 until
+           two samples were taken"""
+        with self._lock:
+            return self._usage if self._usage is not None else 0.0
+
+    def get_times_percent(self):
+        """Percentages of the last interval spent in each of the
+           TIMES_FIELDS states, like psutil.cpu_times_percent()"""
+        with self._lock:
+            if self._times_percent is None:
+                return [0.0] * self.TIMES_FIELDS
+            return list(self._times_percent)
+
+    def get_core_averages(self, cores):
+        """Returns [1 min, 5 min, 15 min] average usage of each core in
+           range(cores), -1 for the cores not sampled yet"""
+        with self._lock:
+            return [list(self._averages.get(core, [-1] * len(self.AVERAGE_PERIODS)))
+                    for core in range(cores)]
+
+    def _read_times(self):
+        times = {}
+        with open(self._path) as proc_stat:
+            for line in proc_stat:
+                if not line.startswith("cpu"):
+                    # The cpu lines come first
+                    break
+                fields = line.split()
+                values = [int(value) for value in fields[1:self.TIMES_FIELDS + 1]]
+                # Older kernels have no steal, guest or guest_nice
+                values += [0] * (self.TIMES_FIELDS - len(values))
+                times[fields[0]] = values
+        return times
+
+    def _get_deltas(self, last, current):
+        # Counters can go backwards when a cpu is put back online
+        return [max(new - old, 0) for old, new in zip(last, current)]
+
+    def _get_usage(self, deltas):
+        # guest and guest_nice are already counted in user and nice
+        total = sum(deltas[:self.GUEST])
+        if total <= 0:
+            return None
+        idle = deltas[self.IDLE] + deltas[self.IOWAIT]
+        return (total - idle) * 100.0 / total
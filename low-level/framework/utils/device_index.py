@@ -0,0 +1,212 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Index of the drives by device name, by-id and by-path
+                    symlinks, WWN and serial number, shared by the modules
+ ****************************************************************************
+"""
+
+import os
+import threading
+
+from framework.utils.service_logging import logger
+
+
+class DeviceIndex(object):
+    """Maps any identifier of a drive to the drive.
+
+       A drive is known by its device name (/dev/sda), its /dev/disk
+       symlinks, its WWN and its serial number. SystemdWatchdog updates
+       the index from the UDisks2 drive and block objects as drives come
+       and go. Identifiers not found are looked up again in sysfs, where
+       the serial number is read from the unit serial number VPD page,
+       so that callers need not run smartctl to resolve them.
+    """
+
+    SYS_BLOCK = "/sys/block"
+    SYS_CLASS_BLOCK = "/sys/class/block"
+    DISK_LINK_DIRS = ("/dev/disk/by-id", "/dev/disk/by-path")
+
+    # Block devices which are not drives
+    VIRTUAL_PREFIXES = ("loop", "ram", "zram", "dm-", "md", "nbd", "sr")
+
+    # Unit serial number VPD page, SPC-4 7.8.15
+    VPD_SERIAL_PAGE = 0x80
+
+    def __init__(self, sys_block=SYS_BLOCK, sys_class_block=SYS_CLASS_BLOCK,
+                 disk_link_dirs=DISK_LINK_DIRS):
+        self._sys_block = sys_block
+        self._sys_class_block = sys_class_block
+        self._disk_link_dirs = disk_link_dirs
+        self._lock = threading.Lock()
+
+        # "/dev/sda" -> {"device": str, "serial": str, "wwn": str, "symlinks": set}
+        self._drives = {}
+        # Identifier -> "/dev/sda"
+        self._aliases = {}
+
+    def update(self, device, serial=None, wwn=None, symlinks=()):
+        """Adds or updates a drive. device may be a symlink to the device or
+           one of its partitions, identifiers not given are left as they are"""
+        if not device:
+            return
+        real_device = self._get_disk(os.path.realpath(device))
+        symlinks = set(symlinks)
+        if real_device != device:
+            symlinks.add(device)
+
+        with self._lock:
+            drive = self._drives.setdefault(real_device,
+                        {"device": real_device, "serial": None, "wwn": None, "symlinks": set()})
+            self._unindex(drive)
+            if serial:
+                drive["serial"] = serial
+            if wwn:
+                drive["wwn"] = wwn
+            drive["symlinks"].update(symlinks)
+            self._index(drive)
+
+    def remove(self, *identifiers):
+        """Forgets the drive removed from the system known by identifiers,
+           e.g. its device name and serial number"""
+        with self._lock:
+            for identifier in identifiers:
+                if not identifier:
+                    continue
+                # sysfs is already gone, resolve it as it was indexed
+                drive = self._drives.pop(self._aliases.get(identifier, identifier), None)
+                if drive is not None:
+                    self._unindex(drive)
+
+    def lookup(self, identifier):
+        """Returns a copy of the drive known by identifier, None if no drive
+           has it even after reading sysfs again"""
+        if not identifier:
+            return None
+        drive = self._get(identifier)
+        if drive is None:
+            # Not announced yet or never seen, cheaper than running smartctl
+            if identifier.startswith("/"):
+                self.scan(os.path.basename(os.path.realpath(identifier)))
+            else:
+                self.scan()
+            drive = self._get(identifier)
+        return drive
+
+    def get_serial(self, identifier):
+        """Returns the serial number of the drive known by identifier"""
+        drive = self.lookup(identifier)
+        return drive["serial"] if drive is not None else None
+
+    def scan(self, name=None):
+        """Reads the drives, or only the drive name ("sda"), from sysfs"""
+        try:
+            names = [name] if name else os.listdir(self._sys_block)
+        except OSError as err:
+            logger.warn(f"DeviceIndex, can't list {self._sys_block}: {err}")
+            return
+
+        symlinks = self._read_disk_links()
+        for block in names:
+            if block.startswith(self.VIRTUAL_PREFIXES) or \
+                    not os.path.exists(os.path.join(self._sys_block, block, "device")):
+                continue
+            device = f"/dev/{block}"
+            self.update(device, serial=self._read_serial(block), wwn=self._read_wwn(block),
+                        symlinks=symlinks.get(device, ()))
+
+    def _get_disk(self, device):
+        """Returns the device of the drive a partition is on, else device"""
+        sys_dir = os.path.join(self._sys_class_block, os.path.basename(device))
+        if os.path.exists(os.path.join(sys_dir, "partition")):
+            return "/dev/" + os.path.basename(os.path.dirname(os.path.realpath(sys_dir)))
+        return device
+
+    def _get(self, identifier):
+        with self._lock:
+            device = self._aliases.get(identifier)
+            if device is None and identifier.startswith("/"):
+                device = self._aliases.get(os.path.realpath(identifier))
+            drive = self._drives.get(device)
+            if drive is None:
+                return None
+            return dict(drive, symlinks=sorted(drive["symlinks"]))
+
+    def _index(self, drive):
+        for identifier in self._identifiers(drive):
+            previous = self._aliases.get(identifier)
+            if previous is not None and previous != drive["device"] and previous in self._drives:
+                # The identifier moved, e.g. the drive was reinserted under another name
+                self._drives[previous]["symlinks"].discard(identifier)
+            self._aliases[identifier] = drive["device"]
+
+    def _unindex(self, drive):
+        for identifier in self._identifiers(drive):
+            if self._aliases.get(identifier) == drive["device"]:
+                del self._aliases[identifier]
+
+    def _identifiers(self, drive):
+        identifiers = [drive["device"]] + list(drive["symlinks"])
+        identifiers += [value for value in (drive["serial"], drive["wwn"]) if value]
+        return identifiers
+
+    def _read_disk_links(self):
+        """Returns {"/dev/sda": [its /dev/disk symlinks]}"""
+        links = {}
+        for link_dir in self._disk_link_dirs:
+            try:
+                entries = os.listdir(link_dir)
+            except OSError:
+                continue
+            for entry in entries:
+                link = os.path.join(link_dir, entry)
+                links.setdefault(os.path.realpath(link), []).append(link)
+        return links
+
+    def _read_serial(self, block):
+        device_dir = os.path.join(self._sys_block, block, "device")
+        try:
+            with open(os.path.join(device_dir, "vpd_pg80"), "rb") as vpd:
+                page = vpd.read()
+            if len(page) > 4 and page[1] == self.VPD_SERIAL_PAGE:
+                length = int.from_bytes(page[2:4], "big")
+                serial = page[4:4 + length].decode("ascii", "replace").strip("\0 ")
+                if serial:
+                    return serial
+        except OSError:
+            # Not a SCSI device, or the page is not supported
+            pass
+        # NVMe controllers have it in their own attribute
+        return self._read_attribute(os.path.join(device_dir, "serial"))
+
+    def _read_wwn(self, block):
+        for path in (os.path.join(self._sys_block, block, "wwid"),
+                     os.path.join(self._sys_block, block, "device", "wwid")):
+            wwn = self._read_attribute(path)
+            if wwn:
+                return wwn
+        return None
+
+    def _read_attribute(self, path):
+        try:
+            with open(path) as attribute:
+                return attribute.read().strip() or None
+        except (OSError, UnicodeDecodeError):
+            return None
+
+
+device_index = DeviceIndex()
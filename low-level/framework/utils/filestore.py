@@ -155,6 +155,18 @@ class FileStore(Store):
         else:
             return os.listdir(prefix)
 
+    def get_recursive(self, prefix):
+        """ get {file path: data} of all the files under given directory
+        """
+        values = {}
+        if not os.path.isdir(prefix):
+            return values
+        for dirpath, _, filenames in os.walk(prefix):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                values[path] = self._load_json_file(path)
+        return values
+
 if __name__ == '__main__':
     store = FileStore()
     store.read('/etc/sspl.conf')
@@ -0,0 +1,79 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Collects the host_update process counts, uname, boot
+                    time and logged in users without walking /proc
+ ****************************************************************************
+"""
+
+import os
+
+import psutil
+
+from framework.utils.service_logging import logger
+
+
+class HostMetrics(object):
+    """Host information whose cost does not grow with the number of processes.
+
+       The process counts come from the kernel's own counters in
+       /proc/loadavg and /proc/stat. uname and the boot time do not change
+       while SSPL runs and are read once, the logged in users are read again
+       only when utmp is modified.
+    """
+
+    PROC_LOADAVG = "/proc/loadavg"
+    PROC_STAT = "/proc/stat"
+    UTMP = "/var/run/utmp"
+
+    UNAME_KEYS = ("sysname", "nodename", "version", "release", "machine")
+
+    def __init__(self):
+        self.uname = dict(zip(self.UNAME_KEYS, os.uname()))
+        self.boot_time = int(psutil.boot_time())
+
+        self._utmp_mtime = None
+        self._logged_in_users = []
+
+    def get_process_counts(self):
+        """Returns (number of processes and threads, number of them running
+           or in uninterruptible sleep)"""
+        # 4th field of loadavg is running/total scheduling entities
+        with open(self.PROC_LOADAVG) as loadavg:
+            process_count = int(loadavg.read().split()[3].split("/")[1])
+
+        # procs_running and procs_blocked are the R and D states, the ones
+        # not sleeping, stopped, idle or zombie
+        running_count = 0
+        with open(self.PROC_STAT) as proc_stat:
+            for line in proc_stat:
+                if line.startswith(("procs_running", "procs_blocked")):
+                    running_count += int(line.split()[1])
+        return process_count, running_count
+
+    def get_logged_in_users(self):
+        """Returns psutil.users() as dicts, read again when utmp changed"""
+        try:
+            utmp_mtime = os.stat(self.UTMP).st_mtime_ns
+        except OSError as err:
+            logger.debug(f"HostMetrics, can't stat {self.UTMP}: {err}")
+            utmp_mtime = None
+
+        if utmp_mtime is None or utmp_mtime != self._utmp_mtime:
+            self._logged_in_users = [dict(user._asdict()) for user in psutil.users()]
+            self._utmp_mtime = utmp_mtime
+        return list(self._logged_in_users)
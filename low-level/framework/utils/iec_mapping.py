@@ -0,0 +1,130 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       In memory index of the IEC mapping files used to decode
+                    the component, module and event ids of an IEM
+ ****************************************************************************
+"""
+
+import os
+import csv
+import time
+import threading
+
+from framework.utils.service_logging import logger
+
+
+class IECMapping(object):
+    """Loads the IEC mapping CSV files once into dictionaries.
+
+       <mapping_dir>/components maps a component id to a component name
+       ("001,hare") and <mapping_dir>/<component name> maps a full code
+       (component id + module id + event id) to the module and event
+       descriptions ("0020020002,STOBIOQ,Motr IO error"). The files are
+       re-read when their modification time changes.
+    """
+
+    COMPONENTS_FILE = "components"
+
+    def __init__(self, mapping_dir, reload_interval=30):
+        """
+        mapping_dir:     directory holding the IEC mapping files
+        reload_interval: minimum seconds between two checks for modified files
+        """
+        self._mapping_dir = mapping_dir
+        self._reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._last_check = 0
+        self._signature = None
+        # Replaced as a whole on reload so lookups need no locking
+        self._index = ({}, {})
+
+    def get_component(self, component_id):
+        """Returns the component name of a component id or None"""
+        self._check_reload()
+        return self._index[0].get(component_id)
+
+    def decode(self, code):
+        """Decodes a code into (component, module, event). Ids which are
+           not present in the mapping are returned unchanged."""
+        component_id, module_id, event_id = code[:3], code[3:6], code[6:]
+        self._check_reload()
+        components, codes = self._index
+        component = components.get(component_id)
+        if not component:
+            return component_id, module_id, event_id
+        decoded = codes.get(component, {}).get(code)
+        if decoded is None:
+            return component, module_id, event_id
+        return (component,) + decoded
+
+    def _check_reload(self):
+        now = time.time()
+        if now - self._last_check < self._reload_interval:
+            return
+        with self._lock:
+            if now - self._last_check < self._reload_interval:
+                return
+            self._last_check = now
+            signature = self._get_signature()
+            if signature != self._signature:
+                self._index = self._load()
+                self._signature = signature
+
+    def _get_signature(self):
+        """Name and modification time of every mapping file"""
+        signature = []
+        try:
+            for name in sorted(os.listdir(self._mapping_dir)):
+                try:
+                    stat = os.stat(os.path.join(self._mapping_dir, name))
+                    signature.append((name, stat.st_mtime_ns, stat.st_size))
+                except OSError:
+                    pass
+        except OSError:
+            return None
+        return tuple(signature)
+
+    def _read_rows(self, name, min_columns):
+        path = os.path.join(self._mapping_dir, name)
+        rows = []
+        try:
+            with open(path, newline='') as f:
+                rows = [row for row in csv.reader(f) if len(row) >= min_columns]
+        except (IOError, OSError):
+            pass
+        except csv.Error as err:
+            logger.warn(f"IECMapping, unable to parse {path}: {err}")
+        return rows
+
+    def _load(self):
+        components = {}
+        for row in self._read_rows(self.COMPONENTS_FILE, 2):
+            # First entry wins as with the former linear scan
+            components.setdefault(row[0], row[1])
+
+        codes = {}
+        for component in set(components.values()):
+            component_codes = {}
+            for row in self._read_rows(component, 3):
+                component_codes.setdefault(row[0], (row[1], row[2]))
+            if component_codes:
+                codes[component] = component_codes
+
+        logger.debug(f"IECMapping, loaded {len(components)} components and "
+                     f"{sum(len(c) for c in codes.values())} codes from {self._mapping_dir}")
+        return components, codes
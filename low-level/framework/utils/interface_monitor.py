@@ -0,0 +1,257 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Keeps the operational state, carrier and IPv4 addresses
+                    of the network interfaces up to date from rtnetlink
+                    notifications, or by polling when netlink is unavailable
+ ****************************************************************************
+"""
+
+import os
+import errno
+import socket
+import struct
+import threading
+
+import psutil
+
+from framework.utils.service_logging import logger
+
+# rtnetlink constants from linux/rtnetlink.h, linux/if_link.h and linux/if_addr.h
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+NLMSG_HDR = struct.Struct("=LHHLL")
+IFINFOMSG = struct.Struct("=BxHiII")
+IFADDRMSG = struct.Struct("=BBBBI")
+RTATTR = struct.Struct("=HH")
+RTM_NEWLINK, RTM_DELLINK, RTM_NEWADDR, RTM_DELADDR = 16, 17, 20, 21
+IFLA_IFNAME, IFLA_OPERSTATE, IFLA_CARRIER = 3, 16, 33
+IFA_ADDRESS, IFA_LOCAL = 1, 2
+IFF_UP = 0x1
+
+# IF_OPER_* values, named as `ip --brief address` prints them
+OPER_STATES = ("UNKNOWN", "NOTPRESENT", "DOWN", "LOWERLAYERDOWN",
+               "TESTING", "DORMANT", "UP")
+CARRIER_STATES = {"0": "DOWN", "1": "UP"}
+
+
+def _align(length):
+    return (length + 3) & ~3
+
+
+def _parse_attrs(data, offset):
+    """Returns {type: payload} of the rtattrs from offset to the end of data"""
+    attrs = {}
+    while offset + RTATTR.size <= len(data):
+        length, attr_type = RTATTR.unpack_from(data, offset)
+        if length < RTATTR.size:
+            break
+        attrs[attr_type] = data[offset + RTATTR.size:offset + length]
+        offset += _align(length)
+    return attrs
+
+
+class InterfaceMonitor(object):
+    """In memory table of the network interfaces.
+
+       Each interface has an operstate (UP, DOWN, UNKNOWN, ...), a carrier
+       (UP, DOWN or UNKNOWN) and its IPv4 addresses. The table is loaded from
+       sysfs and psutil, then updated from the RTMGRP_LINK and
+       RTMGRP_IPV4_IFADDR multicast groups. Listeners are called with the
+       interface name when its operstate or carrier changes. Without a
+       netlink socket the table is reloaded every poll_interval seconds.
+    """
+
+    DEFAULT_POLL_INTERVAL = 5
+
+    def __init__(self, sys_net_dir="/sys/class/net", poll_interval=DEFAULT_POLL_INTERVAL):
+        self._sys_net_dir = sys_net_dir
+        self._poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listeners = []
+        self._socket = None
+
+        # name -> {"operstate": str, "carrier": str, "ipv4": [str]}
+        self._interfaces = {}
+        # ifindex -> name, addresses are notified by index
+        self._names = {}
+
+    def start(self):
+        try:
+            # Opened before loading the table so that no change is missed
+            self._socket = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW,
+                                         socket.NETLINK_ROUTE)
+            self._socket.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+            target = self._run_netlink
+        except (AttributeError, OSError) as err:
+            logger.warn(f"InterfaceMonitor, no rtnetlink socket, polling every "
+                        f"{self._poll_interval} secs: {err}")
+            self._socket = None
+            target = self._run_polling
+
+        self._refresh_all()
+        threading.Thread(target=target, name="InterfaceMonitor", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        if self._socket is not None:
+            # Wakes up recv() in _run_netlink
+            self._socket.close()
+
+    def add_listener(self, callback):
+        """callback(interface name) is called on the monitor thread"""
+        self._listeners.append(callback)
+
+    def get_state(self, name):
+        """Returns (operstate, carrier, first IPv4 address or "")"""
+        with self._lock:
+            interface = self._interfaces.get(name)
+            if interface is None:
+                return "UNKNOWN", "UNKNOWN", ""
+            ipv4 = interface["ipv4"][0] if interface["ipv4"] else ""
+            return interface["operstate"], interface["carrier"], ipv4
+
+    def _run_polling(self):
+        while not self._stop.wait(self._poll_interval):
+            self._refresh_all()
+
+    def _run_netlink(self):
+        while not self._stop.is_set():
+            try:
+                data = self._socket.recv(65536)
+            except OSError as err:
+                if self._stop.is_set():
+                    break
+                if err.errno == errno.ENOBUFS:
+                    # Notifications were dropped, reload the table
+                    logger.warn("InterfaceMonitor, rtnetlink overrun, reloading interfaces")
+                    self._refresh_all()
+                    continue
+                logger.error(f"InterfaceMonitor, rtnetlink failed, polling instead: {err}")
+                self._run_polling()
+                break
+            try:
+                self._handle_netlink(data)
+            except (struct.error, ValueError) as err:
+                logger.warn(f"InterfaceMonitor, malformed rtnetlink message: {err}")
+
+    def _handle_netlink(self, data):
+        offset = 0
+        while offset + NLMSG_HDR.size <= len(data):
+            length, msg_type, _, _, _ = NLMSG_HDR.unpack_from(data, offset)
+            if length < NLMSG_HDR.size:
+                break
+            msg = data[offset:offset + length]
+            if msg_type in (RTM_NEWLINK, RTM_DELLINK):
+                self._handle_link(msg_type, msg)
+            elif msg_type in (RTM_NEWADDR, RTM_DELADDR):
+                self._handle_addr(msg_type, msg)
+            offset += _align(length)
+
+    def _handle_link(self, msg_type, msg):
+        _, _, index, flags, _ = IFINFOMSG.unpack_from(msg, NLMSG_HDR.size)
+        attrs = _parse_attrs(msg, NLMSG_HDR.size + IFINFOMSG.size)
+        name = attrs.get(IFLA_IFNAME, b"").rstrip(b"\0").decode() or self._names.get(index)
+        if not name:
+            return
+
+        with self._lock:
+            if msg_type == RTM_DELLINK:
+                self._names.pop(index, None)
+                self._interfaces.pop(name, None)
+                return
+            self._names[index] = name
+            interface = self._interfaces.setdefault(
+                            name, {"operstate": "UNKNOWN", "carrier": "UNKNOWN", "ipv4": []})
+            previous = (interface["operstate"], interface["carrier"])
+            if IFLA_OPERSTATE in attrs:
+                operstate = attrs[IFLA_OPERSTATE][0]
+                interface["operstate"] = OPER_STATES[operstate] \
+                    if operstate < len(OPER_STATES) else "UNKNOWN"
+            if not flags & IFF_UP:
+                # As with sysfs, the carrier of an admin down interface is unknown
+                interface["carrier"] = "UNKNOWN"
+            elif IFLA_CARRIER in attrs:
+                interface["carrier"] = CARRIER_STATES.get(str(attrs[IFLA_CARRIER][0]), "UNKNOWN")
+            changed = previous != (interface["operstate"], interface["carrier"])
+
+        if changed:
+            logger.debug(f"InterfaceMonitor, {name}: {interface['operstate']}, "
+                         f"carrier {interface['carrier']}")
+            self._notify(name)
+
+    def _handle_addr(self, msg_type, msg):
+        family, _, _, _, index = IFADDRMSG.unpack_from(msg, NLMSG_HDR.size)
+        if family != socket.AF_INET:
+            return
+        attrs = _parse_attrs(msg, NLMSG_HDR.size + IFADDRMSG.size)
+        address = attrs.get(IFA_LOCAL, attrs.get(IFA_ADDRESS))
+        if address is None:
+            return
+        address = socket.inet_ntoa(address)
+
+        with self._lock:
+            name = self._names.get(index)
+            if name is None or name not in self._interfaces:
+                return
+            addresses = self._interfaces[name]["ipv4"]
+            if msg_type == RTM_NEWADDR and address not in addresses:
+                addresses.append(address)
+            elif msg_type == RTM_DELADDR and address in addresses:
+                addresses.remove(address)
+
+    def _refresh_all(self):
+        """Reloads the table from sysfs and psutil"""
+        addresses = psutil.net_if_addrs()
+        interfaces, names = {}, {}
+        for name in psutil.net_if_stats():
+            interfaces[name] = {
+                "operstate": self._read_sysfs(name, "operstate").upper() or "UNKNOWN",
+                "carrier": CARRIER_STATES.get(self._read_sysfs(name, "carrier"), "UNKNOWN"),
+                "ipv4": [address.address for address in addresses.get(name, [])
+                         if address.family == socket.AF_INET]
+            }
+            try:
+                names[socket.if_nametoindex(name)] = name
+            except OSError:
+                pass
+
+        with self._lock:
+            changed = [name for name, interface in interfaces.items()
+                       if name in self._interfaces and
+                       (self._interfaces[name]["operstate"], self._interfaces[name]["carrier"]) !=
+                       (interface["operstate"], interface["carrier"])]
+            self._interfaces, self._names = interfaces, names
+
+        for name in changed:
+            self._notify(name)
+
+    def _read_sysfs(self, name, attribute):
+        try:
+            with open(os.path.join(self._sys_net_dir, name, attribute)) as sys_file:
+                return sys_file.read().strip()
+        except OSError:
+            # carrier can't be read while the interface is admin down
+            return ""
+
+    def _notify(self, name):
+        for callback in self._listeners:
+            try:
+                callback(name)
+            except Exception as err:
+                logger.error(f"InterfaceMonitor, listener failed for {name}: {err}")
@@ -54,3 +54,11 @@ class IPMI(object):
            sensor id using IPMI
         """
         raise NotImplementedError("sub class should implement this")
+
+    def get_sensor_props_bulk(self, sensor_ids):
+        """Returns a dictionary of sensor id and its properties as returned
+           by get_sensor_props. Implementations able to query several
+           sensors at once should override this.
+        """
+        return {sensor_id: self.get_sensor_props(sensor_id)
+                for sensor_id in sensor_ids}
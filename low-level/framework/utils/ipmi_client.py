@@ -14,12 +14,55 @@
 # cortx-questions@seagate.com.
 
 import os
+import time
+import shlex
 import subprocess
 
 from framework.utils.ipmi import IPMI
 from framework.utils.service_logging import logger
 
 
+class IpmiSimulator(object):
+    """Remembers whether ipmisimtool is to be used instead of ipmitool.
+
+       The simulator is selected while /tmp/activate_ipmisimtool exists and
+       'ipmisimtool sel info' succeeds. That probe runs at most every
+       CHECK_INTERVAL seconds rather than before every ipmitool command.
+    """
+
+    ACTIVATE_FILE = "/tmp/activate_ipmisimtool"
+    CHECK_INTERVAL = 30
+
+    def __init__(self, simulator, ok_retcodes=(0,)):
+        """
+        simulator:   simulator command, e.g. "/usr/bin/ipmisimtool "
+        ok_retcodes: probe return codes which select the simulator
+        """
+        self._simulator = simulator
+        self._ok_retcodes = ok_retcodes
+        self._active = False
+        self._last_check = None
+
+    def is_active(self):
+        """Returns True if commands are to be sent to the simulator"""
+        # A dummy file path check to select ipmi simulator if
+        # simulator is required, otherwise default ipmitool.
+        if not os.path.exists(self.ACTIVATE_FILE):
+            self._last_check = None
+            return False
+
+        now = time.time()
+        if self._last_check is None or now - self._last_check >= self.CHECK_INTERVAL:
+            process = subprocess.Popen(f"{self._simulator} sel info", shell=True,
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            process.communicate()
+            self._active = process.returncode in self._ok_retcodes
+            self._last_check = now
+            if self._active:
+                logger.info("IPMI simulator is activated")
+        return self._active
+
+
 class IPMITool(IPMI):
     """Concrete singleton class dervied from IPMI base class which implements
        functionality using ipmitool utility
@@ -27,11 +70,14 @@ class IPMITool(IPMI):
     _instance = None
     IPMITOOL = "sudo /usr/bin/ipmitool "
     IPMISIMTOOL = "/usr/bin/ipmisimtool "
+    # Sensor ids passed to a single 'sensor get' invocation
+    BULK_SIZE = 64
 
     def __new__(cls):
         """new method"""
         if cls._instance is None:
             cls._instance = super(IPMITool, cls).__new__(cls)
+            cls._instance._simulator = IpmiSimulator(cls.IPMISIMTOOL)
         return cls._instance
 
     def get_sensor_list_by_entity(self, entity_id):
@@ -106,14 +152,62 @@ class IPMITool(IPMI):
             return (False, err_response)
         props_list = b''.join(props_list_out).decode("utf-8").split("\n")
         props_list = props_list[1:] # The first line is 'Locating sensor record...'
+        return self._parse_sensor_props(props_list)
+
+    def get_sensor_props_bulk(self, sensor_ids):
+        """Returns the properties of several sensors, ipmitool looks all of
+           them up with one invocation and one walk of the SDR repository
+           ipmitool sensor get "Sys Fan 1A" "Sys Fan 1B" ...
+           Params : self, sensor_ids
+           Output Format : dictionary of sensor id and the tuple returned
+                           by get_sensor_props, in the order of sensor_ids
+        """
+        if self._simulator.is_active():
+            # ipmisimtool takes a single sensor id per command
+            return super(IPMITool, self).get_sensor_props_bulk(sensor_ids)
+
+        props = {}
+        for start in range(0, len(sensor_ids), self.BULK_SIZE):
+            chunk = sensor_ids[start:start + self.BULK_SIZE]
+            props_list_out, retcode = self._run_ipmitool_subcommand(
+                "sensor get " + " ".join(shlex.quote(sensor_id) for sensor_id in chunk))
+            # ipmitool exits non zero if any sensor is missing but still
+            # prints the records it found
+            found = {}
+            for record in self._split_sensor_records(props_list_out[0]):
+                common, specific = self._parse_sensor_props(record)
+                sensor_name = common.get('Sensor ID', '').rsplit(" (", 1)[0]
+                found[sensor_name] = (common, specific)
+            for sensor_id in chunk:
+                if sensor_id in found:
+                    props[sensor_id] = found[sensor_id]
+                else:
+                    msg = "ipmitool sensor get command failed: {0}".format(
+                        props_list_out[1] or b'')
+                    logger.warning(msg)
+                    props[sensor_id] = (False, {sensor_id: {"ERROR": msg}})
+        return props
 
+    def _split_sensor_records(self, output):
+        """Splits 'sensor get' output into the lines of each sensor"""
+        records = []
+        for prop in output.decode("utf-8").split("\n"):
+            if prop.split(":", 1)[0].strip() == 'Sensor ID':
+                records.append([])
+            if records:
+                records[-1].append(prop)
+        return records
+
+    def _parse_sensor_props(self, props_list):
+        """Parses the lines of one 'sensor get' record into the tuple
+           (common, specific)"""
         specific = {}
         curr_key = None
         for prop in props_list:
             if prop == '':
                 continue
             if ':' in prop:
-                curr_key, val = [f.strip() for f in prop.split(":")]
+                curr_key, val = [f.strip() for f in prop.split(":", 1)]
                 specific[curr_key] = val
             else:
                 specific[curr_key] += "\n" + prop
@@ -153,14 +247,8 @@ class IPMITool(IPMI):
         """executes ipmitool sub-commands, and optionally greps the output"""
 
         ipmi_tool = self.IPMITOOL
-
-        # A dummy file path check to select ipmi simulator if
-        # simulator is required, otherwise default ipmitool.
-        if os.path.exists("/tmp/activate_ipmisimtool"):
-            res, retcode = self._run_command(command=f"{self.IPMISIMTOOL} sel info")
-            if retcode == 0:
-                ipmi_tool = self.IPMISIMTOOL
-                logger.info("IPMI simulator is activated")
+        if self._simulator.is_active():
+            ipmi_tool = self.IPMISIMTOOL
 
         command = ipmi_tool + subcommand
         if grep_args is not None:
@@ -0,0 +1,236 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Follows a log file from a checkpointed byte offset,
+                    surviving logrotate (rename or copytruncate) and
+                    restarts without re-reading the file.
+ ****************************************************************************
+"""
+
+import os
+import json
+import time
+import zlib
+import pyinotify
+
+from framework.utils.service_logging import logger
+
+
+class LogTailer(object):
+    """Returns the complete lines appended to a log file.
+
+       The checkpoint file holds the inode, the byte offset after the last
+       processed line and a checksum of the first bytes of the log. It is
+       written every checkpoint_lines lines or checkpoint_interval seconds,
+       whichever comes first, rather than once per line.
+    """
+
+    # Bytes at the start of the log used to detect a truncated and regrown file
+    HEAD_SIZE = 128
+    READ_SIZE = 1048576
+
+    def __init__(self, log_file_path, checkpoint_path,
+                 checkpoint_lines=100, checkpoint_interval=5):
+        """
+        log_file_path:       log file to follow
+        checkpoint_path:     file recording the position reached in the log
+        checkpoint_lines:    lines read before the checkpoint is written
+        checkpoint_interval: seconds after which read lines are checkpointed
+        """
+        self._log_file_path = log_file_path
+        self._checkpoint_path = checkpoint_path
+        self._checkpoint_lines = checkpoint_lines
+        self._checkpoint_interval = checkpoint_interval
+
+        self._file = None
+        self._inode = None
+        self._offset = 0
+        self._partial = b""
+        self._head = None
+        self._pending = 0
+        self._last_checkpoint = time.time()
+        self._notifier = None
+        self._use_inotify = True
+
+    def open(self):
+        """Opens the log file at the checkpointed position.
+
+           Returns the timestamp stored by the former per line checkpoint
+           when the checkpoint file still has that format, so the caller can
+           skip lines it already processed. Returns None otherwise.
+           Raises IOError if the log file can not be opened.
+        """
+        self._file = open(self._log_file_path, "rb")
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._offset = 0
+        self._partial = b""
+        self._head = None
+
+        checkpoint = self._read_checkpoint()
+        if isinstance(checkpoint, str):
+            logger.info(f"LogTailer, converting timestamp checkpoint {checkpoint} "
+                        f"of {self._log_file_path}")
+            return checkpoint or None
+
+        if checkpoint.get("inode") != self._inode:
+            if checkpoint:
+                logger.info(f"LogTailer, {self._log_file_path} was rotated, reading from start")
+        elif checkpoint.get("offset", 0) > os.fstat(self._file.fileno()).st_size or \
+                not self._head_matches(checkpoint.get("head")):
+            logger.info(f"LogTailer, {self._log_file_path} was truncated, reading from start")
+        else:
+            self._offset = checkpoint["offset"]
+            self._head = checkpoint.get("head")
+            self._file.seek(self._offset)
+        return None
+
+    def read_lines(self):
+        """Returns the complete lines appended since the last call, an empty
+           list if there are none. A rotated log is read to its end before
+           the new file is opened."""
+        data = self._file.read(self.READ_SIZE)
+        if not data and self._check_rotation():
+            data = self._file.read(self.READ_SIZE)
+        if not data:
+            return []
+
+        data = self._partial + data
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+        self._offset += len(data) - len(self._partial)
+        self._pending += len(lines)
+        return [line.decode("utf-8", "replace").rstrip() for line in lines if line.strip()]
+
+    def refresh(self):
+        """Picks up a truncated log file right away. A replaced log is only
+           followed once the current file is read to its end."""
+        if self._file is None:
+            return
+        try:
+            if os.stat(self._log_file_path).st_ino == self._inode:
+                self._check_rotation()
+        except OSError:
+            pass
+
+    def maybe_checkpoint(self):
+        """Writes the checkpoint if enough lines or time have passed"""
+        if self._pending >= self._checkpoint_lines or \
+                (self._pending and
+                 time.time() - self._last_checkpoint >= self._checkpoint_interval):
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Writes the position of the last returned line to the checkpoint"""
+        if self._file is None:
+            return
+        if self._head is None or self._head[0] < self.HEAD_SIZE:
+            self._head = self._get_head(min(self._offset, self.HEAD_SIZE))
+
+        tmp_path = f"{self._checkpoint_path}.tmp"
+        with open(tmp_path, "w") as checkpoint_file:
+            json.dump({"inode": self._inode, "offset": self._offset,
+                       "head": self._head}, checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(tmp_path, self._checkpoint_path)
+        self._pending = 0
+        self._last_checkpoint = time.time()
+
+    def wait(self, timeout):
+        """Blocks until the log file directory changes or timeout seconds
+           have passed"""
+        if self._notifier is None and \
+                not (self._use_inotify and self._init_notifier()):
+            time.sleep(timeout)
+            return
+        if self._notifier.check_events(timeout * 1000):
+            self._notifier.read_events()
+            self._notifier.process_events()
+
+    def close(self):
+        """Writes the checkpoint and releases the log file and inotify watch"""
+        self.checkpoint()
+        if self._notifier is not None:
+            self._notifier.stop()
+            self._notifier = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _check_rotation(self):
+        """Reopens the log if it was replaced or truncated, returns True if so"""
+        try:
+            stat = os.stat(self._log_file_path)
+        except OSError:
+            # Renamed away and not recreated yet, keep the current file
+            return False
+
+        if stat.st_ino != self._inode:
+            self._file.close()
+            self._file = open(self._log_file_path, "rb")
+            self._inode = os.fstat(self._file.fileno()).st_ino
+            logger.debug(f"LogTailer, {self._log_file_path} rotated, following new file")
+        elif stat.st_size < self._offset + len(self._partial):
+            self._file.seek(0)
+            logger.debug(f"LogTailer, {self._log_file_path} truncated, reading from start")
+        else:
+            return False
+
+        self._offset = 0
+        self._partial = b""
+        self._head = None
+        # Position changed, make sure it is recorded with the next lines
+        self._pending = max(self._pending, 1)
+        return True
+
+    def _read_checkpoint(self):
+        try:
+            with open(self._checkpoint_path, "r") as checkpoint_file:
+                content = checkpoint_file.read().strip()
+        except (IOError, OSError):
+            return {}
+        if not content:
+            return {}
+        try:
+            checkpoint = json.loads(content)
+        except ValueError:
+            checkpoint = None
+        return checkpoint if isinstance(checkpoint, dict) else content
+
+    def _get_head(self, length):
+        data = os.pread(self._file.fileno(), length, 0)
+        return [len(data), zlib.crc32(data)]
+
+    def _head_matches(self, head):
+        if not head:
+            return True
+        return self._get_head(head[0]) == list(head)
+
+    def _init_notifier(self):
+        try:
+            watch_manager = pyinotify.WatchManager()
+            self._notifier = pyinotify.Notifier(watch_manager, pyinotify.ProcessEvent())
+            # Watch the directory so that a log recreated by logrotate is seen
+            watch_manager.add_watch(os.path.dirname(self._log_file_path),
+                                    pyinotify.IN_MODIFY | pyinotify.IN_CREATE |
+                                    pyinotify.IN_MOVED_TO | pyinotify.IN_CLOSE_WRITE)
+            return True
+        except Exception as err:
+            logger.warn(f"LogTailer, inotify unavailable, polling {self._log_file_path}: {err}")
+            self._notifier = None
+            self._use_inotify = False
+            return False
@@ -0,0 +1,95 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Signs egress messages with libsspl_sec, reusing one
+                    session token until it expires
+ ****************************************************************************
+"""
+
+import time
+import ctypes
+import threading
+
+from framework.utils.service_logging import logger
+
+
+class MessageSigner(object):
+    """Holds the libsspl_sec session token used to sign messages.
+
+       sspl_generate_session_token creates a key pair on every call with the
+       pki method, so the token is generated once and reused for
+       session_length seconds, then rotated. libsspl_sec keeps the key of
+       the token it last signed with parsed, as long as the same token
+       buffer contents are passed in.
+
+       The arguments are passed to libsspl_sec as the egress processors
+       always did and as the ingress processors verify them: str through
+       ctypes, i.e. as wchar_t strings, with the length the caller gives.
+    """
+
+    # Seconds before expiry at which the token is rotated, so that a
+    # signature is not made with a token about to expire. At most a tenth
+    # of the session length.
+    ROTATE_MARGIN = 60
+
+    def __init__(self, sec_lib, username, authn_token, session_length):
+        """
+        sec_lib:        loaded libsspl_sec ctypes library
+        username:       user the messages are signed for
+        authn_token:    credentials used to generate session tokens
+        session_length: seconds a session token is valid for
+        """
+        self._sec_lib = sec_lib
+        self._username = username
+        self._authn_token = authn_token
+        self._session_length = int(session_length)
+
+        self._token = None
+        self._token_expires = 0
+        self._sig = ctypes.create_string_buffer(sec_lib.sspl_get_sig_length())
+        self._lock = threading.Lock()
+
+    def sign(self, msg_len, msg):
+        """Returns the signature bytes of msg_len bytes of a str message"""
+        with self._lock:
+            token = self._get_token()
+            if not self._sec_lib.sspl_sign_message(msg_len, msg, self._username,
+                                                   token, self._sig):
+                logger.warn("MessageSigner, libsspl_sec failed to sign message")
+            return self._sig.raw
+
+    def rotate(self):
+        """Generates a new session token for the next signatures"""
+        with self._lock:
+            self._token = None
+            self._get_token()
+
+    def _get_token(self):
+        margin = min(self.ROTATE_MARGIN, self._session_length / 10)
+        if self._token is not None and \
+                time.time() < self._token_expires - margin:
+            return self._token
+
+        token = ctypes.create_string_buffer(self._sec_lib.sspl_get_token_length())
+        self._sec_lib.sspl_generate_session_token(
+            self._username, len(self._authn_token) + 1, self._authn_token,
+            ctypes.c_long(self._session_length), token)
+        self._token = token
+        self._token_expires = time.time() + self._session_length
+        logger.debug(f"MessageSigner, new session token for "
+                     f"{self._username}, valid {self._session_length} seconds")
+        return self._token
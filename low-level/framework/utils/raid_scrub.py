@@ -0,0 +1,321 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Runs the md data checks of the RAID arrays, several at a
+                    time when they share no disk, from a checkpoint which
+                    survives restarts
+ ****************************************************************************
+"""
+
+import os
+import json
+import time
+import threading
+import subprocess
+
+from framework.utils.service_logging import logger
+
+
+class RAIDScrubScheduler(object):
+    """Checks the data of the md arrays, the scrub started by writing
+       'check' to md/sync_action.
+
+       Arrays whose member disks are disjoint are checked at the same time,
+       at most max_parallel of them. md would delay the check of an array
+       sharing a disk with an array being checked anyway, so it is started
+       once the other check is over. speed_min and speed_max, in KiB/s per
+       disk, are written to md/sync_speed_min and md/sync_speed_max for the
+       time of the check and set back to the system wide defaults after.
+
+       A cycle is one check of each array. The checkpoint file records the
+       arrays done in the current cycle with their mismatch count, and the
+       position reached in md/sync_completed by the arrays being checked. A
+       cycle interrupted by a restart goes on with the arrays not done yet.
+       A check still running is followed again, one stopped e.g. by a reboot
+       is started again from its position through md/sync_min.
+    """
+
+    SYS_BLOCK = "/sys/block"
+    SYS_CLASS_BLOCK = "/sys/class/block"
+
+    DEFAULT_POLL_INTERVAL = 10
+    # Seconds between two checkpoints of the progress of the checks
+    CHECKPOINT_INTERVAL = 60
+    # Failed writes of md/sync_action before an array is skipped for the cycle
+    MAX_START_ATTEMPTS = 10
+
+    # sync_speed_min/max value going back to /proc/sys/dev/raid/speed_limit_*
+    SYSTEM_SPEED = "system"
+
+    # Array states in the checkpoint
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, checkpoint_path, max_parallel=0, speed_min=0, speed_max=0,
+                 poll_interval=DEFAULT_POLL_INTERVAL, sys_block=SYS_BLOCK,
+                 sys_class_block=SYS_CLASS_BLOCK):
+        """
+        checkpoint_path: file recording the progress of the current cycle
+        max_parallel:    maximum number of arrays checked at the same time,
+                         0 for as many as share no disk
+        speed_min:       KiB/s per disk md keeps a check at, 0 for the default
+        speed_max:       KiB/s per disk a check is limited to, 0 for the default
+        poll_interval:   seconds between two reads of the state of the checks
+        """
+        self._checkpoint_path = checkpoint_path
+        self._max_parallel = max_parallel
+        self._speed_min = speed_min
+        self._speed_max = speed_max
+        self._poll_interval = poll_interval
+        self._sys_block = sys_block
+        self._sys_class_block = sys_class_block
+        self._stop = threading.Event()
+
+        self._cycle = self._read_checkpoint()
+        self._last_checkpoint = 0
+
+    def get_last_cycle(self):
+        """Returns (start, end) epoch times of the last cycle, end is None
+           while it is not over, both are None before the first cycle"""
+        return self._cycle.get("started"), self._cycle.get("finished")
+
+    def scrub(self, devices, on_result):
+        """Checks the arrays ("md0", ...) not done yet in the current cycle,
+           or starts a new cycle if the last one is over. on_result(device,
+           mismatch count) is called as the check of each array ends.
+
+           Returns True once every array was checked, False if stopped."""
+        if not self._cycle.get("arrays") or self._cycle.get("finished") is not None:
+            self._cycle = {"started": int(time.time()), "finished": None, "arrays": {}}
+        arrays = self._cycle["arrays"]
+        for device in devices:
+            arrays.setdefault(device, {"state": self.PENDING})
+        pending = [device for device in devices
+                   if arrays[device]["state"] not in (self.DONE, self.FAILED)]
+        skipped = len(devices) - len(pending)
+        if skipped:
+            logger.info(f"RAIDScrubScheduler, resuming the cycle started at "
+                        f"{self._cycle['started']}, {skipped} arrays already checked")
+        self._checkpoint()
+
+        # device -> its member disks
+        running = {}
+        while pending or running:
+            for device in list(pending):
+                if self._max_parallel and len(running) >= self._max_parallel:
+                    break
+                members = self.get_members(device)
+                if any(members & busy for busy in running.values()):
+                    continue
+                if self._start(device, arrays[device]):
+                    running[device] = members
+                    pending.remove(device)
+                elif arrays[device]["state"] == self.FAILED:
+                    pending.remove(device)
+            if running:
+                self._checkpoint()
+
+            if self._stop.wait(self._poll_interval):
+                self._checkpoint()
+                return False
+
+            for device in list(running):
+                array = arrays[device]
+                if self._poll(device, array):
+                    del running[device]
+                    if array["state"] == self.DONE:
+                        on_result(device, array["mismatches"])
+            self._checkpoint(force=False)
+
+        self._cycle["finished"] = int(time.time())
+        self._checkpoint()
+        logger.info(f"RAIDScrubScheduler, checked {len(devices)} arrays in "
+                    f"{self._cycle['finished'] - self._cycle['started']} secs")
+        return True
+
+    def stop(self):
+        """Makes scrub() return, the checks go on in md and are followed
+           again by the next scrub()"""
+        self._stop.set()
+
+    def get_members(self, device):
+        """Returns the names of the disks under device, through partitions
+           and stacked md or dm devices"""
+        members = set()
+        try:
+            slaves = os.listdir(os.path.join(self._sys_class_block, device, "slaves"))
+        except OSError:
+            slaves = []
+        if not slaves:
+            return {self._get_disk(device)}
+        for slave in slaves:
+            members |= self.get_members(slave)
+        return members
+
+    def _start(self, device, array):
+        """Starts or follows again the check of device, returns True if it
+           is running"""
+        action = self._read(device, "sync_action")
+        if action is None:
+            logger.warn(f"RAIDScrubScheduler, {device} is gone, skipping it")
+            array["state"] = self.FAILED
+            return False
+        if action == "check":
+            # Still running after a restart, or started by someone else
+            if array["state"] != self.RUNNING:
+                array.update(state=self.RUNNING, base=0, done=0, resumed_from=0)
+            self._set_speed(device, self._speed_min, self._speed_max)
+            logger.info(f"RAIDScrubScheduler, following the check of {device} in progress")
+            return True
+        if action != "idle":
+            # resync, recover, reshape or frozen, the check waits for it
+            logger.debug(f"RAIDScrubScheduler, {device} is busy with {action}")
+            return False
+
+        position = 0
+        if array["state"] == self.RUNNING and array.get("done"):
+            # Interrupted, go on from where it stopped
+            position = self._set_sync_min(device, array["done"])
+        base = array.get("mismatches", 0) if position else 0
+
+        self._set_speed(device, self._speed_min, self._speed_max)
+        if not self._write(device, "sync_action", "check"):
+            attempts = array.get("attempts", 0) + 1
+            array["attempts"] = attempts
+            if attempts >= self.MAX_START_ATTEMPTS:
+                logger.error(f"RAIDScrubScheduler, can't start the check of {device}, "
+                             f"skipping it in this cycle")
+                array["state"] = self.FAILED
+                self._restore(device, position)
+            return False
+
+        array.update(state=self.RUNNING, base=base, mismatches=base, done=position,
+                     resumed_from=position, started=int(time.time()))
+        array.pop("attempts", None)
+        logger.info(f"RAIDScrubScheduler, started the check of {device} "
+                    f"from sector {position}")
+        return True
+
+    def _poll(self, device, array):
+        """Reads the progress of the check of device, returns True when it
+           is over"""
+        action = self._read(device, "sync_action")
+        if action is None:
+            logger.warn(f"RAIDScrubScheduler, {device} is gone during its check")
+            array["state"] = self.FAILED
+            return True
+
+        mismatch_cnt = self._read(device, "mismatch_cnt")
+        if mismatch_cnt is not None and mismatch_cnt.isdigit():
+            array["mismatches"] = array.get("base", 0) + int(mismatch_cnt)
+
+        if action == "check":
+            # "done / total" in sectors, "none" when no sync runs
+            completed = (self._read(device, "sync_completed") or "").split("/")
+            if len(completed) == 2 and completed[0].strip().isdigit():
+                done, total = int(completed[0]), int(completed[1])
+                previous = array.get("done", 0) * 10 // max(array.get("total", total), 1)
+                array.update(done=done, total=total)
+                if done * 10 // max(total, 1) > previous:
+                    logger.info(f"RAIDScrubScheduler, check of {device} at "
+                                f"{done * 100 // max(total, 1)}%, "
+                                f"{array['mismatches']} mismatches")
+            return False
+
+        self._restore(device, array.get("resumed_from", 0))
+        array.update(state=self.DONE, finished=int(time.time()))
+        logger.info(f"RAIDScrubScheduler, check of {device} over, "
+                    f"{array['mismatches']} mismatches")
+        return True
+
+    def _set_sync_min(self, device, done):
+        """Makes the next check of device start at done, rounded down to a
+           chunk, returns the sector it starts at"""
+        chunk_size = self._read(device, "chunk_size")
+        chunk = int(chunk_size) // 512 if chunk_size and chunk_size.isdigit() else 0
+        position = done - done % chunk if chunk else done
+        if position and not self._write(device, "sync_min", str(position)):
+            logger.warn(f"RAIDScrubScheduler, can't resume the check of {device}, "
+                        f"checking it from the start")
+            return 0
+        return position
+
+    def _set_speed(self, device, speed_min, speed_max):
+        if speed_min:
+            self._write(device, "sync_speed_min", str(speed_min))
+        if speed_max:
+            self._write(device, "sync_speed_max", str(speed_max))
+
+    def _restore(self, device, position):
+        """Sets back what was changed on device for its check"""
+        self._set_speed(device, self._speed_min and self.SYSTEM_SPEED,
+                        self._speed_max and self.SYSTEM_SPEED)
+        if position:
+            # md forgets it after a full check, not after an aborted one
+            self._write(device, "sync_min", "0")
+
+    def _get_disk(self, name):
+        """Returns the disk a partition is on, else name"""
+        sys_dir = os.path.join(self._sys_class_block, name)
+        if os.path.exists(os.path.join(sys_dir, "partition")):
+            return os.path.basename(os.path.dirname(os.path.realpath(sys_dir)))
+        return name
+
+    def _read(self, device, attribute):
+        try:
+            with open(os.path.join(self._sys_block, device, "md", attribute)) as md_file:
+                return md_file.read().strip()
+        except OSError:
+            return None
+
+    def _write(self, device, attribute, value):
+        """Writes an md attribute, root only"""
+        path = os.path.join(self._sys_block, device, "md", attribute)
+        process = subprocess.run(["sudo", "tee", path], input=value,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                 universal_newlines=True)
+        if process.returncode != 0:
+            logger.warn(f"RAIDScrubScheduler, can't write {value} to {path}: "
+                        f"{process.stderr.strip()}")
+            return False
+        return True
+
+    def _checkpoint(self, force=True):
+        now = time.time()
+        if not force and now - self._last_checkpoint < self.CHECKPOINT_INTERVAL:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._checkpoint_path), exist_ok=True)
+            tmp_path = f"{self._checkpoint_path}.tmp"
+            with open(tmp_path, "w") as checkpoint_file:
+                json.dump(self._cycle, checkpoint_file)
+                checkpoint_file.flush()
+                os.fsync(checkpoint_file.fileno())
+            os.replace(tmp_path, self._checkpoint_path)
+            self._last_checkpoint = now
+        except OSError as err:
+            logger.error(f"RAIDScrubScheduler, can't write {self._checkpoint_path}: {err}")
+
+    def _read_checkpoint(self):
+        try:
+            with open(self._checkpoint_path, "r") as checkpoint_file:
+                cycle = json.load(checkpoint_file)
+        except (OSError, ValueError):
+            return {}
+        return cycle if isinstance(cycle, dict) else {}
@@ -0,0 +1,128 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Reads the negotiated link rate of the SAS phys from
+                    sysfs through file descriptors kept open
+ ****************************************************************************
+"""
+
+import os
+from array import array
+
+from framework.utils.service_logging import logger
+
+
+class SASPhyMonitor(object):
+    """Link rates of the phys under /sys/class/sas_phy.
+
+       The negotiated_linkrate file of each phy is opened once and read
+       again with pread() at offset 0, which makes sysfs format the
+       attribute anew. The few distinct link rates are numbered and the
+       last read of the phys is kept as an array of those numbers, so that
+       finding the phys which changed is a comparison of small integers.
+       A phy which can't be read keeps its last link rate, so that a
+       transient error is not reported as a change, and the phys are
+       opened again at the next read, e.g. after an HBA reset.
+    """
+
+    LINK_RATE_FILE = "negotiated_linkrate"
+
+    # "12.0 Gbit\n", "Phy reset problem\n", ...
+    READ_SIZE = 64
+
+    # Link rate of a phy not read yet
+    UNKNOWN = "Unknown"
+
+    def __init__(self, sas_phy_dir):
+        self._sas_phy_dir = sas_phy_dir
+        self._names = []
+        self._fds = []
+
+        # Link rate -> number, and back
+        self._rate_numbers = {}
+        self._rates = []
+        # Number of the link rate last read from each phy, by index in _names
+        self._last = array("H")
+        self._reopen = True
+
+    def get_link_rates(self):
+        """Reads all the phys, returns {phy name: link rate}"""
+        self._read_all()
+        return {name: self._rates[number] for name, number in zip(self._names, self._last)}
+
+    def get_changes(self):
+        """Reads all the phys, returns {phy name: link rate} of the phys
+           whose link rate changed since the previous read"""
+        names, last = self._names, array("H", self._last)
+        self._read_all()
+        if self._names is names:
+            return {names[index]: self._rates[number]
+                    for index, number in enumerate(self._last) if number != last[index]}
+
+        # The phys were opened again, compare them by name
+        previous = dict(zip(names, last))
+        return {name: self._rates[number] for name, number in zip(self._names, self._last)
+                if previous.get(name) != number}
+
+    def close(self):
+        for fd in self._fds:
+            os.close(fd)
+        self._names, self._fds = [], []
+        self._last = array("H")
+        self._reopen = True
+
+    def _open(self):
+        # Kept for the phys which can't be read after being opened again
+        previous = dict(zip(self._names, self._last))
+        self.close()
+        try:
+            names = sorted(os.listdir(self._sas_phy_dir))
+        except OSError as err:
+            logger.warn(f"SASPhyMonitor, can't list {self._sas_phy_dir}: {err}")
+            names = []
+
+        for name in names:
+            path = os.path.join(self._sas_phy_dir, name, self.LINK_RATE_FILE)
+            try:
+                self._fds.append(os.open(path, os.O_RDONLY))
+                self._names.append(name)
+            except OSError as err:
+                logger.warn(f"SASPhyMonitor, can't open {path}: {err}")
+        unknown = self._number(self.UNKNOWN)
+        self._last = array("H", [previous.get(name, unknown) for name in self._names])
+        self._reopen = False
+
+    def _read_all(self):
+        if self._reopen:
+            self._open()
+
+        for index, fd in enumerate(self._fds):
+            try:
+                rate = os.pread(fd, self.READ_SIZE, 0).decode("ascii", "replace").strip()
+            except OSError as err:
+                # Skipped until the next read, with the phys opened again
+                logger.warn(f"SASPhyMonitor, can't read {self._names[index]}: {err}")
+                self._reopen = True
+                continue
+            self._last[index] = self._number(rate)
+
+    def _number(self, rate):
+        number = self._rate_numbers.get(rate)
+        if number is None:
+            number = self._rate_numbers[rate] = len(self._rates)
+            self._rates.append(rate)
+        return number
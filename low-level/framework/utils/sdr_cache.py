@@ -0,0 +1,155 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Process wide cache of IPMI SDR listings and sensor
+                    properties shared by NodeHWsensor and NodeHWactuator
+ ****************************************************************************
+"""
+
+import time
+import threading
+
+from framework.utils.service_logging import logger
+
+
+class SDRCache(object):
+    """Caches the output of ipmitool queries for a per FRU type TTL.
+
+       Entries are tagged with their FRU type so that a SEL event for a FRU
+       drops what is known about that FRU type. With stale_while_revalidate
+       an expired entry is still returned while a background thread reloads
+       it, for at most STALE_FACTOR times the TTL.
+    """
+
+    DEFAULT_TTL = 60
+    # Readings of these sensor types change between two polls
+    DEFAULT_TTLS = {
+        "drive slot / bay": 30,
+        "temperature": 10,
+        "voltage": 10,
+        "current": 10,
+    }
+    STALE_FACTOR = 5
+
+    def __init__(self, default_ttl=DEFAULT_TTL, ttls=None, stale_while_revalidate=True):
+        """
+        default_ttl:            seconds an entry is fresh if its FRU type has no TTL
+        ttls:                   FRU type to TTL in seconds
+        stale_while_revalidate: return expired entries while reloading them
+        """
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._loading = {}
+        self._generation = 0
+        self._ttls = dict(self.DEFAULT_TTLS)
+        self.configure(default_ttl, ttls, stale_while_revalidate)
+
+    def configure(self, default_ttl=None, ttls=None, stale_while_revalidate=None):
+        """Changes the TTLs or mode, entries already cached are kept"""
+        if default_ttl is not None:
+            self._default_ttl = default_ttl
+        if ttls is not None:
+            self._ttls.update({k.lower(): v for k, v in ttls.items()})
+        if stale_while_revalidate is not None:
+            self._stale_while_revalidate = stale_while_revalidate
+
+    def get(self, key, loader, fru_type=None, valid=None, allow_stale=True):
+        """Returns the cached value of key, calling loader() to obtain it
+           when missing or expired.
+
+           key:         hashable key, e.g. ("sdr type", "Fan", caller), callers
+                        whose loader has side effects, such as the channel
+                        error alerts of NodeHWsensor, keep their own keys
+           fru_type:    FRU type tag used for the TTL and invalidation
+           valid:       predicate on the loaded value, invalid values (failed
+                        commands) are returned but not cached
+           allow_stale: False to never return an expired entry, for callers
+                        which must not have loader() run on another thread
+        """
+        tag = fru_type.lower() if fru_type else None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, loaded, _ = entry
+                age = now - loaded
+                ttl = self._ttls.get(tag, self._default_ttl)
+                if age < ttl:
+                    return value
+                if allow_stale and self._stale_while_revalidate and \
+                        age < ttl * self.STALE_FACTOR:
+                    if key not in self._loading:
+                        self._loading[key] = threading.Event()
+                        threading.Thread(target=self._revalidate,
+                                         args=(key, loader, tag, valid, self._generation),
+                                         daemon=True).start()
+                    return value
+
+            loading = self._loading.get(key)
+            if loading is None:
+                loading = self._loading[key] = threading.Event()
+                generation = self._generation
+            else:
+                generation = None
+
+        if generation is None:
+            # Another thread is loading the same key, share its result
+            loading.wait()
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                return entry[0]
+            return loader()
+
+        return self._reload(key, loader, tag, valid, generation)
+
+    def invalidate(self, fru_type=None):
+        """Drops the entries of a FRU type, or all entries"""
+        with self._lock:
+            self._generation += 1
+            if fru_type is None:
+                self._entries.clear()
+            else:
+                tag = fru_type.lower()
+                for key in [k for k, e in self._entries.items() if e[2] == tag]:
+                    del self._entries[key]
+
+    def _revalidate(self, key, loader, tag, valid, generation):
+        try:
+            self._reload(key, loader, tag, valid, generation)
+        except Exception:
+            # Logged by _reload, the stale entry stays until it expires
+            pass
+
+    def _reload(self, key, loader, tag, valid, generation):
+        value = None
+        try:
+            value = loader()
+            return value
+        except Exception as err:
+            logger.warn(f"SDRCache, unable to load {key}: {err}")
+            raise
+        finally:
+            with self._lock:
+                # Results loaded across an invalidation may be outdated
+                if value is not None and generation == self._generation and \
+                        (valid is None or valid(value)):
+                    self._entries[key] = (value, time.time(), tag)
+                self._loading.pop(key).set()
+
+
+sdr_cache = SDRCache()
@@ -0,0 +1,328 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Append-only segment log used as a local persistent
+                    queue. Head, tail and size are kept in memory and
+                    checkpointed periodically, messages are appended to
+                    segment files which are expired as a whole once drained.
+  ****************************************************************************
+ """
+
+import os
+import json
+import time
+import struct
+import threading
+
+from framework.utils.service_logging import logger
+
+
+class SegmentLogQueue(object):
+    """FIFO queue persisted as a sequence of append-only segment files.
+
+       Every record is stored as a 4 byte big endian length followed by the
+       payload. A checkpoint file records the read position (segment and
+       offset) so that a restart resumes from there; messages consumed after
+       the last checkpoint may be delivered again (at-least-once).
+    """
+
+    SEGMENT_SUFFIX   = ".seg"
+    CHECKPOINT_FILE  = "checkpoint"
+    RECORD_HEADER    = struct.Struct(">I")
+
+    def __init__(self, queue_dir, max_size, segment_size=4194304,
+                 checkpoint_ops=100, checkpoint_interval=5, replica=None):
+        """
+        queue_dir:           directory holding segment and checkpoint files
+        max_size:            maximum bytes of queued payload, oldest messages
+                             are dropped once exceeded
+        segment_size:        size in bytes after which a new segment is started
+        checkpoint_ops:      number of get/put operations between checkpoints
+        checkpoint_interval: maximum seconds between checkpoints
+        replica:             optional Store object, sealed segments and the
+                             checkpoint are mirrored to it
+        """
+        self._queue_dir = queue_dir
+        self._max_size = max_size
+        self._segment_size = segment_size
+        self._checkpoint_ops = checkpoint_ops
+        self._checkpoint_interval = checkpoint_interval
+        self._replica = replica
+        self._checkpoint_path = os.path.join(queue_dir, self.CHECKPOINT_FILE)
+        self._lock = threading.RLock()
+
+        # In memory state, persisted only through checkpoints
+        self._segments = []
+        self._head_offset = 0
+        self._count = 0
+        self._size = 0
+        self._dirty_ops = 0
+        self._last_checkpoint = time.time()
+
+        self._reader = None
+        self._reader_segment = None
+        self._writer = None
+        self._writer_segment = None
+
+        os.makedirs(self._queue_dir, exist_ok=True)
+        self._recover()
+
+    @property
+    def current_size(self):
+        return self._size
+
+    def __len__(self):
+        return self._count
+
+    def is_empty(self):
+        return self._count == 0
+
+    def is_full(self, size_of_item):
+        return (self._size + size_of_item) >= self._max_size
+
+    def put(self, item):
+        """Append an item (bytes or str) to the tail of the queue"""
+        if isinstance(item, str):
+            item = item.encode("utf-8")
+        with self._lock:
+            if self.is_full(len(item)):
+                logger.debug("SegmentLogQueue, put, memory usage exceeded limit, "
+                             "expiring old messages")
+                self._create_space(len(item))
+            writer = self._get_writer()
+            writer.write(self.RECORD_HEADER.pack(len(item)))
+            writer.write(item)
+            writer.flush()
+            self._count += 1
+            self._size += len(item)
+            if writer.tell() >= self._segment_size:
+                self._seal_segment()
+            self._maybe_checkpoint()
+
+    def get(self):
+        """Remove and return the item at the head of the queue"""
+        with self._lock:
+            if self._count == 0:
+                return None
+            item = self._read_record()
+            self._count -= 1
+            self._size -= len(item)
+            self._compact()
+            self._maybe_checkpoint()
+            return item
+
+    def checkpoint(self):
+        """Persist the read position and fsync the tail segment"""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+                os.fsync(self._writer.fileno())
+            state = {
+                "segments": self._segments,
+                "head_offset": self._head_offset,
+            }
+            tmp_path = self._checkpoint_path + ".tmp"
+            with open(tmp_path, "w") as fh:
+                json.dump(state, fh)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, self._checkpoint_path)
+            self._dirty_ops = 0
+            self._last_checkpoint = time.time()
+            if self._replica is not None:
+                self._replica_put(state, self._replica_key(self.CHECKPOINT_FILE),
+                                  pickled=True)
+
+    def close(self):
+        """Checkpoint and release open segment handles"""
+        with self._lock:
+            self.checkpoint()
+            for fh in (self._reader, self._writer):
+                if fh is not None:
+                    fh.close()
+            self._reader = self._writer = None
+            self._reader_segment = self._writer_segment = None
+
+    def _segment_path(self, segment):
+        return os.path.join(self._queue_dir, "%016d%s" % (segment, self.SEGMENT_SUFFIX))
+
+    def _replica_key(self, name):
+        return os.path.join(self._queue_dir, "REPLICA", str(name))
+
+    def _replica_put(self, value, key, pickled=False):
+        try:
+            self._replica.put(value, key, pickled=pickled)
+        except Exception as err:
+            logger.warn("SegmentLogQueue, replication of {0} failed: {1}".format(key, err))
+
+    def _replica_delete(self, segment):
+        try:
+            self._replica.delete(self._replica_key(segment))
+        except Exception as err:
+            logger.warn("SegmentLogQueue, replica delete of {0} failed: {1}".format(segment, err))
+
+    def _recover(self):
+        """Rebuild the in memory state from the checkpoint and segment files"""
+        on_disk = sorted(int(name[:-len(self.SEGMENT_SUFFIX)])
+                         for name in os.listdir(self._queue_dir)
+                         if name.endswith(self.SEGMENT_SUFFIX))
+        head_segment, head_offset = None, 0
+        try:
+            with open(self._checkpoint_path) as fh:
+                state = json.load(fh)
+            if state.get("segments"):
+                head_segment = state["segments"][0]
+                head_offset = int(state.get("head_offset", 0))
+        except (IOError, OSError, ValueError):
+            pass
+
+        # Segments older than the checkpointed head are already drained
+        if head_segment is not None:
+            for segment in [s for s in on_disk if s < head_segment]:
+                os.remove(self._segment_path(segment))
+            on_disk = [s for s in on_disk if s >= head_segment]
+            if not on_disk or on_disk[0] != head_segment:
+                head_offset = 0
+
+        self._segments = on_disk
+        self._head_offset = head_offset
+        for index, segment in enumerate(self._segments):
+            start = head_offset if index == 0 else 0
+            count, size = self._scan_segment(segment, start)
+            self._count += count
+            self._size += size
+        if self._count:
+            logger.info("SegmentLogQueue, recovered %d messages (%d bytes) from %s"
+                        % (self._count, self._size, self._queue_dir))
+        if self._count:
+            self._compact()
+        else:
+            self._reset()
+
+    def _scan_segment(self, segment, offset):
+        """Count records from offset, truncating a torn record at the end"""
+        count, size = 0, 0
+        path = self._segment_path(segment)
+        with open(path, "rb+") as fh:
+            fh.seek(offset)
+            valid_end = offset
+            while True:
+                header = fh.read(self.RECORD_HEADER.size)
+                if len(header) < self.RECORD_HEADER.size:
+                    break
+                length = self.RECORD_HEADER.unpack(header)[0]
+                payload = fh.read(length)
+                if len(payload) < length:
+                    break
+                count += 1
+                size += length
+                valid_end = fh.tell()
+            if fh.seek(0, os.SEEK_END) != valid_end:
+                logger.warn("SegmentLogQueue, truncating partial record in %s" % path)
+                fh.truncate(valid_end)
+        return count, size
+
+    def _get_writer(self):
+        if self._writer is None:
+            if not self._segments:
+                self._segments.append(0)
+            self._writer_segment = self._segments[-1]
+            self._writer = open(self._segment_path(self._writer_segment), "ab")
+        return self._writer
+
+    def _seal_segment(self):
+        """Close the tail segment and start a new one on next put"""
+        sealed = self._writer_segment
+        self._writer.close()
+        self._writer = None
+        self._writer_segment = None
+        self._segments.append(sealed + 1)
+        if self._replica is not None:
+            with open(self._segment_path(sealed), "rb") as fh:
+                self._replica_put(fh.read(), self._replica_key(sealed))
+
+    def _read_record(self):
+        head_segment = self._segments[0]
+        if self._reader_segment != head_segment:
+            if self._reader is not None:
+                self._reader.close()
+            self._reader = open(self._segment_path(head_segment), "rb")
+            self._reader_segment = head_segment
+        self._reader.seek(self._head_offset)
+        length = self.RECORD_HEADER.unpack(self._reader.read(self.RECORD_HEADER.size))[0]
+        item = self._reader.read(length)
+        self._head_offset = self._reader.tell()
+        return item
+
+    def _compact(self):
+        """Expire fully drained segments in bulk"""
+        if self._count == 0:
+            self._reset()
+            return
+        while len(self._segments) > 1 and \
+                self._head_offset >= os.path.getsize(self._segment_path(self._segments[0])):
+            self._drop_head_segment()
+
+    def _drop_head_segment(self):
+        segment = self._segments.pop(0)
+        if self._reader_segment == segment:
+            self._reader.close()
+            self._reader = None
+            self._reader_segment = None
+        os.remove(self._segment_path(segment))
+        if self._replica is not None:
+            self._replica_delete(segment)
+        self._head_offset = 0
+
+    def _create_space(self, size_of_item):
+        """Drop whole sealed segments first, then single messages"""
+        while self._count and len(self._segments) > 1 and self.is_full(size_of_item):
+            count, size = self._scan_segment(self._segments[0], self._head_offset)
+            self._count -= count
+            self._size -= size
+            self._drop_head_segment()
+        while self._count and self.is_full(size_of_item):
+            item = self._read_record()
+            self._count -= 1
+            self._size -= len(item)
+        self._compact()
+
+    def _reset(self):
+        """Drop every segment once the queue has been drained"""
+        for fh in (self._reader, self._writer):
+            if fh is not None:
+                fh.close()
+        self._reader = self._writer = None
+        self._reader_segment = self._writer_segment = None
+        next_segment = self._segments[-1] + 1 if self._segments else 0
+        for segment in self._segments:
+            try:
+                os.remove(self._segment_path(segment))
+            except OSError:
+                pass
+            if self._replica is not None:
+                self._replica_delete(segment)
+        self._segments = [next_segment]
+        self._head_offset = 0
+        self._count = 0
+        self._size = 0
+
+    def _maybe_checkpoint(self):
+        self._dirty_ops += 1
+        if self._dirty_ops >= self._checkpoint_ops or \
+                time.time() - self._last_checkpoint >= self._checkpoint_interval:
+            self.checkpoint()
@@ -0,0 +1,192 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Schedules SMART health checks (smartctl -H) of drives
+                    over an interval and runs them on a bounded pool
+ ****************************************************************************
+"""
+
+import json
+import time
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from framework.utils.service_logging import logger
+
+
+class SmartHealthEngine(object):
+    """Checks the SMART health of each registered drive once per interval.
+
+       A drive is checked as soon as it is registered. The drives checked
+       together are then spread evenly over the interval, so that checks
+       run a few drives at a time instead of all drives at once.
+
+       The checks run on worker threads and never block the caller, which
+       is the watchdog's main loop. Their results are handed back through
+       a callback and recorded with record(). The last result of each
+       drive is cached and record() tells whether its health changed.
+    """
+
+    DEFAULT_INTERVAL = 60
+    DEFAULT_WORKERS = 4
+
+    # Seconds after which a smartctl command is killed, so that a hung
+    # drive does not hold a worker forever
+    CHECK_TIMEOUT = 120
+
+    def __init__(self, interval=DEFAULT_INTERVAL, workers=DEFAULT_WORKERS):
+        """
+        interval: seconds between two checks of a drive
+        workers:  maximum number of smartctl commands run at the same time
+        """
+        self._interval = interval
+        self._workers = workers
+        self._executor = None
+
+        # object path -> smartctl command
+        self._commands = {}
+        # object path -> time of the next check
+        self._next_check = {}
+        # object path -> (faulty, time of the check)
+        self._results = {}
+        # object path -> smartctl command of the check running
+        self._running = {}
+
+        self._start = time.time()
+        self._checks = 0
+
+    def set_drives(self, commands):
+        """Registers the drives to check, {object path: smartctl -H --json
+           command}. New drives are due right away, removed ones forgotten."""
+        now = time.time()
+        for path in list(self._commands):
+            if path not in commands:
+                del self._commands[path]
+                self._next_check.pop(path, None)
+                self._results.pop(path, None)
+                self._running.pop(path, None)
+        for path, command in commands.items():
+            if path not in self._commands:
+                self._next_check[path] = now
+            self._commands[path] = command
+
+    def submit_due(self, on_result):
+        """Starts the checks which are due on the worker threads and returns
+           at once. on_result(object path, command, faulty) is called on the
+           worker thread as each check ends, the caller hands it back to its
+           own thread and passes it to record()"""
+        now = time.time()
+        due = sorted(path for path, next_check in self._next_check.items()
+                     if next_check <= now and path not in self._running)
+        if not due:
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        for index, path in enumerate(due):
+            # Spread the drives checked together over the interval
+            self._next_check[path] = now + self._interval * (index + 1) / len(due)
+            command = self._commands[path]
+            self._running[path] = command
+            future = self._executor.submit(self._check, command)
+            future.add_done_callback(
+                lambda future, path=path, command=command:
+                    on_result(path, command, self._get_result(future, command)))
+        logger.debug(f"SmartHealthEngine, started {len(due)} checks")
+
+    def record(self, path, command, faulty):
+        """Records the result of a check started by submit_due(). Returns
+           True if the health of the drive changed since its last check,
+           including its first check, False if not or if the result is
+           stale because the drive was removed or changed since"""
+        if self._running.get(path) == command:
+            del self._running[path]
+        if faulty is None or self._commands.get(path) != command:
+            return False
+
+        now = time.time()
+        self._checks += 1
+        previous = self._results.get(path)
+        self._results[path] = (faulty, now)
+        changed = previous is None or previous[0] != faulty
+        if changed:
+            logger.debug(f"SmartHealthEngine, {path} faulty: {faulty}, "
+                         f"metrics: {self.get_metrics()}")
+        return changed
+
+    def next_due(self):
+        """Seconds until the next check is due, None without drives"""
+        if not self._next_check:
+            return None
+        return max(min(self._next_check.values()) - time.time(), 0)
+
+    def get_metrics(self):
+        """Checks per second since start and the age in seconds of the
+           oldest health result"""
+        now = time.time()
+        oldest = min((checked for _, checked in self._results.values()), default=now)
+        return {
+            "drives": len(self._commands),
+            "drives_per_sec": self._checks / max(now - self._start, 1),
+            "max_staleness": now - oldest
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _get_result(self, future, command):
+        try:
+            return future.result()
+        except Exception as err:
+            logger.warn(f"SmartHealthEngine, '{command}' failed: {err}")
+            return None
+
+    def _check(self, command):
+        """Returns True if the drive is faulty, None if it was removed or
+           smartctl gave no usable answer"""
+        process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, encoding='utf-8')
+        try:
+            response, _ = process.communicate(timeout=self.CHECK_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            logger.warn(f"SmartHealthEngine, '{command}' timed out after "
+                        f"{self.CHECK_TIMEOUT} secs")
+            return None
+        try:
+            response = json.loads(response)
+        except ValueError as err:
+            logger.warn(f"SmartHealthEngine, '{command}' returned mal-formed json: {err}")
+            return None
+
+        try:
+            if "No such device" in response["smartctl"]["message"][0]["string"]:
+                # Drive removed but the InterfacesRemoved signal not handled yet
+                logger.debug(f"SmartHealthEngine, drive of '{command}' is removed, ignoring")
+                return None
+        # If smartctl command is not failing there will be no ["smartctl"]["message"][0]["string"] in response
+        except (KeyError, IndexError):
+            pass
+
+        try:
+            return not response['smart_status']['passed']
+        # If ['smart_status']['passed'] not present in response, consider it as fault
+        except KeyError:
+            return True
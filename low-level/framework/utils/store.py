@@ -20,6 +20,7 @@
 """
 
 import abc
+import threading
 
 class Store(object):
     """Base class for all store implementation classes
@@ -60,3 +61,63 @@ class Store(object):
         """ get keys with given prefix
         """
         raise NotImplementedError("sub class should implement this")
+
+    def get_many(self, keys):
+        """get data of several keys, returns ({key: data}, status). Keys
+           not present map to None.
+        """
+        values = {}
+        for key in keys:
+            key_present, status = self.exists(key)
+            if status != "Success":
+                return {}, status
+            values[key] = self.get(key) if key_present else None
+        return values, "Success"
+
+    def put_many(self, values, pickled=True):
+        """write data of several keys, {key: value}, returns True if they
+           were all written
+        """
+        for key, value in values.items():
+            self.put(value, key, pickled)
+        return True
+
+    def txn(self, operations):
+        """apply a list of ("set", key, value) and ("delete", key)
+           operations, returns True if they were all applied
+        """
+        for operation in operations:
+            if operation[0] == "set":
+                self.put(operation[2], operation[1])
+            elif operation[0] == "delete":
+                self.delete(operation[1])
+            else:
+                raise ValueError(f"unknown store operation {operation[0]}")
+        return True
+
+    @abc.abstractmethod
+    def get_recursive(self, prefix):
+        """ get {key: data} of all the keys with given prefix
+        """
+        raise NotImplementedError("sub class should implement this")
+
+    def watch(self, key, callback, interval=5, recurse=False):
+        """call callback(data) on a daemon thread each time the data of
+           key, or {key: data} of the keys it prefixes if recurse, changes,
+           polling every interval seconds. Returns an Event stopping the
+           watch when set.
+        """
+        stop = threading.Event()
+        read = self.get_recursive if recurse else self.get
+        last = read(key)
+
+        def poll():
+            nonlocal last
+            while not stop.wait(interval):
+                data = read(key)
+                if data != last:
+                    last = data
+                    callback(data)
+
+        threading.Thread(target=poll, name=f"watch {key}", daemon=True).start()
+        return stop
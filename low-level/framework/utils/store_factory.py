@@ -19,7 +19,11 @@ from configparser import ConfigParser
 
 from framework.utils.filestore import FileStore
 from framework.utils.consulstore import ConsulStore
-from framework.base.sspl_constants import StoreTypes, SSPL_STORE_TYPE, CONSUL_HOST, CONSUL_PORT, file_store_config_path
+from framework.utils.caching_store import CachingStore
+from framework.base.sspl_constants import StoreTypes, SSPL_STORE_TYPE, CONSUL_HOST, CONSUL_PORT, file_store_config_path, component, DATA_PATH
+
+# StoreQueue.cache_dir_path
+UNSENT_MESSAGES_PATH = os.path.join(DATA_PATH, "SSPL_UNSENT_MESSAGES")
 
 
 class StorFactory:
@@ -41,6 +45,17 @@ class StorFactory:
                 else:
                     raise Exception("{} type store is not supported".format(store_type))
 
+                # Serve reads from memory and write behind, the config keys
+                # are changed by other processes. StoreQueue puts its messages
+                # unpickled, their head and tail indexes must be written with them
+                flush_interval = int(os.getenv('SSPL_STORE_FLUSH_INTERVAL',
+                                               CachingStore.DEFAULT_FLUSH_INTERVAL))
+                cache_ttl = int(os.getenv('SSPL_STORE_CACHE_TTL',
+                                          CachingStore.DEFAULT_CACHE_TTL))
+                StorFactory.__store = CachingStore(StorFactory.__store, flush_interval,
+                                                   uncached_prefixes=(component, UNSENT_MESSAGES_PATH),
+                                                   cache_ttl=cache_ttl)
+
                 return StorFactory.__store
             except Exception as serror:
                 print("Error in connecting either with file or consul store: {}".format(serror))
@@ -24,20 +24,20 @@ import sys
 from framework.base.sspl_constants import DATA_PATH
 from framework.utils.store_factory import store
 from framework.utils.config_reader import ConfigReader
+from framework.utils.segment_queue import SegmentLogQueue
 from framework.utils.service_logging import logger
 
-class StoreQueue:
-
-    RABBITMQPROCESSOR    = 'RABBITMQEGRESSPROCESSOR'
-    LIMIT_CONSUL_MEMORY  = 'limit_consul_memory'
-    CACHE_DIR_NAME       = "SSPL_UNSENT_MESSAGES"
 
-    def __init__(self):
-        self._conf_reader = ConfigReader()
-        self._max_size = int(self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
-                                                                self.LIMIT_CONSUL_MEMORY, 50000000))
+class StoreBackedQueue:
+    """Queue keeping every message and its head, tail and size counters as
+       separate keys in the SSPL store. Each put/get costs several store
+       round trips, use SegmentLogQueue unless the messages must live in
+       the store itself.
+    """
 
-        self.cache_dir_path = os.path.join(DATA_PATH, self.CACHE_DIR_NAME)
+    def __init__(self, cache_dir_path, max_size):
+        self._max_size = max_size
+        self.cache_dir_path = cache_dir_path
         self.SSPL_MEMORY_USAGE = os.path.join(self.cache_dir_path, 'SSPL_MEMORY_USAGE')
         self._current_size = store.get(self.SSPL_MEMORY_USAGE)
         if self._current_size is None:
@@ -109,12 +109,103 @@ class StoreQueue:
     def put(self, item):
         size_of_item = sys.getsizeof(item)
         if self.is_full(size_of_item):
-            logger.debug("StoreQueue, put, consul memory usage exceded limit, \
+            logger.debug("StoreBackedQueue, put, consul memory usage exceded limit, \
                 removing old message")
             self._create_space(size_of_item)
         store.put(item, f"{self.SSPL_UNSENT_MESSAGES}/{self.tail}", pickled=False)
         self.tail += 1
         self.current_size += size_of_item
-        logger.debug("StoreQueue, put, current memory usage %s" % self.current_size)
+        logger.debug("StoreBackedQueue, put, current memory usage %s" % self.current_size)
+
+    def close(self):
+        """Nothing to flush, every operation is written through"""
+        pass
+
+
+class StoreQueue:
+    """Persistent queue of messages which could not be sent on the egress
+       channel. The backend is chosen with 'store_queue_backend':
+         segment: append-only segment log on local disk (default), optionally
+                  replicated to the SSPL store with 'store_queue_replicate'
+         store:   every message kept as a key in the SSPL store
+    """
+
+    RABBITMQPROCESSOR    = 'RABBITMQEGRESSPROCESSOR'
+    LIMIT_CONSUL_MEMORY  = 'limit_consul_memory'
+    QUEUE_BACKEND        = 'store_queue_backend'
+    QUEUE_REPLICATE      = 'store_queue_replicate'
+    SEGMENT_SIZE         = 'store_queue_segment_size'
+    CHECKPOINT_INTERVAL  = 'store_queue_checkpoint_interval'
+    CACHE_DIR_NAME       = "SSPL_UNSENT_MESSAGES"
+    SEGMENT_DIR_NAME     = "SEGMENTS"
+
+    BACKEND_SEGMENT      = "segment"
+    BACKEND_STORE        = "store"
+
+    def __init__(self):
+        self._conf_reader = ConfigReader()
+        self._max_size = int(self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
+                                                                self.LIMIT_CONSUL_MEMORY, 50000000))
+        backend = self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
+                                                            self.QUEUE_BACKEND, self.BACKEND_SEGMENT)
+        self.cache_dir_path = os.path.join(DATA_PATH, self.CACHE_DIR_NAME)
+
+        if backend == self.BACKEND_STORE:
+            self._queue = StoreBackedQueue(self.cache_dir_path, self._max_size)
+        else:
+            if backend != self.BACKEND_SEGMENT:
+                logger.warn("StoreQueue, unknown backend '%s', using '%s'"
+                            % (backend, self.BACKEND_SEGMENT))
+            self._queue = self._init_segment_queue()
+        logger.debug("StoreQueue, using %s backend" % type(self._queue).__name__)
+
+    def _init_segment_queue(self):
+        """Create the segment log and move over messages left by the store backend"""
+        replicate = self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
+                                                              self.QUEUE_REPLICATE, 'false')
+        segment_size = int(self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
+                                                                     self.SEGMENT_SIZE, 4194304))
+        checkpoint_interval = int(self._conf_reader._get_value_with_default(self.RABBITMQPROCESSOR,
+                                                                            self.CHECKPOINT_INTERVAL, 5))
+        queue = SegmentLogQueue(os.path.join(self.cache_dir_path, self.SEGMENT_DIR_NAME),
+                                self._max_size, segment_size=segment_size,
+                                checkpoint_interval=checkpoint_interval,
+                                replica=store if str(replicate).lower() == 'true' else None)
+
+        head_key = os.path.join(self.cache_dir_path, 'SSPL_MESSAGE_HEAD_INDEX')
+        tail_key = os.path.join(self.cache_dir_path, 'SSPL_MESSAGE_TAIL_INDEX')
+        if not store.exists(tail_key)[0]:
+            return queue
+        head, tail = store.get(head_key), store.get(tail_key)
+        if isinstance(head, int) and isinstance(tail, int) and tail > head:
+            logger.info("StoreQueue, migrating %d messages from store to segment log"
+                        % (tail - head))
+            legacy = StoreBackedQueue(self.cache_dir_path, self._max_size)
+            while not legacy.is_empty():
+                item = legacy.get()
+                if item is not None:
+                    queue.put(item)
+            queue.checkpoint()
+        return queue
+
+    @property
+    def current_size(self):
+        return self._queue.current_size
+
+    def is_empty(self):
+        return self._queue.is_empty()
+
+    def is_full(self, size_of_item):
+        return self._queue.is_full(size_of_item)
+
+    def get(self):
+        return self._queue.get()
+
+    def put(self, item):
+        self._queue.put(item)
+
+    def close(self):
+        """Persist queue state, called on shutdown"""
+        self._queue.close()
 
 store_queue = StoreQueue()
@@ -20,9 +20,9 @@ drivers information and configuration.
 
 
 import os
-from pathlib import Path
 
 from framework.utils.utility import Utility
+from framework.utils.sas_phy_monitor import SASPhyMonitor
 
 class SysFS(Utility):
     """Module which is responsible for fetching information
@@ -36,27 +36,20 @@ class SysFS(Utility):
     def __init__(self):
         """init method"""
         super(SysFS, self).__init__()
-        self.sas_phy_dir_list = []
-        self.phy_dir_dict = {}
-        self.sas_phy_dir_path = {}
+        self.sas_phy_dir_path = self.get_sys_dir_path('sas_phy')
+        self.sas_phy_monitor = None
 
     def initialize(self):
         """Method for initialization.
-           This iterates over /sys/class/sas_phy directory using listdir
-           method of os module. And stores iterator to that path in the
-           dictionary with key as dir_name.
-           Ex: {"phy0": PosixPath('phy0')}"""
+           Checks /sys/class/sas_phy directory can be listed and creates
+           the monitor which keeps the negotiated_linkrate file of each
+           phy open."""
 
         try:
-            self.sas_phy_dir_path = self.get_sys_dir_path('sas_phy')
-            self.sas_phy_dir_list = os.listdir(self.sas_phy_dir_path)
-            if self.sas_phy_dir_list:
-                for phy_dir in self.sas_phy_dir_list:
-                    absolute_phy_dir_path = \
-                            os.path.join(self.sas_phy_dir_path, phy_dir)
-                    self.phy_dir_dict[phy_dir] = Path(absolute_phy_dir_path)
+            os.listdir(self.sas_phy_dir_path)
         except OSError as os_error:
             return os_error.errno
+        self.sas_phy_monitor = SASPhyMonitor(self.sas_phy_dir_path)
 
     def get_sys_dir_path(self, sys_dir_name):
         """Returns the complete sysfs directory path
@@ -66,22 +59,21 @@ class SysFS(Utility):
         return sys_dir_path
 
     def get_phy_negotiated_link_rate(self):
-        """Iterates over the phy directory using the iterator and returns
-           the dict with key as phy_name and value as negotiated linkrate
+        """Returns the dict with key as phy_name and value as negotiated
+           linkrate read from /sys/class/sas_phy/<phy>/negotiated_linkrate
            {'phy0': <12G/Unknown/..>}"""
 
-        phy_dir = {}
-        # Get the iterator from the initialized global dictionary
-        # And again iterates over respective directory to get the value
-        # of negotiated linkrate from the 'negotiated linkrate' file
-        # situated at /sys/class/sas_phy/<phy>/negotiated linkrate
-        for phy_name, iterator in self.phy_dir_dict.items():
-            for entry in iterator.iterdir():
-                entry_str = str(entry)
-                if 'negotiated_linkrate' in entry_str.lower() and entry.is_file():
-                    link_rate = entry.read_text()
-                    phy_dir[phy_name] = link_rate
-        return phy_dir
+        if self.sas_phy_monitor is None:
+            return {}
+        return self.sas_phy_monitor.get_link_rates()
+
+    def get_phy_negotiated_link_rate_changes(self):
+        """Same as get_phy_negotiated_link_rate() but only with the phys
+           whose linkrate changed since the previous call"""
+
+        if self.sas_phy_monitor is None:
+            return {}
+        return self.sas_phy_monitor.get_changes()
 
     def convert_cpu_info_list(self, cpu_info):
         """Converts cpu info as read from file to a list of cpu indexes
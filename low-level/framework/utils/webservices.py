@@ -21,7 +21,13 @@
 """
 
 
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import Timeout, ConnectionError, HTTPError
 from framework.utils.service_logging import logger
 
@@ -44,20 +50,40 @@ class WebServices(object):
 
     LOOPBACK = "127.0.0.1"
 
-    def __init__(self):
+    # Keep-alive connections kept per host, also the number of
+    # requests ws_request_many runs at once
+    POOL_SIZE = 8
+
+    def __init__(self, pool_size=POOL_SIZE):
         super(WebServices, self).__init__()
 
         self.http_methods = [self.HTTP_GET, self.HTTP_POST]
 
-    def ws_request(self, method, url, hdrs, postdata, tout):
-        """Make webservice request"""
+        # Connections are reused across requests instead of opening a new
+        # TCP connection for each of them
+        self._pool_size = pool_size
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        # Latency of each endpoint, {endpoint: [count, errors, total, max, last]}
+        self._metrics = {}
+        self._metrics_lock = threading.Lock()
+
+    def ws_request(self, method, url, hdrs, postdata, tout, endpoint=None):
+        """Make webservice request, endpoint names the request in the
+           latency metrics and defaults to the url path"""
         wsresponse = None
+        start = time.time()
 
         try:
             if method == self.HTTP_GET:
-                wsresponse = requests.get(url, headers=hdrs, timeout=tout)
+                wsresponse = self._session.get(url, headers=hdrs, timeout=tout)
             elif method == self.HTTP_POST:
-                wsresponse = requests.post(url, headers=hdrs, data=postdata,
+                wsresponse = self._session.post(url, headers=hdrs, data=postdata,
                                timeout=tout)
 
             wsresponse.raise_for_status()
@@ -106,11 +132,50 @@ class WebServices(object):
                         ", defaulting to err {2}"\
                         .format(url,err,wsresponse.status_code))
 
+        self._record_latency(endpoint or urlparse(url).path, time.time() - start,
+                             wsresponse.status_code != self.HTTP_OK)
         return wsresponse
 
-    def ws_get(self, url, headers, timeout):
+    def ws_request_many(self, method, urls, hdrs, postdata, tout):
+        """Makes the same request to several urls concurrently over the
+           connection pool, returns the responses in the order of urls"""
+        return self.run_concurrent(
+            lambda url: self.ws_request(method, url, hdrs, postdata, tout), urls)
+
+    def run_concurrent(self, func, items):
+        """Returns [func(item) for item in items] with up to pool_size calls
+           running at once"""
+        items = list(items)
+        if len(items) < 2:
+            return [func(item) for item in items]
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._pool_size)
+        return list(self._executor.map(func, items))
+
+    def get_metrics(self):
+        """Returns {endpoint: {"count", "errors", "avg_ms", "max_ms", "last_ms"}}"""
+        with self._metrics_lock:
+            return {endpoint: {"count": count,
+                               "errors": errors,
+                               "avg_ms": round(total * 1000 / count, 3),
+                               "max_ms": round(maximum * 1000, 3),
+                               "last_ms": round(last * 1000, 3)}
+                    for endpoint, (count, errors, total, maximum, last)
+                    in self._metrics.items()}
+
+    def _record_latency(self, endpoint, elapsed, failed):
+        with self._metrics_lock:
+            metric = self._metrics.setdefault(endpoint, [0, 0, 0.0, 0.0, 0.0])
+            metric[0] += 1
+            metric[1] += int(failed)
+            metric[2] += elapsed
+            metric[3] = max(metric[3], elapsed)
+            metric[4] = elapsed
+
+    def ws_get(self, url, headers, timeout, endpoint=None):
         """Webservice GET request"""
-        return  self.ws_request(self.HTTP_GET, url, headers, None, timeout)
+        return  self.ws_request(self.HTTP_GET, url, headers, None, timeout, endpoint)
 
     def ws_post(self, url, headers, postdata, timeout):
         """Webservice POST request"""
@@ -20,14 +20,8 @@
  ****************************************************************************
 """
 
-import os
-import json
-from jsonschema import Draft3Validator
-from jsonschema import validate
-
 from json_msgs.messages.base_msg import BaseMsg
-from json_msgs.schemas import actuators
-from framework.base.sspl_constants import RESOURCE_PATH
+from json_msgs.schema_registry import schema_registry
 
 class BaseActuatorMsg(BaseMsg):
     '''
@@ -36,24 +30,15 @@ class BaseActuatorMsg(BaseMsg):
 
     TITLE                = "SSPL Actuator Response"
     DESCRIPTION          = "Seagate Storage Platform Library - Actuator Response"
-    JSON_ACTUATOR_SCHEMA = "SSPL-LL_Actuator_Response.json"
+    JSON_ACTUATOR_SCHEMA = schema_registry.ACTUATOR_RESPONSE
 
 
     def __init__(self):
-        """Reads in the json schema for all actuator response messages"""
+        """The actuator response schema is loaded once by the schema registry"""
         super(BaseActuatorMsg, self).__init__()
 
-        # Read in the schema for validating messages
-        fileName = os.path.join(RESOURCE_PATH + '/actuators',
-                                self.JSON_ACTUATOR_SCHEMA)
-        with open(fileName, 'r') as f:
-            self._schema = json.load(f)
-
-        # Validate the schema
-        Draft3Validator.check_schema(self._schema)
-
     def validateMsg(self, _jsonMsg):
         """Validate the json message against the schema"""
         _jsonMsg = self.normalize_kv(_jsonMsg)
-        validate(_jsonMsg, self._schema)
+        schema_registry.validate(_jsonMsg, self.JSON_ACTUATOR_SCHEMA)
         return _jsonMsg
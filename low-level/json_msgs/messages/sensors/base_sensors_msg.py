@@ -20,14 +20,8 @@
  ****************************************************************************
 """
 
-import os
-import json
-from jsonschema import Draft3Validator
-from jsonschema import validate
-
 from json_msgs.messages.base_msg import BaseMsg
-from json_msgs.schemas import sensors
-from framework.base.sspl_constants import RESOURCE_PATH
+from json_msgs.schema_registry import schema_registry
 
 class BaseSensorMsg(BaseMsg):
     '''
@@ -36,27 +30,15 @@ class BaseSensorMsg(BaseMsg):
 
     TITLE               = "SSPL Sensor Response"
     DESCRIPTION         = "Seagate Storage Platform Library - Sensor Response"
-    JSON_SENSOR_SCHEMA  = "SSPL-LL_Sensor_Response.json"
+    JSON_SENSOR_SCHEMA  = schema_registry.SENSOR_RESPONSE
 
 
     def __init__(self):
-        """Reads in the json schema for all sensor response messages"""
+        """The sensor response schema is loaded once by the schema registry"""
         super(BaseSensorMsg, self).__init__()
 
-        # Read in the sensor schema for validating messages
-        fileName = os.path.join(RESOURCE_PATH + '/sensors',
-                                self.JSON_SENSOR_SCHEMA)
-        with open(fileName, 'r') as f:
-            _schema = f.read()
-
-        # Remove tabs and newlines
-        self._schema = json.loads(' '.join(_schema.split()))
-
-        # Validate the schema
-        Draft3Validator.check_schema(self._schema)
-
     def validateMsg(self, _jsonMsg):
         """Validate the json message against the schema"""
         _jsonMsg = self.normalize_kv(_jsonMsg)
-        validate(_jsonMsg, self._schema)
+        schema_registry.validate(_jsonMsg, self.JSON_SENSOR_SCHEMA)
         return _jsonMsg
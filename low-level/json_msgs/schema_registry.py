@@ -0,0 +1,76 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Process wide registry of the JSON message schemas.
+                    Each schema is read, checked and compiled into a
+                    validator once and shared by every message class and
+                    ingress processor.
+ ****************************************************************************
+"""
+
+import os
+import json
+import threading
+from jsonschema import Draft3Validator
+
+from framework.base.sspl_constants import RESOURCE_PATH
+
+
+class SchemaRegistry(object):
+    """Loads schemas on first use and keeps a compiled validator per schema"""
+
+    SENSOR_RESPONSE    = "sensors/SSPL-LL_Sensor_Response.json"
+    SENSOR_REQUEST     = "sensors/SSPL-LL_Sensor_Request.json"
+    ACTUATOR_RESPONSE  = "actuators/SSPL-LL_Actuator_Response.json"
+    ACTUATOR_REQUEST   = "actuators/SSPL-LL_Actuator_Request.json"
+
+    def __init__(self, resource_path=RESOURCE_PATH):
+        """resource_path: directory holding the sensors/ and actuators/ schemas"""
+        self._resource_path = resource_path
+        self._schemas = {}
+        self._validators = {}
+        self._lock = threading.Lock()
+
+    def get_schema(self, schema_name):
+        """Returns the parsed schema, schema_name is relative to resource_path"""
+        return self._schemas.get(schema_name) or self._load(schema_name)[0]
+
+    def get_validator(self, schema_name):
+        """Returns the compiled validator for the schema"""
+        return self._validators.get(schema_name) or self._load(schema_name)[1]
+
+    def validate(self, msg, schema_name):
+        """Validates msg against the schema, raises
+           jsonschema.ValidationError if it does not conform"""
+        self.get_validator(schema_name).validate(msg)
+
+    def _load(self, schema_name):
+        with self._lock:
+            if schema_name not in self._validators:
+                schema_file = os.path.join(self._resource_path, schema_name)
+                with open(schema_file, 'r') as f:
+                    schema = json.load(f)
+
+                # Validate the schema to conform to Draft 3 specification
+                Draft3Validator.check_schema(schema)
+
+                self._schemas[schema_name] = schema
+                self._validators[schema_name] = Draft3Validator(schema)
+            return self._schemas[schema_name], self._validators[schema_name]
+
+
+schema_registry = SchemaRegistry()
@@ -46,6 +46,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "DiskMsgHandler"
     PRIORITY    = 2
+    DISPATCH_ON_MSGQ = True
 
     # Section and keys in configuration file
     DISKMSGHANDLER    = MODULE_NAME.upper()
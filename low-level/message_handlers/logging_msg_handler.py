@@ -37,6 +37,7 @@ class LoggingMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "LoggingMsgHandler"
     PRIORITY    = 2
+    DISPATCH_ON_MSGQ = True
 
     # Section and keys in configuration file
     LOGGINGMSGHANDLER   = MODULE_NAME.upper()
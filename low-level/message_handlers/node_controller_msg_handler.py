@@ -26,6 +26,7 @@ import socket
 from framework.base.module_thread import ScheduledModuleThread
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.utils.service_logging import logger
+from framework.utils.device_index import device_index
 from framework.base.sspl_constants import enabled_products, COMMON_CONFIGS
 
 from rabbitmq.rabbitmq_egress_processor import RabbitMQegressProcessor
@@ -44,6 +45,7 @@ class NodeControllerMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "NodeControllerMsgHandler"
     PRIORITY    = 2
+    DISPATCH_ON_MSGQ = True
 
     SYS_INFORMATION = 'SYSTEM_INFORMATION'
     SETUP = 'setup'
@@ -540,15 +542,19 @@ class NodeControllerMsgHandler(ScheduledModuleThread, InternalMsgQ):
                         self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
                         return
                 else:
-                    if self._smartctl_actuator is None:
-                        from actuators.Ismartctl import ISmartctl
-                        smartctl_actuator_class = self._queryUtility(ISmartctl)
-                        if smartctl_actuator_class:
-                            self._smartctl_actuator = self._queryUtility(ISmartctl)()
-                            self._log_debug("_process_msg, _smart_actuator name: %s" % self._smartctl_actuator.name())
-                        else:
-                            logger.error(" No module Smartctl is present to load")
-                    serial_compare = self._smartctl_actuator._check_serial_number(drive_request)
+                    drive = device_index.lookup(drive_request)
+                    serial_compare = drive is not None and drive["serial"] == drive_request
+                    if not serial_compare:
+                        # Not a known drive, scan the drives with smartctl
+                        if self._smartctl_actuator is None:
+                            from actuators.Ismartctl import ISmartctl
+                            smartctl_actuator_class = self._queryUtility(ISmartctl)
+                            if smartctl_actuator_class:
+                                self._smartctl_actuator = self._queryUtility(ISmartctl)()
+                                self._log_debug("_process_msg, _smart_actuator name: %s" % self._smartctl_actuator.name())
+                            else:
+                                logger.error(" No module Smartctl is present to load")
+                        serial_compare = self._smartctl_actuator._check_serial_number(drive_request)
                     if not serial_compare:
                         json_msg = AckResponseMsg(node_request, "Drive Not Found", uuid).getJson()
                         self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
@@ -753,10 +759,15 @@ class NodeControllerMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # ... handle other node message types
 
     def _retrieve_serial_number(self, drive_request):
-        """Retrieves serial number using smartctl tool with /dev/* path"""
+        """Retrieves serial number of a /dev/* path from the device index,
+           using smartctl tool for the drives it doesn't know"""
         serial_number = "Not Found"
         error = ""
 
+        indexed_serial = device_index.get_serial(drive_request)
+        if indexed_serial:
+            return indexed_serial, error
+
         try:
             # Query the Zope GlobalSiteManager for an object implementing the smart actuator
             if self._smartctl_actuator is None:
@@ -789,6 +800,7 @@ class NodeControllerMsgHandler(ScheduledModuleThread, InternalMsgQ):
             else:
                 # Parse out "Serial Number:" from smartctl result to obtain serial number
                 serial_number = smartctl_response[14:].strip()
+                device_index.update(drive_request, serial=serial_number)
 
         except Exception as ae:
             logger.exception(ae)
@@ -47,6 +47,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "NodeDataMsgHandler"
     PRIORITY    = 2
+    DISPATCH_ON_MSGQ = True
 
     # Section and keys in configuration file
     NODEDATAMSGHANDLER = MODULE_NAME.upper()
@@ -219,6 +220,11 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 self._node_sensor = self._queryUtility(INodeData)()
                 self._log_debug("_node_sensor name: %s" % self._node_sensor.name())
 
+                # Check the nw and cable alerts as soon as an interface changes
+                # instead of waiting for the next transmit interval
+                if hasattr(self._node_sensor, "add_interface_listener"):
+                    self._node_sensor.add_interface_listener(self._on_interface_change)
+
             # Delay for the desired interval if it's greater than zero
             if self._transmit_interval > 0:
                 logger.debug("self._transmit_interval:{}".format(self._transmit_interval))
@@ -339,6 +345,10 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
                             f"No past data found for {self.sensor_type} sensor type")
 
 
+        # Interface state change seen by the node sensor
+        elif jsonMsg.get("nw_interface_change") is not None:
+            self._generate_if_data()
+
         # Update mapping of device names to serial numbers for global use
         elif jsonMsg.get("sensor_response_type") is not None:
             if jsonMsg.get("sensor_response_type") == "devicename_serialnumber":
@@ -663,6 +673,10 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
             severity = self.severity_reader.map_severity(nw_state)
             self._send_ifdata_json_msg("nw", nw_resource_id, self.NW_RESOURCE_TYPE, nw_state, severity, event_field)
 
+    def _on_interface_change(self, interface):
+        """Called on the interface monitor thread, has the alerts checked on ours"""
+        self._write_internal_msgQ(self.name(), {"nw_interface_change": interface})
+
     def _get_nwalert(self, interfaces):
         """
         Get network interfaces with fault/OK state for each interface.
@@ -35,6 +35,7 @@ class PlaneCntrlMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "PlaneCntrlMsgHandler"
     PRIORITY    = 2
+    DISPATCH_ON_MSGQ = True
 
 
     @staticmethod
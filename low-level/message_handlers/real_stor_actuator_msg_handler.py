@@ -36,6 +36,7 @@ class RealStorActuatorMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "RealStorActuatorMsgHandler"
     PRIORITY    = 2
+    DISPATCH_ON_MSGQ = True
 
     SYS_INFORMATION = 'SYSTEM_INFORMATION'
     SETUP = 'setup'
@@ -44,6 +44,7 @@ class RealStorEnclMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     # TODO increase the priority
     PRIORITY = 2
+    DISPATCH_ON_MSGQ = True
 
     # Dependency list
     DEPENDENCIES = {
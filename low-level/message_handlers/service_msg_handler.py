@@ -39,6 +39,7 @@ class ServiceMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "ServiceMsgHandler"
     PRIORITY = 2
+    DISPATCH_ON_MSGQ = True
 
     # Dependency list
     DEPENDENCIES = {
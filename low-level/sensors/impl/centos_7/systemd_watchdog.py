@@ -25,13 +25,10 @@ import re
 import os
 import json
 import time
-import copy
 import subprocess
 import threading
 import uuid
 
-from datetime import datetime, timedelta
-
 from framework.rabbitmq.rabbitmq_egress_processor import RabbitMQegressProcessor
 from framework.base.module_thread import SensorThread
 from framework.base.internal_msgQ import InternalMsgQ
@@ -39,6 +36,8 @@ from framework.utils.service_logging import logger
 from framework.base.sspl_constants import cs_products, COMMON_CONFIGS
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import file_store
+from framework.utils.smart_health import SmartHealthEngine
+from framework.utils.device_index import device_index
 
 # Modules that receive messages from this module
 from message_handlers.service_msg_handler import ServiceMsgHandler
@@ -51,6 +50,7 @@ from zope.interface import implementer
 from sensors.IService_watchdog import IServiceWatchdog
 
 import dbus
+import dbus.lowlevel
 from dbus import SystemBus, Interface, Array
 from gi.repository import GObject as gobject
 from dbus.mainloop.glib import DBusGMainLoop
@@ -70,11 +70,16 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
     MONITORED_SERVICES = 'monitored_services'
     SMART_TEST_INTERVAL= 'smart_test_interval'
     SMART_ON_START     = 'run_smart_on_start'
+    SMART_HEALTH_INTERVAL = 'smart_health_interval'
+    SMART_HEALTH_WORKERS  = 'smart_health_workers'
     SYSTEM_INFORMATION = 'SYSTEM_INFORMATION'
     SETUP              = 'setup'
 
     DEFAULT_RAS_VOL = "/var/cortx/sspl/data/"
 
+    # Seconds the msgQ watcher waits for writes before checking for shutdown
+    MSGQ_WAIT_TIMEOUT = 10
+
     SITE_ID = "site_id"
     RACK_ID = "rack_id"
     NODE_ID = "node_id"
@@ -101,6 +106,17 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
     ENCLOSURE_DISK_RESOURCE_TYPE = "enclosure:fru:disk"
     SMARTCTL_PASSED_RESPONSE = "SMART overall-health self-assessment test result: PASSED"
 
+    SYSTEMD_BUS_NAME = 'org.freedesktop.systemd1'
+    SYSTEMD_UNIT_INTERFACE = 'org.freedesktop.systemd1.Unit'
+    SYSTEMD_UNIT_PATH = '/org/freedesktop/systemd1/unit'
+    UNIT_PROPERTIES_CHANGED_MATCH = (f"type='signal',sender='{SYSTEMD_BUS_NAME}',"
+                                     f"interface='org.freedesktop.DBus.Properties',"
+                                     f"member='PropertiesChanged',"
+                                     f"path_namespace='{SYSTEMD_UNIT_PATH}',"
+                                     f"arg0='{SYSTEMD_UNIT_INTERFACE}'")
+    # D-Bus calls sent before waiting for their replies
+    DBUS_BATCH_SIZE = 64
+
     @staticmethod
     def name():
         """@return: name of the module."""
@@ -116,6 +132,16 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
         self._inactive_services  = []
         self._wildcard_services  = []
 
+        # Starting chars of the wildcard services, ie m0d@
+        self._wildcard_prefixes  = ()
+
+        # Mapping of the object paths of monitored units to their names
+        self._unit_paths = {}
+
+        # Unit signals received while the initial state of the services is
+        # read, (handler, args) handled once it is sent. None when not queuing
+        self._queued_unit_signals = None
+
         # Mapping of current service PIDs
         self._service_pids = {}
 
@@ -128,8 +154,11 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
         # List of serial numbers which have been flagged for simulated failure of SMART tests from CLI
         self._simulated_smart_failures = []
 
-        # Keep sleep 1 second to avoid delay for disk insertion/removal alerts
-        self._thread_sleep = 1
+        # GLib main loop dispatching the D-Bus signals, created in run()
+        self._loop = None
+
+        # Source of the timeout running the next due SMART health checks
+        self._smart_health_source = None
 
         # Location of hpi data directory populated by dcs-collector
         self._hpi_base_dir = "/tmp/dcs/hpi"
@@ -155,6 +184,15 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
         self._smart_supported = self._is_smart_supported()
         self._log_debug(f"SystemdWatchdog, SMART supported: {self._smart_supported}")
 
+        # Checks the SMART health of the drives, spread over the interval
+        self._smart_health = SmartHealthEngine(
+            int(self._conf_reader._get_value_with_default(self.SYSTEMDWATCHDOG,
+                                                          self.SMART_HEALTH_INTERVAL,
+                                                          SmartHealthEngine.DEFAULT_INTERVAL)),
+            int(self._conf_reader._get_value_with_default(self.SYSTEMDWATCHDOG,
+                                                          self.SMART_HEALTH_WORKERS,
+                                                          SmartHealthEngine.DEFAULT_WORKERS)))
+
         # Dict of drives by-id symlink from systemd
         self._drive_by_id = {}
 
@@ -172,12 +210,6 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
         # the run() function.
         self._drive_info_lock = threading.Lock()
 
-        # Next time to run SMART tests
-        self._next_smart_tm = datetime.now() + timedelta(seconds=self._smart_interval)
-
-        # We need to speed up the thread to handle exp resets but then slow it back down to not chew up cpu
-        self._thread_speed_safeguard = -1000  # Init to a negative number to allow extra time at startup
-
         self._product = product
 
         self._site_id = conf_reader._get_value_with_default(
@@ -276,85 +308,92 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                 self._update_drive_faults()
                 store.put(self._existing_drive, self.disk_cache_path)
 
+            # Retrieve the main loop which will be called in the run method
+            self._loop = gobject.MainLoop()
+
+            # Initialize the gobject threads
+            gobject.threads_init()
+
+            # Queue the unit signals seen from now on while the PIDs are read
+            # below, they are handled after the initial state of the services
+            self._queued_unit_signals = []
+
+            # Have systemd emit unit and job signals, units are added, loaded
+            # and their state changes are then seen without polling
+            self._manager.Subscribe()
+            self._manager.connect_to_signal('UnitNew', self._on_unit_new)
+            self._manager.connect_to_signal('UnitRemoved', self._on_unit_removed)
+            self._manager.connect_to_signal('JobRemoved', self._on_job_removed)
+
+            # A single match for the PropertiesChanged signals of all units,
+            # dispatched to the monitored units by object path
+            self._bus.add_match_string(self.UNIT_PROPERTIES_CHANGED_MATCH)
+            self._bus.add_message_filter(self._on_dbus_message)
+
             # Read in the list of services to monitor
             self._monitored_services = self._get_monitored_services()
 
-            # Retrieve a list of all the service units
-            units = self._manager.ListUnits()
-
             # Update the list of monitored services with wildcard entries
             self._add_wildcard_services()
 
             #  Start out assuming their all inactive
             self._inactive_services = list(self._monitored_services)
+            for unit_name in self._inactive_services:
+                self._service_status[unit_name] = "inactive:dead"
+
+            # Retrieve a list of all the service units along with their state
+            units = self._manager.ListUnits()
 
             logger.info("Monitoring the following services listed in /etc/sspl.conf:")
+            monitored_units = []
             for unit in units:
+                unit_name, state, substate, unit_path = \
+                    str(unit[0]), str(unit[3]), str(unit[4]), str(unit[6])
 
-                if ".service" in unit[0]:
-                    unit_name = unit[0]
+                if ".service" not in unit_name or not self._is_monitored(unit_name):
+                    continue
+                logger.debug(f"    {unit_name}")
 
-                    # Apply the filter from config file if present
-                    if self._monitored_services:
-                        if unit_name not in self._monitored_services:
-                            continue
-                    logger.debug(f"    {unit_name}")
-
-                    # Retrieve an object representation of the systemd unit
-                    unit = self._bus.get_object('org.freedesktop.systemd1',
-                                                self._manager.GetUnit(unit_name))
-
-                    state = unit.Get('org.freedesktop.systemd1.Unit', 'ActiveState',
-                             dbus_interface='org.freedesktop.DBus.Properties')
-
-                    substate = unit.Get('org.freedesktop.systemd1.Unit', 'SubState',
-                             dbus_interface='org.freedesktop.DBus.Properties')
-
-                    self._service_status[str(unit_name)] = str(state) + ":" + str(substate)
-
-                    # Remove it from our inactive list; it's alive and well
-                    if state == "active":
-                        if unit_name in self._inactive_services:
-                            self._inactive_services.remove(unit_name)
-
-                    # Use the systemd unit to get an Interface to call methods
-                    Iunit = Interface(unit,
-                                      dbus_interface='org.freedesktop.systemd1.Manager')
-
-                    # Connect the PropertiesChanged signal to the unit and assign a callback
-                    Iunit.connect_to_signal('PropertiesChanged',
-                                            lambda a, b, c, p = unit :
-                                            self._on_prop_changed(a, b, c, p),
-                                            dbus_interface=dbus.PROPERTIES_IFACE)
-
-                    # Get the current PID of the service
-                    curr_pid = self._get_service_pid(unit)
-
-                    # Update the mapping of current pids
-                    self._service_pids[str(unit_name)] = curr_pid
-
-                    # Setting service_request to 'status' will case msg handler to retrieve current values
-                    msgString = json.dumps({"actuator_request_type": {
-                                    "service_watchdog_controller": {
-                                        "service_name" : unit_name,
-                                        "service_request" : "None",
-                                        "state" : state,
-                                        "previous_state" : "N/A",
-                                        "substate" : substate,
-                                        "previous_substate" : "N/A",
-                                        "pid" : curr_pid,
-                                        "previous_pid" : "N/A"
-                                        }
-                                    }
-                                 })
-                    self._write_internal_msgQ(ServiceMsgHandler.name(), msgString)
+                self._unit_paths[unit_path] = unit_name
+                self._service_status[unit_name] = state + ":" + substate
 
-            # Retrieve the main loop which will be called in the run method
-            self._loop = gobject.MainLoop()
+                # Remove it from our inactive list; it's alive and well
+                if state == "active":
+                    if unit_name in self._inactive_services:
+                        self._inactive_services.remove(unit_name)
 
-            # Initialize the gobject threads and get its context
-            gobject.threads_init()
-            context = self._loop.get_context()
+                monitored_units.append((unit_name, unit_path, state, substate))
+
+            # Get the current PID of the services
+            service_pids = self._get_service_pids(
+                                [unit_path for _, unit_path, _, _ in monitored_units])
+
+            for unit_name, unit_path, state, substate in monitored_units:
+                curr_pid = service_pids.get(unit_path, "N/A")
+
+                # Update the mapping of current pids
+                self._service_pids[unit_name] = curr_pid
+
+                # Setting service_request to 'status' will case msg handler to retrieve current values
+                msgString = json.dumps({"actuator_request_type": {
+                                "service_watchdog_controller": {
+                                    "service_name" : unit_name,
+                                    "service_request" : "None",
+                                    "state" : state,
+                                    "previous_state" : "N/A",
+                                    "substate" : substate,
+                                    "previous_substate" : "N/A",
+                                    "pid" : curr_pid,
+                                    "previous_pid" : "N/A"
+                                    }
+                                }
+                             })
+                self._write_internal_msgQ(ServiceMsgHandler.name(), msgString)
+
+            # Handle the changes seen since ListUnits() on top of its snapshot
+            queued_unit_signals, self._queued_unit_signals = self._queued_unit_signals, None
+            for handler, args in queued_unit_signals:
+                handler(*args)
 
             logger.info("SystemdWatchdog initialization completed")
 
@@ -362,38 +401,18 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
             self._set_debug(True)
             self._set_debug_persist(True)
 
-            # Loop forever iterating over the context
-            step = 0
-            while self._running == True:
-                context.iteration(False)
-                time.sleep(self._thread_sleep)
-
-                if len(self._inactive_services) > 0:
-                    self._examine_inactive_services()
+            # Perform SMART tests and refresh drive list on a regular interval
+            gobject.timeout_add_seconds(self._smart_interval, self._on_smart_test_due)
 
-                # Perform SMART tests and refresh drive list on a regular interval
-                if datetime.now() > self._next_smart_tm:
-                    self._init_drives(stagger=True)
+            # Process the msgs sent to us as they arrive
+            threading.Thread(target=self._watch_msg_queue, daemon=True,
+                             name=f"{self.name()}-msgQ").start()
+            self._check_msg_queue()
 
-                # Search for new wildcard services suddenly appearing, ie m0d@<fid>
-                step += 1
-                if len(self._wildcard_services) > 0 and step >= 15:
-                    step : int = 0
-                    self._search_new_services()
-
-                # Process any msgs sent to us
-                self._check_msg_queue()
-                with self._drive_info_lock:
-                    self._update_drive_faults()
-                    store.put(self._existing_drive, self.disk_cache_path)
-
-                # Safe guard to slow the thread down after busy exp resets
-                # self._thread_speed_safeguard += 1
-                # Only allow to run full throttle for 3 minutes (enough to handle exp resets)
-                # if self._thread_speed_safeguard > 18_00:   # 1800 = 10 * 60 * 3 running at .10 delay full speed
-                #     self._thread_speed_safeguard = 0
-                #     # Slow the main thread down to save on CPU as it gets sped up on drive removal
-                #     self._thread_sleep = 5.0
+            # Block dispatching the D-Bus signals and the sources above
+            # until shutdown() quits the loop
+            if self._running == True:
+                self._loop.run()
 
             self._log_debug("SystemdWatchdog gracefully breaking out " \
                                 "of dbus Loop, not restarting.")
@@ -412,6 +431,70 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
 
         self._log_debug("Finished processing successfully")
 
+    def _watch_msg_queue(self):
+        """Adds an idle source draining our msgQ on the main loop each time
+           msgs are written to it. The internal msgQs have no fd to add as
+           a source, so the writes are waited for on this thread."""
+        writes = None
+        while self._running == True:
+            last_writes = writes
+            writes = self._wait_my_msgQ(self.MSGQ_WAIT_TIMEOUT, writes)
+            if writes != last_writes:
+                gobject.idle_add(self._on_msg_queue)
+
+    def _on_msg_queue(self):
+        self._check_msg_queue()
+        # Remove the idle source, the next writes add a new one
+        return False
+
+    def _on_smart_test_due(self):
+        self._init_drives(stagger=True)
+        # Keep the timeout source until shutdown
+        return self._running
+
+    def _schedule_smart_health(self):
+        """(Re)arms the timeout source running the next due SMART health checks"""
+        if self._smart_health_source is not None:
+            gobject.source_remove(self._smart_health_source)
+            self._smart_health_source = None
+
+        delay = self._smart_health.next_due()
+        if delay is not None:
+            self._smart_health_source = gobject.timeout_add(
+                                            int(delay * 1000), self._on_smart_health_due)
+
+    def _on_smart_health_due(self):
+        # Removed by returning False, _update_drive_faults() adds the next one
+        self._smart_health_source = None
+        with self._drive_info_lock:
+            self._update_drive_faults()
+        return False
+
+    def _on_smart_health_result(self, object_path, command, is_drive_faulty):
+        """Run in the main loop through idle_add() with the result of a SMART
+           health check, alerts if the health of the drive changed"""
+        with self._drive_info_lock:
+            if not self._smart_health.record(object_path, command, is_drive_faulty) or \
+                    object_path not in self._existing_drive:
+                return False
+
+            if not self._existing_drive[object_path] and is_drive_faulty:
+                alert_type = self.DISK_FAULT_ALERT_TYPE
+            elif self._existing_drive[object_path] and not is_drive_faulty:
+                alert_type = self.DISK_FAULT_RESOLVED_ALERT_TYPE
+            else:
+                return False
+
+            self._existing_drive[object_path] = is_drive_faulty
+            self._drives[object_path][self.DRIVE_FAULT_ATTR] = self._get_drive_fault_info(object_path)
+            resource_type = self._get_resource_type(object_path)
+            specific_info = self._get_specific_info(object_path, alert_type)
+            resource_id = self._drive_by_path.get(object_path,
+                                str(self._drives[object_path][self.DRIVE_DBUS_INFO]["Id"]))
+            self._send_msg(alert_type, resource_type, resource_id, specific_info)
+            store.put(self._existing_drive, self.disk_cache_path)
+        return False
+
     def _check_msg_queue(self):
         """Handling incoming JSON msgs"""
 
@@ -552,52 +635,57 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                             self._log_debug(f"_process_msg, Exception: {e}")
 
     def _add_wildcard_services(self):
-        """Update the list of monitored services with wildcard entries"""
-        units = self._manager.ListUnits()
-        try:
-            # Look for wildcards in monitored services list and expandit
-            examined_services = copy.deepcopy(self._monitored_services)
-            for service in examined_services:
-                if "*" in service:
-                    # Remove service name from monitored_services and add to wildcard services list
-                    self._monitored_services.remove(service)
-                    self._wildcard_services.append(service)
-                    logger.info(f"Processing wildcard service: {service}")
-
-                    # Search thru list of services on the system that match the starting chars
-                    start_chars = service.split("*")[0]
-                    logger.info(f"Searching for services starting with: {start_chars}")
-                    for unit in units:
-                        unit_name = str(unit[0]).split("/")[-1]
-                        if unit_name.startswith(start_chars):
-                            logger.info(f"    {unit_name}")
-                            self._monitored_services.append(unit_name)
-        except Exception as ae:
-            logger.exception(ae)
+        """Move the wildcard entries of the monitored services to the
+           wildcard services, units are matched against their starting chars"""
+        for service in list(self._monitored_services):
+            if "*" in service:
+                # Remove service name from monitored_services and add to wildcard services list
+                self._monitored_services.remove(service)
+                self._wildcard_services.append(service)
+                logger.info(f"Processing wildcard service: {service}")
+
+        self._wildcard_prefixes = tuple(service.split("*")[0]
+                                        for service in self._wildcard_services)
+
+    def _is_monitored(self, unit_name):
+        """Returns True if the unit is listed in monitored services or matches
+           a wildcard service. All units are monitored if none are listed."""
+        if not self._monitored_services and not self._wildcard_prefixes:
+            return True
+        return unit_name in self._monitored_services or \
+               unit_name.startswith(self._wildcard_prefixes)
 
-    def _search_new_services(self):
-        """Look for any new wildcard services, ie m0d@<fid>"""
-        units = self._manager.ListUnits()
-        #logger.info("Searching for new services")
-        #logger.info("inactive_services: %s" % str(self._inactive_services))
-        #logger.info("monitored_services: %s" % str(self._monitored_services))
-        #logger.info("wildcard_services: %s" % str(self._wildcard_services))
+    def _get_service_pids(self, unit_paths):
+        """Returns the current PID of the services at the unit paths, the
+           Get calls are sent DBUS_BATCH_SIZE at a time. The unit signals
+           dispatched with the replies are queued by _queue_unit_signal()"""
+        service_pids = {}
+        context = self._loop.get_context()
 
-        try:
-            for service in self._wildcard_services:
-                # Search thru list of services on the system that match the starting chars
-                start_chars = service.split("*")[0]
-                for unit in units:
-                    unit_name = str(unit[0]).split("/")[-1]
-
-                    if unit_name.startswith(start_chars) and \
-                       unit_name not in self._monitored_services and \
-                       unit_name not in self._inactive_services:
-                        logger.info(f"Adding newly found wildcard service: {unit_name}")
-                        self._inactive_services.append(unit_name)
+        for start in range(0, len(unit_paths), self.DBUS_BATCH_SIZE):
+            pending = set()
 
-        except Exception as ae:
-            logger.exception(ae)
+            def on_reply(pid, unit_path):
+                service_pids[unit_path] = str(pid)
+                pending.discard(unit_path)
+
+            def on_error(error, unit_path):
+                logger.warn(f"SystemdWatchdog, unable to get PID of {unit_path}: {error}")
+                pending.discard(unit_path)
+
+            for unit_path in unit_paths[start:start + self.DBUS_BATCH_SIZE]:
+                pending.add(unit_path)
+                self._bus.call_async(self.SYSTEMD_BUS_NAME, unit_path,
+                                     dbus.PROPERTIES_IFACE, 'Get', 'ss',
+                                     ('org.freedesktop.systemd1.Service', 'ExecMainPID'),
+                                     lambda pid, path=unit_path: on_reply(pid, path),
+                                     lambda error, path=unit_path: on_error(error, path))
+
+            # Dispatch the replies
+            while pending:
+                context.iteration(True)
+
+        return service_pids
 
     def _update_by_id_paths(self):
         """Updates the global dict of by-id symlinks for each drive"""
@@ -632,9 +720,15 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                             if "phy" in symlink:
                                 self._drive_by_path[udisk_block["Drive"]] = symlink[len("/dev/disk/by-path/"):]
 
-                    # Maintain a dict of device names
-                    device = self._sanitize_dbus_value(udisk_block["Device"])
-                    self._drive_by_device_name[udisk_block["Drive"]] = device
+                    # Maintain a dict of the device names of the whole drives,
+                    # the partitions are block devices of the same drive
+                    if self._disk_objects[block_dev['path']].get('org.freedesktop.UDisks2.Partition') is None:
+                        device = self._sanitize_dbus_value(udisk_block["Device"])
+                        self._drive_by_device_name[udisk_block["Drive"]] = device
+
+                        # Share the symlinks of the whole drives with the other modules
+                        device_index.update(device, symlinks=[str(symlink) for symlink in symlinks
+                                                              if str(symlink).startswith("/dev/disk/")])
 
             except Exception as ae:
                 self._log_debug("block_dev unusable: %r" % ae)
@@ -817,72 +911,71 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
             except Exception as ae:
                 self._log_debug(f"_init_drives, Exception: {ae}")
 
-        # Update the next time to run SMART tests
-        self._next_smart_tm = datetime.now() + timedelta(seconds=self._smart_interval)
-
-    def _examine_inactive_services(self):
-        """See if an inactive service has been successfully started
-            and if so attach a callback method to its properties
-            to detect changes
-        """
-        examined_services = copy.deepcopy(self._inactive_services)
-        for disabled_service in examined_services:
-            # Retrieve an object representation of the systemd unit
-            unit = self._bus.get_object('org.freedesktop.systemd1',
-                                        self._manager.LoadUnit(disabled_service))
-
-            state = unit.Get('org.freedesktop.systemd1.Unit', 'ActiveState',
-                             dbus_interface='org.freedesktop.DBus.Properties')
-
-            substate = unit.Get('org.freedesktop.systemd1.Unit', 'SubState',
-                             dbus_interface='org.freedesktop.DBus.Properties')
-
-            if state == "active":
-                self._log_debug(f"Service: {disabled_service} is now active and being monitored!")
-                self._service_status[str(disabled_service)] = str(state) + ":" + str(substate)
-
-                # Use the systemd unit to get an Interface to call methods
-                Iunit = Interface(unit,
-                                  dbus_interface='org.freedesktop.systemd1.Manager')
-
-                # Connect the PropertiesChanged signal to the unit and assign a callback
-                Iunit.connect_to_signal('PropertiesChanged',
-                                         lambda a, b, c, p = unit :
-                                         self._on_prop_changed(a, b, c, p),
-                                         dbus_interface=dbus.PROPERTIES_IFACE)
-
-                # Remove the service from the inactive list and add it to our currently monitored list
-                self._inactive_services.remove(disabled_service)
-                if disabled_service not in self._monitored_services:
-                    self._monitored_services.append(disabled_service)
-
-                # Get the current PID of the service
-                curr_pid = self._get_service_pid(unit)
+    def _queue_unit_signal(self, handler, *args):
+        """Returns True if the unit signal is queued, to be handled by
+           handler(*args) after the initial state of the services is sent"""
+        if self._queued_unit_signals is None:
+            return False
+        self._queued_unit_signals.append((handler, args))
+        return True
 
-                # Retrieve the previous pid of the service
-                prev_pid = self._service_pids.get(str(disabled_service), "N/A")
+    def _on_unit_new(self, unit_name, unit_path):
+        """Callback for a unit loaded by systemd, starts following the state
+           of monitored services"""
+        if self._queue_unit_signal(self._on_unit_new, unit_name, unit_path):
+            return
+        unit_name, unit_path = str(unit_name), str(unit_path)
+        if ".service" not in unit_name or unit_path in self._unit_paths or \
+                not self._is_monitored(unit_name):
+            return
 
-                # Update the mapping of current pids
-                self._service_pids[str(disabled_service)] = curr_pid
+        if unit_name not in self._monitored_services and \
+                unit_name not in self._inactive_services:
+            logger.info(f"Adding newly found wildcard service: {unit_name}")
+            self._inactive_services.append(unit_name)
+            self._service_status.setdefault(unit_name, "inactive:dead")
+        self._unit_paths[unit_path] = unit_name
+
+    def _on_unit_removed(self, unit_name, unit_path):
+        """Callback for a unit unloaded by systemd, its state is kept and
+           followed again once it is loaded"""
+        if self._queue_unit_signal(self._on_unit_removed, unit_name, unit_path):
+            return
+        self._unit_paths.pop(str(unit_path), None)
 
-                # Send out notification of the state change
-                msgString = json.dumps({"actuator_request_type": {
-                                    "service_watchdog_controller": {
-                                        "service_name" : disabled_service,
-                                        "service_request" : "None",
-                                        "state" : state,
-                                        "previous_state" : "inactive",
-                                        "substate" : substate,
-                                        "previous_substate" : "dead",
-                                        "pid" : curr_pid,
-                                        "previous_pid" : prev_pid
-                                        }
-                                    }
-                                 })
-                self._write_internal_msgQ(ServiceMsgHandler.name(), msgString)
+    def _on_job_removed(self, job_id, job_path, unit_name, result):
+        """Callback for a finished start/stop job, catches the state of
+           monitored services loaded before their UnitNew signal was seen"""
+        if self._queue_unit_signal(self._on_job_removed, job_id, job_path, unit_name, result):
+            return
+        unit_name = str(unit_name)
+        if ".service" not in unit_name or unit_name in self._unit_paths.values() or \
+                not self._is_monitored(unit_name):
+            return
+        try:
+            unit_path = str(self._manager.GetUnit(unit_name))
+        except dbus.exceptions.DBusException:
+            # Unloaded again already
+            return
+        self._on_unit_new(unit_name, unit_path)
+        self._on_unit_changed(unit_path, {}, ["ActiveState", "SubState"])
 
-        if len(self._inactive_services) == 0:
-            self._log_debug("Successfully monitoring all services now!")
+    def _on_dbus_message(self, bus, message):
+        """Message filter dispatching the PropertiesChanged signals of the
+           monitored units, it sees every message received on the bus"""
+        try:
+            if message.get_member() != "PropertiesChanged" or \
+                    self._queue_unit_signal(self._on_dbus_message, bus, message):
+                pass
+            elif message.get_path() in self._unit_paths:
+                interface, changed_properties, invalidated_properties = \
+                    message.get_args_list()
+                if interface == self.SYSTEMD_UNIT_INTERFACE:
+                    self._on_unit_changed(message.get_path(), changed_properties,
+                                          invalidated_properties)
+        except Exception as ae:
+            logger.exception(ae)
+        return dbus.lowlevel.HANDLER_RESULT_NOT_YET_HANDLED
 
     def _get_service_pid(self, unit):
         """Returns the current PID of the service"""
@@ -901,24 +994,42 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
         else:
             return None
 
-    def _on_prop_changed(self, interface, changed_properties, invalidated_properties, unit):
-        """Callback to handle state changes in services"""
-        # We currently only care about the unit interface
-        if interface != 'org.freedesktop.systemd1.Unit':
-            return
+    def _on_unit_changed(self, unit_path, changed_properties, invalidated_properties):
+        """Handles state changes in services"""
+        unit_name = self._unit_paths[unit_path]
+        interface = self.SYSTEMD_UNIT_INTERFACE
 
-        # Get the interface for the unit
-        Iunit = Interface(unit, dbus_interface='org.freedesktop.DBus.Properties')
+        # Only state changes matter, other properties change as well
+        if not {"ActiveState", "SubState"}.intersection(
+                list(changed_properties.keys()) + list(invalidated_properties)):
+            return
 
-        # Always call methods on the interface not the actual object
-        unit_name = str(Iunit.Get(interface, "Id"))
+        unit = self._bus.get_object(self.SYSTEMD_BUS_NAME, unit_path)
 
         # Get the state and substate for the service
         state = self._get_prop_changed(unit, interface, "ActiveState",
                                        changed_properties, invalidated_properties)
+        if state is None:
+            state = unit.Get(interface, "ActiveState", dbus_interface=dbus.PROPERTIES_IFACE)
 
         substate = self._get_prop_changed(unit, interface, "SubState",
                                           changed_properties, invalidated_properties)
+        if substate is None:
+            substate = unit.Get(interface, "SubState", dbus_interface=dbus.PROPERTIES_IFACE)
+
+        state, substate = str(state), str(substate)
+
+        # Remove it from our inactive list; it's alive and well
+        if state == "active" and unit_name in self._inactive_services:
+            self._log_debug(f"Service: {unit_name} is now active and being monitored!")
+            self._inactive_services.remove(unit_name)
+            if len(self._inactive_services) == 0:
+                self._log_debug("Successfully monitoring all services now!")
+
+        # The state can change from an incoming json msg to the service msg handler
+        #  This provides a catch to make sure that we don't send redundant msgs
+        if self._service_status.get(unit_name, "") == state + ":" + substate:
+            return
 
         # Compare prev to curr pids to see if the service restarted abruptly
         curr_pid = self._get_service_pid(unit)
@@ -929,24 +1040,17 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
         # Update the mapping of current pids
         self._service_pids[unit_name] = curr_pid
 
-        # The state can change from an incoming json msg to the service msg handler
-        #  This provides a catch to make sure that we don't send redundant msgs
-        if self._service_status.get(unit_name, "") == str(state) + ":" + str(substate):
-            #self._log_debug("_on_prop_changed, No service state change detected: %s" % unit_name)
-            #self._log_debug("\tstate: %s, substate: %s" % (state, substate))
-            return
-
-        self._log_debug(f"_on_prop_changed, Service state change detected on unit: {unit_name}")
+        self._log_debug(f"_on_unit_changed, Service state change detected on unit: {unit_name}")
 
         # get the previous state and substate for the service
         previous_state = self._service_status.get(unit_name, "N/A:N/A").split(":")[0]
         previous_substate = self._service_status.get(unit_name, "N/A:N/A").split(":")[1]
 
-        self._log_debug(f"_on_prop_changed, State: {state}, Substate: {substate}")
-        self._log_debug(f"_on_prop_changed, Previous State: {previous_state}, Previous Substate: {previous_substate}")
+        self._log_debug(f"_on_unit_changed, State: {state}, Substate: {substate}")
+        self._log_debug(f"_on_unit_changed, Previous State: {previous_state}, Previous Substate: {previous_substate}")
 
         # Update the state in the global dict for later use
-        self._service_status[unit_name] = str(state) + ":" + str(substate)
+        self._service_status[unit_name] = state + ":" + substate
 
         # Notify the service message handler to transmit the status of the service
         msgString = json.dumps(
@@ -1062,6 +1166,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
 
                         # Remove drive
                         del self._drives[object_path]
+                        device_index.remove(self._drive_by_device_name.get(object_path), serial_number)
 
                         # Update cache with latest info
                         del self._existing_drive[object_path]
@@ -1240,6 +1345,8 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
         # Retrieve the by-id simlink for the disk
         drive_byid = self._drive_by_id[disk_path]
 
+        device_index.update(device_name, serial=serial_number)
+
         internal_json_msg = {"sensor_response_type" : "devicename_serialnumber",
                              "serial_number" : serial_number,
                              "device_name" : device_name,
@@ -1344,7 +1451,25 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                 smart_supported = False
         return smart_supported
 
+    def _get_smart_health_commands(self):
+        """Returns the smartctl health command of each drive in self._drives
+           registered in self._existing_drive. A drive is checked first once
+           registered, so that its first result, faulty or not, is handled."""
+        commands = {}
+        for object_path, drive in self._drives.items():
+            device_name = self._drive_by_device_name.get(object_path)
+            if device_name is None or object_path not in self._existing_drive:
+                continue
+            if not drive["node_disk"]:
+                commands[object_path] = f"sudo smartctl -d scsi -H {device_name} --json"
+            else:
+                commands[object_path] = f"sudo smartctl -H {device_name} --json"
+        return commands
+
     def _update_drive_faults(self):
+        """Starts the SMART health checks which are due without waiting for
+           them, their results are handled in the main loop by
+           _on_smart_health_result()"""
         # This function makes 2 assumptions:
         # 1. self._drive_info_lock is held by the caller
         # 2. self._drives and self._existing_drive are consistent with each other.
@@ -1352,52 +1477,13 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
         if not self._smart_supported:
             return
 
-        for object_path in self._drives.keys():
-
-            # To handle case when drvie is removed, but interface_removed function is not yet
-            # called, so drive will be still in self._drives, but smartctl command will fail as
-            # device is removed.
-            if not self._drives[object_path]["node_disk"]:
-                cmd = f"sudo smartctl -d scsi -H {self._drive_by_device_name[object_path]} --json"
-            else:
-                cmd = f"sudo smartctl -H {self._drive_by_device_name[object_path]} --json"
-            response, _, _ = self._run_command(cmd)
-            response = json.loads(response)
-            try:
-                if "No such device" in response["smartctl"]["message"][0]["string"]:
-                    logger.debug(f"SystemdWatchdog, _update_drive_faults, drive {object_path} is removed, ignoring SMART test")
-                    continue
-            # If smratctl command is not failing there will be no ["smartctl"]["message"][0]["string"] in response
-            except (KeyError, IndexError):
-                try:
-                    is_drive_faulty = not response['smart_status']['passed']
-                # If ['smart_status']['passed'] not present in response, consider it as fault
-                except KeyError:
-                    is_drive_faulty = True
-
-            if not self._existing_drive[object_path] and is_drive_faulty:
-                self._existing_drive[object_path] = True
-                self._drives[object_path][self.DRIVE_FAULT_ATTR] = self._get_drive_fault_info(object_path)
-                resource_type = self._get_resource_type(object_path)
-                specific_info = self._get_specific_info(object_path, self.DISK_FAULT_ALERT_TYPE)
-                resource_id = self._drive_by_path.get(object_path,
-                                    str(self._drives[object_path][self.DRIVE_DBUS_INFO]["Id"]))
-                self._send_msg(self.DISK_FAULT_ALERT_TYPE,
-                               resource_type,
-                               resource_id,
-                               specific_info)
-            elif self._existing_drive[object_path] and not is_drive_faulty:
-                self._existing_drive[object_path] = False
-                self._drives[object_path][self.DRIVE_FAULT_ATTR] = self._get_drive_fault_info(object_path)
-                resource_type = self._get_resource_type(object_path)
-                specific_info = self._get_specific_info(object_path, self.DISK_FAULT_RESOLVED_ALERT_TYPE)
-                resource_id = self._drive_by_path.get(object_path,
-                                    str(self._drives[object_path][self.DRIVE_DBUS_INFO]["Id"]))
-                self._send_msg(self.DISK_FAULT_RESOLVED_ALERT_TYPE,
-                                resource_type,
-                               resource_id,
-                               specific_info)
-            # else no change
+        self._smart_health.set_drives(self._get_smart_health_commands())
+        # Called on a worker thread, idle_add() hands the result to the main loop
+        self._smart_health.submit_due(
+            lambda object_path, command, is_drive_faulty:
+                gobject.idle_add(self._on_smart_health_result,
+                                 object_path, command, is_drive_faulty))
+        self._schedule_smart_health()
 
     def _is_drive_faulty(self, path):
         if not self._drives[path]["node_disk"]:
@@ -1444,8 +1530,13 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
 
     def shutdown(self):
         """Clean up scheduler queue and gracefully shutdown thread"""
+        self._smart_health.shutdown()
         super(SystemdWatchdog, self).shutdown()
 
+        # Return from the main loop blocking in run()
+        if self._loop is not None:
+            self._loop.quit()
+
 def is_physical_drive(interfaces_and_property):
     """
     Get the physical drives attached to server
@@ -24,16 +24,15 @@ import select
 import subprocess
 import datetime
 import os
-import csv
 import time
 import threading
 
-from functools import lru_cache
-
 from framework.base.module_thread import SensorThread
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.base.sspl_constants import iem_severity_types, iem_source_types, iem_severity_to_alert_mapping, COMMON_CONFIGS
 from framework.utils.service_logging import logger
+from framework.utils.iec_mapping import IECMapping
+from framework.utils.log_tailer import LogTailer
 from framework.base.sspl_constants import PRODUCT_FAMILY
 
 from json_msgs.messages.sensors.iem_data import IEMDataMsg
@@ -50,6 +49,8 @@ class IEMSensor(SensorThread, InternalMsgQ):
     # Keys for config settings
     LOG_FILE_PATH_KEY = "log_file_path"
     TIMESTAMP_FILE_PATH_KEY = "timestamp_file_path"
+    CHECKPOINT_LINES_KEY = "checkpoint_lines"
+    CHECKPOINT_INTERVAL_KEY = "checkpoint_interval"
     SITE_ID_KEY = "site_id"
     RACK_ID_KEY = "rack_id"
     NODE_ID_KEY = "node_id"
@@ -58,6 +59,8 @@ class IEMSensor(SensorThread, InternalMsgQ):
     # Default values for config  settings
     DEFAULT_LOG_FILE_PATH = f"/var/log/{PRODUCT_FAMILY}/iem/iem_messages"
     DEFAULT_TIMESTAMP_FILE_PATH = f"/var/{PRODUCT_FAMILY}/sspl/data/iem/last_processed_msg_time"
+    DEFAULT_CHECKPOINT_LINES = 100
+    DEFAULT_CHECKPOINT_INTERVAL = 5
     DEFAULT_SITE_ID = "001"
     DEFAULT_RACK_ID = "001"
     DEFAULT_NODE_ID = "001"
@@ -110,8 +113,13 @@ class IEMSensor(SensorThread, InternalMsgQ):
         self._rack_id = None
         self._node_id = None
         self._cluster_id = None
+        self._checkpoint_lines = self.DEFAULT_CHECKPOINT_LINES
+        self._checkpoint_interval = self.DEFAULT_CHECKPOINT_INTERVAL
         self._iem_logs = None
+        # Timestamp of the last IEM processed before offset checkpoints
+        self._resume_timestamp = None
         self._iem_log_file_lock = threading.Lock()
+        self._iec_mapping = IECMapping(self.IEC_MAPPING_DIR_PATH)
 
     def initialize(self, conf_reader, msgQlist, products):
         """initialize configuration reader and internal msg queues"""
@@ -131,6 +139,14 @@ class IEMSensor(SensorThread, InternalMsgQ):
             self.SENSOR_NAME.upper(), self.TIMESTAMP_FILE_PATH_KEY,
             self.DEFAULT_TIMESTAMP_FILE_PATH)
 
+        self._checkpoint_lines = int(self._conf_reader._get_value_with_default(
+            self.SENSOR_NAME.upper(), self.CHECKPOINT_LINES_KEY,
+            self.DEFAULT_CHECKPOINT_LINES))
+
+        self._checkpoint_interval = int(self._conf_reader._get_value_with_default(
+            self.SENSOR_NAME.upper(), self.CHECKPOINT_INTERVAL_KEY,
+            self.DEFAULT_CHECKPOINT_INTERVAL))
+
         self._site_id = self._conf_reader._get_value_with_default(
             self.SYSTEM_INFORMATION.upper(), COMMON_CONFIGS.get(self.SYSTEM_INFORMATION.upper()).get(self.SITE_ID_KEY), self.DEFAULT_SITE_ID)
 
@@ -157,25 +173,20 @@ class IEMSensor(SensorThread, InternalMsgQ):
         # Check for debug mode being activated
         self._read_my_msgQ_noWait()
         try:
-            with self._iem_log_file_lock:
-                self._iem_logs = open(self._log_file_path)
             self._create_file(self._timestamp_file_path)
 
-            with open(self._timestamp_file_path, "r") as timestamp_file:
-                last_processed_log_timestamp = timestamp_file.read().strip()
-
-            # Read and send unprocessed messages
+            # Resume from the checkpointed offset, _read_iem sends the
+            # unprocessed messages and then follows the log
             with self._iem_log_file_lock:
-                for iem_log in self._iem_logs:
-                    log = iem_log.rstrip()
-                    log_timestamp = log[:log.index(" ")]
-                    if not last_processed_log_timestamp or log_timestamp > last_processed_log_timestamp:
-                        self._process_iem(log)
+                self._iem_logs = LogTailer(self._log_file_path,
+                                           self._timestamp_file_path,
+                                           self._checkpoint_lines,
+                                           self._checkpoint_interval)
+                self._resume_timestamp = self._iem_logs.open()
 
             # Reset debug mode if persistence is not enabled
             self._disable_debug_if_persist_false()
 
-            # Read new messages
             self._read_iem()
 
         except IOError as io_error:
@@ -192,9 +203,22 @@ class IEMSensor(SensorThread, InternalMsgQ):
 
     def _read_iem(self):
         try:
-            with self._iem_log_file_lock:
-                for iem_log in self._iem_logs:
-                    self._process_iem(iem_log.rstrip())
+            while True:
+                with self._iem_log_file_lock:
+                    iem_logs = self._iem_logs.read_lines()
+                if not iem_logs:
+                    break
+                for iem_log in iem_logs:
+                    try:
+                        if self._resume_timestamp and \
+                                iem_log[:iem_log.index(" ")] <= self._resume_timestamp:
+                            continue
+                        self._process_iem(iem_log)
+                    except Exception as exception:
+                        logger.error(f"IEMSensor, self._read_iem, {exception.args} {iem_log}")
+                with self._iem_log_file_lock:
+                    self._iem_logs.maybe_checkpoint()
+            self._resume_timestamp = None
         except IOError as io_error:
             if io_error.errno == errno.ENOENT:
                 logger.error(f"IEMSensor, self._read_iem, {io_error.args} {io_error.filename}")
@@ -205,7 +229,13 @@ class IEMSensor(SensorThread, InternalMsgQ):
         except Exception as exception:
             logger.error(f"IEMSensor, self._read_iem, {exception.args}")
         finally:
-            self._scheduler.enter(10, self._priority, self._read_iem, ())
+            if self.is_running():
+                # Sleep until the log is written to, flushing the
+                # checkpoint of the last lines when the interval expires
+                self._iem_logs.wait(self._checkpoint_interval)
+                with self._iem_log_file_lock:
+                    self._iem_logs.maybe_checkpoint()
+                self._scheduler.enter(0, self._priority, self._read_iem, ())
 
     def _process_iem(self, iem_log):
         log_timestamp = iem_log[:iem_log.index(" ")]
@@ -214,8 +244,6 @@ class IEMSensor(SensorThread, InternalMsgQ):
         if iem_components:
             logger.debug("IEM mesage {} {}".format(log_timestamp, iem_components))
             self._send_msg(iem_components, log_timestamp)
-        with open(self._timestamp_file_path, "w") as timestamp_file:
-            timestamp_file.write(log_timestamp)
 
     def _send_msg(self, iem_components, log_timestamp):
         """Creates JSON message from iem components and sends to RabbitMQ
@@ -286,37 +314,11 @@ class IEMSensor(SensorThread, InternalMsgQ):
 
     def _get_component(self, component):
         "Decode a component"
-        if os.path.exists(f"{self.IEC_MAPPING_DIR_PATH}/components"):
-            with open(f"{self.IEC_MAPPING_DIR_PATH}/components", newline='') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if component == row[0]:
-                        return row[1]
-                else:
-                    return None
-        else:
-            return None
-
+        return self._iec_mapping.get_component(component)
 
-    @lru_cache(maxsize=32)
     def _decode_msg(self, code):
         "Decode a msg"
-
-        component_id, module_id, event_id = code[:3], code[3:6], code[6:]
-        component = self._get_component(component_id)
-        if component:
-            if os.path.exists(f"{self.IEC_MAPPING_DIR_PATH}/{component}"):
-                with open(f"{self.IEC_MAPPING_DIR_PATH}/{component}", newline='') as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if code == row[0]:
-                            return component, row[1], row[2]
-                    else:
-                       return component, module_id, event_id
-            else:
-                return component, module_id, event_id
-        else:
-            return component_id, module_id, event_id
+        return self._iec_mapping.decode(code)
 
     def _get_iem(self, log):
         """Returns a string starting from the word <IEC> from a syslog
@@ -417,12 +419,17 @@ class IEMSensor(SensorThread, InternalMsgQ):
             return None
 
     def refresh_file(self):
-        if os.path.exists(self._log_file_path):
-            with self._iem_log_file_lock:
-                if self._iem_logs:
-                    self._iem_logs.close()
-                    self._iem_logs = open(self._log_file_path)
+        """Called on SIGUSR2 from logrotate"""
+        with self._iem_log_file_lock:
+            if self._iem_logs:
+                self._iem_logs.refresh()
 
     def shutdown(self):
         """Clean up scheduler queue and gracefully shutdown thread"""
         super(IEMSensor, self).shutdown()
+        with self._iem_log_file_lock:
+            if self._iem_logs:
+                try:
+                    self._iem_logs.checkpoint()
+                except (IOError, OSError) as err:
+                    logger.error(f"IEMSensor, unable to write checkpoint: {err}")
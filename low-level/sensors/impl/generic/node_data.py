@@ -23,10 +23,8 @@ import os
 import math
 import socket
 import psutil
-import threading
 import subprocess as sp
 import re
-import errno
 
 from datetime import datetime
 import time
@@ -38,6 +36,9 @@ from sensors.INode_data import INodeData
 from framework.utils.sysfs_interface import SysFS
 from framework.utils.tool_factory import ToolFactory
 from framework.utils.config_reader import ConfigReader
+from framework.utils.cpu_sampler import CpuSampler
+from framework.utils.host_metrics import HostMetrics
+from framework.utils.interface_monitor import InterfaceMonitor
 
 @implementer(INodeData)
 class NodeData(Debug):
@@ -47,7 +48,11 @@ class NodeData(Debug):
     SENSOR_NAME = "NodeData"
 
     # conf attribute initialization
+    NODEDATA = SENSOR_NAME.upper()
     PROBE = 'probe'
+    CPU_SAMPLE_INTERVAL = 'cpu_sample_interval'
+    BMC_INFO_TTL = 'bmc_info_ttl'
+    DEFAULT_BMC_INFO_TTL = 60
 
     @staticmethod
     def name():
@@ -62,17 +67,22 @@ class NodeData(Debug):
         # Total number of CPUs
         self.cpus = psutil.cpu_count()
 
-        # Calculate the load averages on separate blocking threads
-        self.load_1min_average  = []
-        self.load_5min_average  = []
-        self.load_15min_average = []
         self.prev_bmcip = None
-        load_1min_avg  = threading.Thread(target=self._load_1min_avg).start()
-        load_5min_avg  = threading.Thread(target=self._load_5min_avg).start()
-        load_15min_avg = threading.Thread(target=self._load_15min_avg).start()
+        self._bmc_info = None
+        self._bmc_info_time = 0
+
+        # Process counts, uname, boot time and users for host_update
+        self._host_metrics = HostMetrics()
 
         self.conf_reader = ConfigReader()
 
+        # Calculate the cpu usage and per core load averages in the background
+        self._cpu_sampler = CpuSampler(int(self.conf_reader._get_value_with_default(
+                                              self.NODEDATA,
+                                              self.CPU_SAMPLE_INTERVAL,
+                                              CpuSampler.DEFAULT_INTERVAL)))
+        self._cpu_sampler.start()
+
         nw_fault_utility = self.conf_reader._get_value_with_default(
                                               self.name().capitalize(),
                                               self.PROBE,
@@ -94,6 +104,22 @@ class NodeData(Debug):
         except Exception as err:
             logger.error(f'NodeData, Problem occured while getting the instance of {nw_fault_utility}')
 
+        # Seconds the ipmitool lan print and ping of the BMC are cached for
+        self._bmc_info_ttl = int(self.conf_reader._get_value_with_default(
+                                              self.NODEDATA,
+                                              self.BMC_INFO_TTL,
+                                              self.DEFAULT_BMC_INFO_TTL))
+
+        # Table of the interface states, updated as links go up and down
+        self._interface_monitor = InterfaceMonitor(
+                                      getattr(self, "nw_interface_path", "/sys/class/net"))
+        self._interface_monitor.start()
+
+    def add_interface_listener(self, callback):
+        """callback(interface name) is called when the operational state
+           or the carrier of a network interface changes"""
+        self._interface_monitor.add_listener(callback)
+
     def read_data(self, subset, debug, units="MB"):
         """Updates data based on a subset"""
         self._set_debug(debug)
@@ -144,25 +170,14 @@ class NodeData(Debug):
 
     def _get_host_update_data(self):
         """Retrieves node information for the host_update json message"""
-        logged_in_users = []
-        uname_keys = ("sysname", "nodename", "version", "release", "machine")
-        self.up_time         = int(psutil.boot_time())
+        self.up_time         = self._host_metrics.boot_time
         self.boot_time       = self._epoch_time
-        self.uname           = dict(zip(uname_keys, os.uname()))
+        self.uname           = self._host_metrics.uname
         self.total_memory = dict(psutil.virtual_memory()._asdict())
-        self.process_count   = len(psutil.pids())
-        for users in psutil.users():
-            logged_in_users.append(dict(users._asdict()))
-        self.logged_in_users = logged_in_users
-        # Calculate the current number of running processes at this moment
-        total_running_proc = 0
-        for proc in psutil.process_iter():
-            pinfo = proc.as_dict(attrs=['status'])
-            if pinfo['status'] not in (psutil.STATUS_ZOMBIE, psutil.STATUS_DEAD,
-                                       psutil.STATUS_STOPPED, psutil.STATUS_IDLE,
-                                       psutil.STATUS_SLEEPING):
-                total_running_proc += 1
-        self.running_process_count = total_running_proc
+        self.logged_in_users = self._host_metrics.get_logged_in_users()
+        # Current number of processes and of running ones at this moment
+        self.process_count, self.running_process_count = \
+            self._host_metrics.get_process_counts()
 
     def _get_local_mount_data(self):
         """Retrieves node information for the local_mount_data json message"""
@@ -175,9 +190,8 @@ class NodeData(Debug):
 
     def _get_cpu_data(self):
         """Retrieves node information for the cpu_data json message"""
-        cpu_core_usage_dict = dict()
-        cpu_data = psutil.cpu_times_percent()
-        self._log_debug("_get_cpu_data, cpu_data: %s %s %s %s %s %s %s %s %s %s" % cpu_data)
+        cpu_data = self._cpu_sampler.get_times_percent()
+        self._log_debug("_get_cpu_data, cpu_data: %s %s %s %s %s %s %s %s %s %s" % tuple(cpu_data))
 
         self.csps           = 0  # What the hell is csps - cycles per second?
         self.user_time      = int(cpu_data[0])
@@ -189,25 +203,22 @@ class NodeData(Debug):
         self.softirq_time   = int(cpu_data[6])
         self.steal_time     = int(cpu_data[7])
 
-        self.cpu_usage = psutil.cpu_percent(interval=1, percpu=False)
+        # Usage over the last sampling interval
+        self.cpu_usage = self._cpu_sampler.get_usage()
         # Array to hold data about each CPU core
         self.cpu_core_data = []
-        index = 0
-        while index < self.cpus:
+        for index, (load_1min, load_5min, load_15min) in \
+                enumerate(self._cpu_sampler.get_core_averages(self.cpus)):
             self._log_debug("_get_cpu_data, index: %s, 1 min: %s, 5 min: %s, 15 min: %s" %
-                            (index,
-                            self.load_1min_average[index],
-                            self.load_5min_average[index],
-                            self.load_15min_average[index]))
+                            (index, load_1min, load_5min, load_15min))
 
             cpu_core_data = {"coreId"      : index,
-                             "load1MinAvg" : int(self.load_1min_average[index]),
-                             "load5MinAvg" : int(self.load_5min_average[index]),
-                             "load15MinAvg": int(self.load_15min_average[index]),
+                             "load1MinAvg" : int(load_1min),
+                             "load5MinAvg" : int(load_5min),
+                             "load15MinAvg": int(load_15min),
                              "ips" : 0
                              }
             self.cpu_core_data.append(cpu_core_data)
-            index += 1
 
     def _get_if_data(self):
         """Retrieves node information for the if_data json message"""
@@ -217,8 +228,8 @@ class NodeData(Debug):
         bmc_data = self._get_bmc_info()
         for interface, if_data in net_data.items():
             self._log_debug("_get_if_data, interface: %s %s" % (interface, net_data))
-            nw_status = self._fetch_nw_status()
-            nw_cable_conn_status = self.fetch_nw_cable_conn_status(interface)
+            nw_status, nw_cable_conn_status, ipv4 = \
+                self._interface_monitor.get_state(interface)
             if_data = {"ifId" : interface,
                        "networkErrors"      : (net_data[interface].errin +
                                                net_data[interface].errout),
@@ -228,56 +239,26 @@ class NodeData(Debug):
                        "droppedPacketsOut"  : net_data[interface].dropout,
                        "packetsOut"         : net_data[interface].packets_sent,
                        "trafficOut"         : net_data[interface].bytes_sent,
-                       "nwStatus"           : nw_status[interface][0],
-                       "ipV4"               : nw_status[interface][1],
+                       "nwStatus"           : nw_status,
+                       "ipV4"               : ipv4,
                        "nwCableConnStatus"  : nw_cable_conn_status
                        }
             self.if_data.append(if_data)
         self.if_data.append(bmc_data)
 
-    def _fetch_nw_status(self):
-        nw_dict = {}
-        nws = os.popen("ip --br a | awk '{print $1, $2, $3}'").read().split('\n')[:-1]
-        for nw in nws:
-            if nw.split(' ')[2]:
-                ip = nw.split(' ')[2].split("/")[0]
-            else:
-                ip = ""
-            nw_dict[nw.split(' ')[0]] = [nw.split(' ')[1], ip]
-        logger.debug("network info going is : {}".format(nw_dict))
-        return nw_dict
-
-    def fetch_nw_cable_conn_status(self, interface):
-        carrier_status = None
-        try:
-            carrier_status = self._utility_instance.fetch_nw_cable_status(self.nw_interface_path, interface)
-        except Exception as e:
-            if e == errno.ENOENT:
-                logger.error(
-                    "Problem occured while reading from nw carrier file:"
-                    f" {self.nw_interface_path}/{interface}/carrier."
-                    "file path doesn't exist")
-            elif e == errno.EACCES:
-                logger.error(
-                    "Problem occured while reading from nw carrier file:"
-                    f" {self.nw_interface_path}/{interface}/carrier."
-                    "Not enough permission to read from the file.")
-            elif e == errno.EPERM:
-                logger.error(
-                    "Problem occured while reading from nw carrier file:"
-                    f" {self.nw_interface_path}/{interface}/carrier."
-                    "Operation is not permitted.")
-            else:
-                logger.error(
-                    "Problem occured while reading from nw carrier file:"
-                    f" {self.nw_interface_path}/{interface}/carrier. Error: {e}")
-        return carrier_status
-
     def _get_bmc_info(self):
         """
         nwCableConnection will be default UNKNOWN,
         Until solution to find bmc eth port cable connection status is found.
+        The result is cached for bmc_info_ttl seconds.
         """
+        if self._bmc_info is not None and \
+                time.time() - self._bmc_info_time < self._bmc_info_ttl:
+            # The IP change, if any, was reported when the data was read
+            bmcdata = dict(self._bmc_info)
+            bmcdata['ipV4Prev'] = bmcdata['ipV4']
+            return bmcdata
+
         try:
             bmcdata = {'ifId': 'ebmc0', 'ipV4Prev': "", 'ipV4': "", 'nwStatus': "DOWN", 'nwCableConnStatus': 'UNKNOWN'}
             ipdata = sp.Popen("sudo ipmitool lan print", shell=True, stdout=sp.PIPE, stderr=sp.PIPE).communicate()[0].decode().strip()
@@ -300,46 +281,12 @@ class NodeData(Debug):
                     logger.warning("BMC Host:{0} is not reachable".format(bmcip))
         except Exception as e:
             logger.error("Exception occurs while fetching bmc_info:{}".format(e))
-        return bmcdata
+        self._bmc_info = bmcdata
+        self._bmc_info_time = time.time()
+        return dict(bmcdata)
 
     def _get_disk_space_alert_data(self):
         """Retrieves node information for the disk_space_alert_data json message"""
         self.total_space = int(psutil.disk_usage("/")[0])//int(self.units_factor)
         self.free_space  = int(psutil.disk_usage("/")[2])//int(self.units_factor)
         self.disk_used_percentage  = psutil.disk_usage("/")[3]
-
-    def _load_1min_avg(self):
-        """Loop forever calculating the one minute average load"""
-        # Initialize list to -1 indicating the time interval has not occurred yet
-        index = 0
-        while index < self.cpus:
-            self.load_1min_average.append(-1)
-            index += 1
-
-        while True:
-            # API call blocks for one minute and then returns the value
-            self.load_1min_average = psutil.cpu_percent(interval=1, percpu=True)
-
-    def _load_5min_avg(self):
-        """Loop forever calculating the five minute average load"""
-        # Initialize list to -1 indicating the time interval has not occurred yet
-        index = 0
-        while index < self.cpus:
-            self.load_5min_average.append(-1)
-            index += 1
-
-        while True:
-            # API call blocks for five minutes and then returns the value
-            self.load_5min_average = psutil.cpu_percent(interval=5, percpu=True)
-
-    def _load_15min_avg(self):
-        """Loop forever calculating the fifteen minute average load"""
-        # Initialize list to -1 indicating the time interval has not occurred yet
-        index = 0
-        while index < self.cpus:
-            self.load_15min_average.append(-1)
-            index += 1
-
-        while True:
-            # API call blocks for fifteen minutes and then returns the value
-            self.load_15min_average = psutil.cpu_percent(interval=15, percpu=True)
@@ -41,6 +41,8 @@ from framework.base.sspl_constants import PRODUCT_FAMILY
 from framework.base.sspl_constants import COMMON_CONFIGS,ServiceTypes,node_key_id
 from framework.utils.config_reader import ConfigReader
 from framework.utils.service_logging import logger
+from framework.utils.ipmi_client import IpmiSimulator
+from framework.utils.sdr_cache import sdr_cache
 from framework.utils import encryptor
 from sensors.INode_hw import INodeHWsensor
 from framework.utils.store_factory import file_store
@@ -142,6 +144,9 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
     NODEHWSENSOR = "NODEHWSENSOR"
     POLLING_INTERVAL = "polling_interval"
     DEFAULT_POLLING_INTERVAL = "30"
+    SDR_CACHE_TTL = "sdr_cache_ttl"
+    DEFAULT_SDR_CACHE_TTL = "60"
+    SDR_CACHE_STALE = "sdr_cache_stale_while_revalidate"
 
     IPMITOOL = "sudo ipmitool "
     IPMISIMTOOL = "ipmisimtool "
@@ -181,6 +186,9 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         # Flag to indicate suspension of module
         self._suspended = False
 
+        # ipmisimtool returns retcode 2 for channel interface alert
+        self._simulator = IpmiSimulator(self.IPMISIMTOOL, ok_retcodes=(0, 2))
+
         # Validate configuration file for required valid values
         try:
             self.conf_reader = ConfigReader()
@@ -191,6 +199,13 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         self.polling_interval = int(self.conf_reader._get_value_with_default(
             self.NODEHWSENSOR, self.POLLING_INTERVAL, self.DEFAULT_POLLING_INTERVAL))
 
+        # SDR data cached for this sensor and NodeHWactuator
+        sdr_cache.configure(
+            default_ttl=int(self.conf_reader._get_value_with_default(
+                self.NODEHWSENSOR, self.SDR_CACHE_TTL, self.DEFAULT_SDR_CACHE_TTL)),
+            stale_while_revalidate=self.conf_reader._get_value_with_default(
+                self.NODEHWSENSOR, self.SDR_CACHE_STALE, "true").lower() == "true")
+
     def _get_file(self, name):
         if os.path.exists(name):
             mode = self.UPDATE_ONLY_MODE
@@ -450,6 +465,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
                     if self.sdr_reset_required:
                         if self.channel_err is False:
                             self.sdr_reset_required = False
+                            sdr_cache.invalidate()
                             self._read_sensor_list()
 
                 if self.channel_err is False:
@@ -528,6 +544,11 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
             last_fru_index[device_type] = index
             last_index = index
 
+        # FRUs may have been replaced or changed state, drop the cached SDRs
+        for device_type in last_fru_index:
+            if device_type in self.fru_types:
+                sdr_cache.invalidate(device_type)
+
         for (index, date, event_time, device_id, device_type, sensor_num, event, status) \
                 in self._get_sel_event():
 
@@ -563,15 +584,9 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
 
         ipmi_tool = self.IPMITOOL
 
-        # A dummy file path check to select ipmi simulator if
-        # simulator is required, otherwise default ipmitool.
-        if os.path.exists("/tmp/activate_ipmisimtool"):
-            res, retcode = self._run_command(command=f"{self.IPMISIMTOOL} sel info")
-            # ipmisimtool returns retcode 2 for channel interface alert
-            if retcode == 0 or retcode == 2:
-                ipmi_tool = self.IPMISIMTOOL
-                logger.debug("IPMI simulator is activated")
-                self.sdr_reset_required = True
+        if self._simulator.is_active():
+            ipmi_tool = self.IPMISIMTOOL
+            self.sdr_reset_required = True
 
         if ipmi_tool==self.IPMISIMTOOL:
             command = ipmi_tool + subcommand
@@ -745,7 +760,14 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
            the first element is the sensor id and
            the second is the number."""
 
-        sensor_list_out, retcode = self._run_ipmitool_subcommand(f"sdr type '{sensor_type}'")
+        # Not served stale, _run_ipmitool_subcommand raises channel alerts
+        # and must run on the sensor thread. Keyed by caller and BMC interface
+        # so that a hit is always a listing this sensor checked for channel
+        # errors through the interface in use
+        sensor_list_out, retcode = sdr_cache.get(
+            ("sdr type", sensor_type, self.SENSOR_NAME, self.active_bmc_if),
+            lambda: self._run_ipmitool_subcommand(f"sdr type '{sensor_type}'"),
+            sensor_type, valid=self._is_sdr_output_valid, allow_stale=False)
         out = []
 
         if retcode != 0:
@@ -774,6 +796,12 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
             out.append((sensor_id, sensor_num))
         return out
 
+    def _is_sdr_output_valid(self, result):
+        """True if an ipmitool result can be cached"""
+        res, retcode = result
+        return retcode == 0 and isinstance(res, tuple) and \
+            self.IPMI_SDR_ERR not in b''.join([val for val in res if val]).decode(self.IPMI_ENCODING)
+
     def _get_sensor_list_by_entity(self, entity_id):
         """get list of sensors belonging to entity 'entity_id'
            Returns a list of sensor IDs"""
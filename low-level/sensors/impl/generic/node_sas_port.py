@@ -142,7 +142,7 @@ class SASPortSensor(SensorThread, InternalMsgQ):
                                     self.name().capitalize(), self.PROBE,
                                     "sysfs")
 
-        self.polling_interval = int(self._conf_reader._get_value_with_default(
+        self.polling_interval = float(self._conf_reader._get_value_with_default(
             self.SENSOR_NAME.upper(), self.POLLING_INTERVAL, self.DEFAULT_POLLING_INTERVAL))
 
         # Creating the instance of ToolFactory class
@@ -181,7 +181,8 @@ class SASPortSensor(SensorThread, InternalMsgQ):
                 link_value_phy_status_collection = (value, phy_status)
                 self.phy_dir_to_linkrate_mapping[phy] = link_value_phy_status_collection
 
-            # Get the stored previous alert info
+            # Get the stored previous alert info, it is kept up to date
+            # in memory from now on
             self.sas_phy_stored_alert = store.get(self.SAS_PORT_SENSOR_DATA)
             self.check_and_send_alert()
 
@@ -284,6 +285,7 @@ class SASPortSensor(SensorThread, InternalMsgQ):
 
     def handle_current_version_data(self):
         """Contains logic to check and send alert if data has version == 1."""
+        stored_alert = dict(self.sas_phy_stored_alert)
         # Compare current status of each port with previous alert_type
         for port, value in self.sas_phy_stored_alert.items():
             if port in ['version','conn']:
@@ -301,8 +303,9 @@ class SASPortSensor(SensorThread, InternalMsgQ):
                 self.sas_phy_stored_alert[port] = alert_type
         # See if conn failure/conn resolved alert needs to be sent
         self.check_and_send_conn_alert()
-        # Save data to store
-        store.put(self.sas_phy_stored_alert, self.SAS_PORT_SENSOR_DATA)
+        # Save data to store if an alert was sent
+        if self.sas_phy_stored_alert != stored_alert:
+            store.put(self.sas_phy_stored_alert, self.SAS_PORT_SENSOR_DATA)
 
     def check_and_send_alert(self):
         """Checks whether conditions are met and sends alert if required
@@ -354,11 +357,15 @@ class SASPortSensor(SensorThread, InternalMsgQ):
         self._read_my_msgQ_noWait()
 
         try:
+            # Only the phys whose link rate changed since the last run
             phy_link_rate_dict = \
-                self._utility_instance.get_phy_negotiated_link_rate()
+                self._utility_instance.get_phy_negotiated_link_rate_changes()
             if phy_link_rate_dict:
                 for key, value in phy_link_rate_dict.items():
                     link_rate = value.strip()
+                    if key not in self.phy_dir_to_linkrate_mapping:
+                        # Phys appearing after startup are not monitored
+                        continue
                     prev_linkrate_value = \
                         self.phy_dir_to_linkrate_mapping[key][0].strip()
                     prev_alert_type = \
@@ -394,8 +401,7 @@ class SASPortSensor(SensorThread, InternalMsgQ):
                 # Get current phy status i.e number of Up phys
                 new_phy_link_count = self.phy_link_count + new_phy_up - new_phy_down
 
-                # Get the last sent alert info
-                self.sas_phy_stored_alert = store.get(self.SAS_PORT_SENSOR_DATA)
+                # The last sent alert info is in self.sas_phy_stored_alert
                 self.check_and_send_alert()
                 # Update current active phy count for next iteration
                 self.phy_link_count = new_phy_link_count
@@ -403,7 +409,7 @@ class SASPortSensor(SensorThread, InternalMsgQ):
         except Exception as ae:
             logger.exception(ae)
 
-        # Fire every 30 seconds to see if there's a change in the phy status
+        # Fire every polling_interval seconds to see if there's a change in the phy status
         self._scheduler.enter(self.polling_interval, self._priority, self.run, ())
 
     def _create_json_message(self, alert_type, port):
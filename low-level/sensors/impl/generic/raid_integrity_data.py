@@ -21,7 +21,6 @@
 import os
 import json
 import time
-import subprocess
 import socket
 import uuid
 
@@ -29,8 +28,9 @@ from datetime import datetime
 
 from framework.base.module_thread import SensorThread
 from framework.base.internal_msgQ import InternalMsgQ
-from framework.base.sspl_constants import COMMON_CONFIGS, RaidDataConfig, RaidAlertMsgs, WAIT_BEFORE_RETRY, PRODUCT_FAMILY
+from framework.base.sspl_constants import COMMON_CONFIGS, RaidDataConfig, RaidAlertMsgs, PRODUCT_FAMILY
 from framework.utils.severity_reader import SeverityReader
+from framework.utils.raid_scrub import RAIDScrubScheduler
 from framework.utils.service_logging import logger
 
 # Modules that receive messages from this module
@@ -57,11 +57,16 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
     RACK_ID = "rack_id"
     POLLING_INTERVAL = "polling_interval"
     TIMESTAMP_FILE_PATH_KEY = "timestamp_file_path"
+    SCRUB_MAX_PARALLEL = "scrub_max_parallel"
+    SCRUB_SPEED_MIN = "scrub_speed_min"
+    SCRUB_SPEED_MAX = "scrub_speed_max"
+    SCRUB_CHECKPOINT_PATH = "scrub_checkpoint_path"
 
     # check once a week (below time is in seconds), the integrity of raid data
     DEFAULT_POLLING_INTERVAL = "604800"
     DEFAULT_RAID_DATA_PATH = f"/var/{PRODUCT_FAMILY}/sspl/data/raid_integrity/"
     DEFAULT_TIMESTAMP_FILE_PATH = DEFAULT_RAID_DATA_PATH + "last_execution_time"
+    DEFAULT_SCRUB_CHECKPOINT_PATH = DEFAULT_RAID_DATA_PATH + "scrub_checkpoint"
 
     alert_type = None
 
@@ -81,6 +86,7 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
         super(RAIDIntegritySensor, self).__init__(self.SENSOR_NAME,
                                          self.PRIORITY)
         self._cache_state = None
+        self._scrub = None
 
     def initialize(self, conf_reader, msgQlist, product):
         """initialize configuration reader and internal msg queues"""
@@ -106,6 +112,15 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
                                     self.RAIDIntegritySensor, self.TIMESTAMP_FILE_PATH_KEY, self.DEFAULT_TIMESTAMP_FILE_PATH)
         self._polling_interval = int(self._conf_reader._get_value_with_default(
                                 self.RAIDIntegritySensor, self.POLLING_INTERVAL, self.DEFAULT_POLLING_INTERVAL))
+        self._scrub = RAIDScrubScheduler(
+            self._conf_reader._get_value_with_default(
+                self.RAIDIntegritySensor, self.SCRUB_CHECKPOINT_PATH, self.DEFAULT_SCRUB_CHECKPOINT_PATH),
+            max_parallel=int(self._conf_reader._get_value_with_default(
+                self.RAIDIntegritySensor, self.SCRUB_MAX_PARALLEL, 0)),
+            speed_min=int(self._conf_reader._get_value_with_default(
+                self.RAIDIntegritySensor, self.SCRUB_SPEED_MIN, 0)),
+            speed_max=int(self._conf_reader._get_value_with_default(
+                self.RAIDIntegritySensor, self.SCRUB_SPEED_MAX, 0)))
         return True
 
     def read_data(self):
@@ -131,78 +146,47 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
         self._read_my_msgQ_noWait()
 
         try:
-            #cleanup
-            self._cleanup()
-
-            # Log RAIDIntegritySensor execution timestamp
+            started, finished = self._scrub.get_last_cycle()
+            current_time = int(time.time())
+            if finished is None or current_time - started >= int(DEFAULT_POLLING_INTERVAL):
+                #cleanup
+                self._cleanup()
+
+                # Validate the raid data files and notify the node data msg handler
+                if not self._raid_health_monitor():
+                    # Shutting down, the checkpoint has the arrays left
+                    return
+                started, finished = self._scrub.get_last_cycle()
+
+            # Log RAIDIntegritySensor execution timestamp, the start of the
+            # last scrub cycle, which may have run before a restart
             self._create_file(self._timestamp_file_path)
-            self._log_timestamp()
-
-            # Validate the raid data files and notify the node data msg handler
-            self._raid_health_monitor()
+            self._log_timestamp(started)
 
-
-            with open(self._timestamp_file_path, "r") as timestamp_file:
-                last_processed_log_timestamp = timestamp_file.read().strip()
-                current_time = int(time.time())
-                if current_time > int(last_processed_log_timestamp):
-                    self._polling_interval = int(DEFAULT_POLLING_INTERVAL) - (current_time - int(last_processed_log_timestamp))
+            current_time = int(time.time())
+            if started is not None and current_time > started:
+                self._polling_interval = max(int(DEFAULT_POLLING_INTERVAL) - (current_time - started), 0)
             logger.info("Scheduling RAID validate again after:{} seconds".format(self._polling_interval))
             self._scheduler.enter(self._polling_interval, self._priority, self.run, ())
         except Exception as ae:
             logger.exception(ae)
 
     def _raid_health_monitor(self):
+        """Checks the RAID devices not checked yet in the current scrub
+           cycle, returns False if stopped before all of them were"""
         try:
             devices = self._get_devices()
             if len(devices) == 0:
-                return
+                return True
             logger.debug("Fetched devices:{}".format(devices))
-            
-            for device in devices:
-                # Update the state as 'check' for RAID device file
-                result = self._update_raid_device_file(device)
-                if result == "failed":
-                    self._retry_execution(self._update_raid_device_file, device)
-                logger.info("RAID device state is changed to 'check'")
-    
-                # Check RAID device array state is 'idle' or not
-                result = self._check_raid_state(device)
-                if result == "failed":
-                    logger.warning("'Idle' state not found for RAID device:{}"
-                                    .format(device))
-                    # Retry to check RAID state
-                    self._retry_execution(self._check_raid_state, device)
-                logger.info("'idle' state is found in Raid device:{}."
-                             .format(device))
-
-                # Check Mismatch count in RAID device files.
-                result = self._check_mismatch_count(device)
-                if result == "failed":
-                    # Persist RAID device fault state and send alert
-                    fault_status_file = self.DEFAULT_RAID_DATA_PATH + device + "_" + RaidDataConfig.RAID_MISMATCH_FAULT_STATUS.value
-                    if os.path.exists(fault_status_file):
-                        with open(fault_status_file, 'r') as fs:
-                            data = fs.read().rstrip()
-                        if self.FAULT_RESOLVED in data:
-                            self.alert_type = self.FAULT
-                            self._alert_msg = RaidAlertMsgs.MISMATCH_MSG.value
-                            self._send_json_msg(self.alert_type, device, self._alert_msg)
-                            self._update_fault_state_file(device, self.FAULT, fault_status_file)
-                    else:
-                        self.alert_type = self.FAULT
-                        self._alert_msg = RaidAlertMsgs.MISMATCH_MSG.value
-                        self._send_json_msg(self.alert_type, device, self._alert_msg)
-                        self._update_fault_state_file(device, self.FAULT, fault_status_file)
-
-                    # Retry to check mismatch_cnt
-                    self._retry_execution(self._check_mismatch_count, device)
-                logger.debug("No mismatch count is found in Raid device:{}"
-                            .format(device))
 
+            # Checks of devices sharing no disk run together, each one
+            # is reported by _check_mismatch_count as it ends
+            return self._scrub.scrub(devices, self._check_mismatch_count)
         except Exception as ae:
             logger.error("Failed in monitoring RAID health. ERROR:{}"
                          .format(str(ae)))
+            return True
 
     def _get_devices(self):
         try:
@@ -222,108 +206,43 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
                         .format(str(ae)))
             raise
 
-    def _check_mismatch_count(self, device):
+    def _check_mismatch_count(self, device, mismatch_count):
+        """Raises or resolves the mismatch fault of device from the
+           mismatch_cnt its check ended with"""
         try:
-            status = None
-            raid_dir = RaidDataConfig.DIR.value
-            mismatch_cnt_file = RaidDataConfig.MISMATCH_COUNT_FILE.value
-            MISMATCH_COUNT_COMMAND = 'cat ' + raid_dir + device + mismatch_cnt_file
-            logger.debug('Executing MISMATCH_CNT_COMMAND:{}'
-                         .format(MISMATCH_COUNT_COMMAND))
-            response, error = self._run_command(MISMATCH_COUNT_COMMAND)
-            if error:
-                logger.error("Error in cmd{} in raid health monitor"
-                            .format(MISMATCH_COUNT_COMMAND))
-            if response == RaidDataConfig.MISMATCH_COUNT_RESPONSE.value:
-                logger.debug("No mismatch count is found")
-                status = "success"
-                with open(self.output_file, 'a') as raid_file:
-                    raid_file.write(RaidDataConfig.MISMATCH_COUNT_RESPONSE.value)
-                fault_status_file = self.DEFAULT_RAID_DATA_PATH + device + "_"+ RaidDataConfig.RAID_MISMATCH_FAULT_STATUS.value
-                if os.path.exists(fault_status_file):
-                    with open(fault_status_file, 'r') as fs:
-                        data = fs.read().rstrip()
-                    if self.FAULT in data:
-                        faulty_device = data.split(":")[0].rstrip()
-                        if device == faulty_device:
-                            self.alert_type = self.FAULT_RESOLVED
-                            self._alert_msg = "Mismatch_cnt found '0' for " + device
-                            self._send_json_msg(self.alert_type, device, self._alert_msg)
-                            self._update_fault_state_file(device, self.FAULT_RESOLVED, fault_status_file)
+            self.output_file = self._get_unique_filename(RaidDataConfig.RAID_RESULT_FILE_PATH.value, device)
+            with open(self.output_file, 'w') as raid_file:
+                raid_file.write(RaidDataConfig.STATE_COMMAND_RESPONSE.value + "\n")
+                raid_file.write(str(mismatch_count))
+
+            fault_status_file = self.DEFAULT_RAID_DATA_PATH + device + "_" + RaidDataConfig.RAID_MISMATCH_FAULT_STATUS.value
+            data = None
+            if os.path.exists(fault_status_file):
+                with open(fault_status_file, 'r') as fs:
+                    data = fs.read().rstrip()
+
+            if str(mismatch_count) == RaidDataConfig.MISMATCH_COUNT_RESPONSE.value:
+                logger.debug("No mismatch count is found in Raid device:{}"
+                             .format(device))
+                if data and self.FAULT in data:
+                    faulty_device = data.split(":")[0].rstrip()
+                    if device == faulty_device:
+                        self.alert_type = self.FAULT_RESOLVED
+                        self._alert_msg = "Mismatch_cnt found '0' for " + device
+                        self._send_json_msg(self.alert_type, device, self._alert_msg)
+                        self._update_fault_state_file(device, self.FAULT_RESOLVED, fault_status_file)
             else:
-                status = "failed"
-                logger.debug("Mismatch found in {} file in raid_integrity_data!"
-                             .format(mismatch_cnt_file))
-            return status
+                logger.debug("Mismatch count {} found in Raid device:{}"
+                             .format(mismatch_count, device))
+                # Persist RAID device fault state and send alert
+                if data is None or self.FAULT_RESOLVED in data:
+                    self.alert_type = self.FAULT
+                    self._alert_msg = RaidAlertMsgs.MISMATCH_MSG.value
+                    self._send_json_msg(self.alert_type, device, self._alert_msg)
+                    self._update_fault_state_file(device, self.FAULT, fault_status_file)
         except Exception as ae:
             logger.error("Failed in checking mismatch_cnt in RAID file. ERROR:{}"
                          .format(str(ae)))
-            raise
-
-    def _check_raid_state(self, device):
-        try:
-            status = None
-            raid_check = 0
-            raid_dir = RaidDataConfig.DIR.value
-            sync_action_file = RaidDataConfig.SYNC_ACTION_FILE.value
-            while raid_check <= RaidDataConfig.MAX_RETRIES.value:
-                self.output_file = self._get_unique_filename(RaidDataConfig.RAID_RESULT_FILE_PATH.value, device)
-                STATE_COMMAND = 'cat ' + raid_dir + device + sync_action_file
-                logger.debug('Executing STATE_COMMAND:{}'.format(STATE_COMMAND))
-                response, error = self._run_command(STATE_COMMAND)
-                if error:
-                    logger.warn("Error in cmd{} in raid health monitor"
-                                .format(STATE_COMMAND))
-                    raid_check += 1
-                else:
-                    if response == RaidDataConfig.STATE_COMMAND_RESPONSE.value:
-                        status = "success"
-                        with open(self.output_file, 'w') as raid_file:
-                            raid_file.write(RaidDataConfig.STATE_COMMAND_RESPONSE.value + "\n")
-                        break
-                    else:
-                        status = "failed"
-                        raid_check += 1
-                        time.sleep(WAIT_BEFORE_RETRY)
-            return status
-        except Exception as ae:
-            logger.error("Failed in checking RAID device state. ERROR:{}"
-                        .format(str(ae)))
-            raise
-
-    def _update_raid_device_file(self, device):
-        try:
-            status = "failed"
-            raid_check = 0
-            raid_dir = RaidDataConfig.DIR.value
-            sync_action_file = RaidDataConfig.SYNC_ACTION_FILE.value
-            while raid_check <= RaidDataConfig.MAX_RETRIES.value:
-                CHECK_COMMAND = "echo 'check' |sudo tee " + raid_dir + device + sync_action_file + " > /dev/null"
-                logger.debug('Executing CHECK_COMMAND:{}'.format(CHECK_COMMAND))
-                response, error = self._run_command(CHECK_COMMAND)
-                if error:
-                    logger.warn("Failed in executing command:{}."
-                                .format(error))
-                    raid_check += 1
-                    time.sleep(1)
-                else:
-                    logger.debug("RAID device state is changed to 'check' with response : {}".format(response))
-                    status = "success"
-                    break
-            return status
-        except Exception as ae:
-            logger.error("Failed to update RAID File. ERROR:{}"
-                         .format(str(ae)))
-            raise
-
-    def _retry_execution(self, function_call, device):
-        while True:
-            logger.debug("Executing function:{} after {} time interval"
-                         .format(function_call, RaidDataConfig.NEXT_ITERATION_TIME.value))
-            time.sleep(RaidDataConfig.NEXT_ITERATION_TIME.value)
-            result = function_call(device)
-            if result == self.SUCCESS:
-                return
 
     def _get_unique_filename(self, filename, device):
         unique_timestamp = datetime.now().strftime("%d-%m-%Y_%I-%M-%S-%p")
@@ -391,20 +310,10 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
         super(RAIDIntegritySensor, self).resume()
         self._suspended = False
 
-    def _run_command(self, command):
-        """Run the command and get the response and error returned"""
-        logger.debug(f"_run_command: {command}")
-        process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        response, error = process.communicate()
-        if response:
-            logger.debug(f"_run_command, response: {str(response)}")
-        if error:
-            logger.debug(f"_run_command: error: {str(error)}")
-
-        return response.decode().rstrip('\n'), error.decode().rstrip('\n')
-
     def shutdown(self):
         """Clean up scheduler queue and gracefully shutdown thread"""
+        if self._scrub is not None:
+            self._scrub.stop()
         super(RAIDIntegritySensor, self).shutdown()
 
     def _create_file(self, path):
@@ -417,8 +326,8 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
             file.close()
 
 
-    def _log_timestamp(self):
-        current_time = str(int(time.time()))
+    def _log_timestamp(self, timestamp=None):
+        current_time = str(int(timestamp or time.time()))
         with open(self._timestamp_file_path, "w") as timestamp_file:
             timestamp_file.write(current_time)
 
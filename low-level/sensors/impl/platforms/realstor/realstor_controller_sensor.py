@@ -94,6 +94,9 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
         if self.pollfreq_controllersensor == 0:
                 self.pollfreq_controllersensor = self.rssencl.pollfreq
 
+        self.rssencl.poller.subscribe(
+            self.rssencl.URI_CLIAPI_SHOWCONTROLLERS, self.pollfreq_controllersensor)
+
         # Flag to indicate suspension of module
         self._suspended = False
 
@@ -166,7 +169,8 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
         """
         url = self.rssencl.build_url(self.rssencl.URI_CLIAPI_SHOWCONTROLLERS)
 
-        response = self.rssencl.ws_request(url, self.rssencl.ws.HTTP_GET)
+        poll = self.rssencl.poller.get(self.rssencl.URI_CLIAPI_SHOWCONTROLLERS)
+        response = poll.response
 
         if not response:
             logger.warn(f"{self.rssencl.LDR_R1_ENCL}:: Controllers status unavailable as ws request {url}")
@@ -178,7 +182,7 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
                      err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = poll.data
         controllers = response_data.get("controllers")
         return controllers
 
@@ -141,6 +141,9 @@ class RealStorLogicalVolumeSensor(SensorThread, InternalMsgQ):
         if self.pollfreq_logical_volume_sensor == 0:
                 self.pollfreq_logical_volume_sensor = self.rssencl.pollfreq
 
+        self.rssencl.poller.subscribe(
+            self.rssencl.URI_CLIAPI_SHOWDISKGROUPS, self.pollfreq_logical_volume_sensor)
+
         # Flag to indicate suspension of module
         self._suspended = False
 
@@ -232,7 +235,8 @@ class RealStorLogicalVolumeSensor(SensorThread, InternalMsgQ):
         """
         url = self.rssencl.build_url(self.rssencl.URI_CLIAPI_SHOWDISKGROUPS)
 
-        response = self.rssencl.ws_request(url, self.rssencl.ws.HTTP_GET)
+        poll = self.rssencl.poller.get(self.rssencl.URI_CLIAPI_SHOWDISKGROUPS)
+        response = poll.response
 
         if not response:
             logger.warn(f"{self.rssencl.LDR_R1_ENCL}:: Disk Groups status unavailable as ws request {url} failed")
@@ -244,7 +248,7 @@ class RealStorLogicalVolumeSensor(SensorThread, InternalMsgQ):
                      err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = poll.data
         disk_groups = response_data.get("disk-groups")
         return disk_groups
 
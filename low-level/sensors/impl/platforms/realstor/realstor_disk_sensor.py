@@ -21,6 +21,7 @@
  ****************************************************************************
 """
 
+import os
 import json
 import time
 import socket
@@ -107,6 +108,9 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
         if self.pollfreq_disksensor == 0:
                 self.pollfreq_disksensor = self.rssencl.pollfreq
 
+        self.rssencl.poller.subscribe(
+            self.rssencl.URI_CLIAPI_SHOWDISKS + "/detail", self.pollfreq_disksensor)
+
         # Flag to indicate suspension of module
         self._suspended = False
 
@@ -281,18 +285,18 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
         """Retreive realstor disk info using cli api /show/disks"""
 
         # make ws request
-        url = self.rssencl.build_url(
-                  self.rssencl.URI_CLIAPI_SHOWDISKS)
+        uri = self.rssencl.URI_CLIAPI_SHOWDISKS
 
         if(disk != self.RSS_DISK_GET_ALL):
            diskId = disk.partition("0.")[2]
 
            if(diskId.isdigit()):
-               url = f"{url}/{disk}"
-        url = f"{url}/detail"
+               uri = f"{uri}/{disk}"
+        uri = f"{uri}/detail"
+        url = self.rssencl.build_url(uri)
 
-        response = self.rssencl.ws_request(
-                        url, self.rssencl.ws.HTTP_GET)
+        poll = self.rssencl.poller.get(uri)
+        response = poll.response
 
         if not response:
             logger.warn(f"{self.rssencl.LDR_R1_ENCL}:: Disks status unavailable as ws request {url} failed")
@@ -304,10 +308,7 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
                        err {response.status_code}")
             return
 
-        try:
-            jresponse = json.loads(response.content)
-        except ValueError as badjson:
-            logger.error(f"{url} returned mal-formed json:\n{badjson}")
+        jresponse = poll.data
 
         if jresponse:
             api_resp = self.rssencl.get_api_status(jresponse['status'])
@@ -326,41 +327,43 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
                 self.latest_disks = {}
                 self.invalidate_latest_disks_info = False
 
-                for drive in drives:
-                    slot = drive.get("slot", -1)
+                drives = [drive for drive in drives if drive.get("slot", -1) != -1]
+                dcache_paths = [f"{self.disks_prcache}disk_{drive['slot']}.json"
+                                for drive in drives]
+
+                # Read the persistent cache of all the drives in one request
+                prevdrives, ret_val = store.get_many(dcache_paths)
+                if ret_val != "Success":
+                    # Invalidate latest disks info if persistence store error encountered
+                    logger.warn(f"store.get_many {self.disks_prcache} return value {ret_val}")
+                    self.invalidate_latest_disks_info = True
+                    drives = []
+
+                updates = {}
+                for drive, dcache_path in zip(drives, dcache_paths):
+                    slot = drive["slot"]
                     sn = drive.get("serial-number", "NA")
                     health = drive.get("health", "NA")
 
-                    if slot != -1:
-                        self.latest_disks[slot] = {"serial-number":sn, "health":health}
-
-                        #dump drive data to persistent cache
-                        dcache_path = f"{self.disks_prcache}disk_{slot}.json"
-
-                        # If drive is replaced, previous drive info needs
-                        # to be retained in disk_<slot>.json.prev file and
-                        # then only dump new data to disk_<slot>.json
-                        path_exists, ret_val = store.exists(dcache_path)
-                        if path_exists and ret_val == "Success":
-                            prevdrive = store.get(dcache_path)
-
-                            if prevdrive is not None:
-                                prevsn = prevdrive.get("serial-number","NA")
-                                prevhealth = prevdrive.get("health", "NA")
-
-                                if prevsn != sn or prevhealth != health:
-                                    # Rename path
-                                    store.put(store.get(dcache_path), dcache_path + ".prev")
-                                    store.delete(dcache_path)
-
-                                    store.put(drive, dcache_path)
-                        elif not path_exists and ret_val == "Success":
-                            store.put(drive, dcache_path)
-                        else:
-                            # Invalidate latest disks info if persistence store error encountered
-                            logger.warn(f"store.exists {dcache_path} return value {ret_val}")
-                            self.invalidate_latest_disks_info = True
-                            break
+                    self.latest_disks[slot] = {"serial-number":sn, "health":health}
+
+                    # If drive is replaced, previous drive info needs
+                    # to be retained in disk_<slot>.json.prev file and
+                    # then only dump new data to disk_<slot>.json
+                    prevdrive = prevdrives.get(dcache_path)
+                    if prevdrive is not None:
+                        prevsn = prevdrive.get("serial-number","NA")
+                        prevhealth = prevdrive.get("health", "NA")
+
+                        if prevsn != sn or prevhealth != health:
+                            updates[dcache_path + ".prev"] = prevdrive
+                            updates[dcache_path] = drive
+                    else:
+                        updates[dcache_path] = drive
+
+                #dump changed drives data to persistent cache in one request
+                if updates and not store.put_many(updates):
+                    logger.warn("RealStorDiskSensor: failed to persist the disk cache")
 
                 if self.invalidate_latest_disks_info is True:
                     # Reset latest disks info
@@ -378,17 +381,19 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
     def _rss_build_disk_cache_from_persistent_cache(self):
         """Retreive realstor system state info using cli api /show/system"""
 
-        files = store.get_keys_with_prefix(self.disks_prcache)
+        # Read all the cached drives in one request
+        files = {os.path.basename(path): drive
+                 for path, drive in store.get_recursive(self.disks_prcache).items()}
 
         if not files:
             logger.debug("No files in Disk cache folder, ignoring")
             return
 
-        for filename in files:
+        for filename in list(files):
             if filename.startswith('disk_') and filename.endswith('.json'):
                 if f"{filename}.prev" in files:
                     filename = f"{filename}.prev"
-                drive = store.get(self.disks_prcache + filename)
+                drive = files[filename]
                 slotstr = re.findall("disk_(\d+).json", filename)[0]
 
                 if not slotstr.isdigit():
@@ -91,6 +91,9 @@ class RealStorFanSensor(SensorThread, InternalMsgQ):
         if self.pollfreq_fansensor == 0:
                 self.pollfreq_fansensor = self.rssencl.pollfreq
 
+        self.rssencl.poller.subscribe(
+            self.rssencl.URI_CLIAPI_SHOWFANMODULES, self.pollfreq_fansensor)
+
         # Flag to indicate suspension of module
         self._suspended = False
 
@@ -223,8 +226,8 @@ class RealStorFanSensor(SensorThread, InternalMsgQ):
         url = self.rssencl.build_url(
                   self.rssencl.URI_CLIAPI_SHOWFANMODULES)
 
-        response = self.rssencl.ws_request(
-                        url, self.rssencl.ws.HTTP_GET)
+        poll = self.rssencl.poller.get(self.rssencl.URI_CLIAPI_SHOWFANMODULES)
+        response = poll.response
 
         if not response:
             logger.warn(f"{self.rssencl.LDR_R1_ENCL}:: Fan-modules status unavailable as ws request {url} failed")
@@ -237,7 +240,7 @@ class RealStorFanSensor(SensorThread, InternalMsgQ):
                                {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = poll.data
 
         fan_modules_list = response_data["fan-modules"]
         return fan_modules_list
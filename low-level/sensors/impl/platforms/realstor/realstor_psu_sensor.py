@@ -93,6 +93,9 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
         if self.pollfreq_psusensor == 0:
                 self.pollfreq_psusensor = self.rssencl.pollfreq
 
+        self.rssencl.poller.subscribe(
+            self.rssencl.URI_CLIAPI_SHOWPSUS, self.pollfreq_psusensor)
+
         # Flag to indicate suspension of module
         self._suspended = False
 
@@ -165,8 +168,8 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
         url = self.rssencl.build_url(
                   self.rssencl.URI_CLIAPI_SHOWPSUS)
 
-        response = self.rssencl.ws_request(
-                        url, self.rssencl.ws.HTTP_GET)
+        poll = self.rssencl.poller.get(self.rssencl.URI_CLIAPI_SHOWPSUS)
+        response = poll.response
 
         if not response:
             logger.warn(f"{self.rssencl.LDR_R1_ENCL}:: PSUs status unavailable as ws request {url} failed")
@@ -178,7 +181,7 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
                                        with err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = poll.data
         psus = response_data.get("power-supplies")
         return psus
 
@@ -84,6 +84,9 @@ class RealStorSideplaneExpanderSensor(SensorThread, InternalMsgQ):
         if self.pollfreq_sideplane_expander_sensor == 0:
                 self.pollfreq_sideplane_expander_sensor = self.rssencl.pollfreq
 
+        self.rssencl.poller.subscribe(
+            self.rssencl.URI_CLIAPI_SHOWENCLOSURE, self.pollfreq_sideplane_expander_sensor)
+
         # Flag to indicate suspension of module
         self._suspended = False
 
@@ -157,8 +160,8 @@ class RealStorSideplaneExpanderSensor(SensorThread, InternalMsgQ):
         url = self.rssencl.build_url(
                   self.rssencl.URI_CLIAPI_SHOWENCLOSURE)
 
-        response = self.rssencl.ws_request(
-                        url, self.rssencl.ws.HTTP_GET)
+        poll = self.rssencl.poller.get(self.rssencl.URI_CLIAPI_SHOWENCLOSURE)
+        response = poll.response
 
         if not response:
             logger.warn(f"{self.rssencl.LDR_R1_ENCL}:: Enclosure status unavailable as ws request {url} failed")
@@ -170,7 +173,7 @@ class RealStorSideplaneExpanderSensor(SensorThread, InternalMsgQ):
                                       err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = poll.data
         encl_drawers = response_data["enclosures"][0]["drawers"]
         if encl_drawers:
             for drawer in encl_drawers:
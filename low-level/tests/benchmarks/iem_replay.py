@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Replays a synthetic IEM syslog file through
+                    IEMSensor._process_iem and reports IEMs/sec, with the
+                    former per line timestamp checkpoint and through the
+                    offset tracking LogTailer. The IEC decoding is also
+                    timed against a linear scan of the mapping CSV files.
+ ****************************************************************************
+"""
+
+import os
+import sys
+import csv
+import time
+import random
+import tempfile
+import argparse
+
+LOW_LEVEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+sys.path.insert(0, LOW_LEVEL)
+sys.path.insert(0, os.path.join(LOW_LEVEL, 'framework'))
+
+from framework.utils.iec_mapping import IECMapping
+from framework.utils.log_tailer import LogTailer
+from json_msgs.schema_registry import schema_registry
+from sensors.impl.generic.iem_sensor import IEMSensor
+
+MAPPING_PATH = os.path.join(LOW_LEVEL, 'files', 'iec_mapping')
+SCHEMA_PATH = os.path.join(LOW_LEVEL, 'json_msgs', 'schemas')
+
+
+def csv_scan_decode(code):
+    """Decoding as done before the in memory index, one CSV scan per lookup"""
+    component_id, module_id, event_id = code[:3], code[3:6], code[6:]
+    component = None
+    with open(os.path.join(MAPPING_PATH, "components"), newline='') as f:
+        for row in csv.reader(f):
+            if component_id == row[0]:
+                component = row[1]
+                break
+    if not component:
+        return component_id, module_id, event_id
+    with open(os.path.join(MAPPING_PATH, component), newline='') as f:
+        for row in csv.reader(f):
+            if code == row[0]:
+                return component, row[1], row[2]
+    return component, module_id, event_id
+
+
+def mapped_codes():
+    codes = []
+    for name in os.listdir(MAPPING_PATH):
+        if name == IECMapping.COMPONENTS_FILE:
+            continue
+        with open(os.path.join(MAPPING_PATH, name), newline='') as f:
+            codes.extend(row[0] for row in csv.reader(f) if row)
+    return codes
+
+
+def write_syslog(path, count, codes):
+    with open(path, "w") as f:
+        for index in range(count):
+            timestamp = "2020-10-01T10:%02d:%02d.%06d+05:30" % (
+                (index // 60) % 60, index % 60, index % 1000000)
+            severity = random.choice("EWI")
+            f.write(f"{timestamp} srvnode-1 IEC: {severity}S{random.choice(codes)}:"
+                    f"synthetic IEM number {index}\n")
+
+
+def rate(func, items):
+    start = time.time()
+    for item in items:
+        func(item)
+    return len(items) / (time.time() - start)
+
+
+def per_line_checkpoint(sensor, lines):
+    """Processing as done before LogTailer, the timestamp file is
+       rewritten after every IEM"""
+    for line in lines:
+        sensor._process_iem(line)
+        with open(sensor._timestamp_file_path, "w") as timestamp_file:
+            timestamp_file.write(line[:line.index(" ")])
+    return len(lines)
+
+
+def tailer_checkpoint(sensor, syslog_path, checkpoint_path):
+    tailer = LogTailer(syslog_path, checkpoint_path)
+    tailer.open()
+    count = 0
+    while True:
+        lines = tailer.read_lines()
+        if not lines:
+            break
+        for line in lines:
+            sensor._process_iem(line)
+        count += len(lines)
+        tailer.maybe_checkpoint()
+    tailer.close()
+    return count
+
+
+def timed(func, *args):
+    start = time.time()
+    count = func(*args)
+    return count / (time.time() - start)
+
+
+class ReplayIEMSensor(IEMSensor):
+    """IEMSensor counting messages instead of writing them to the egress queue"""
+
+    def __init__(self, timestamp_file_path):
+        super(ReplayIEMSensor, self).__init__()
+        self._iec_mapping = IECMapping(MAPPING_PATH)
+        self._timestamp_file_path = timestamp_file_path
+        self._site_id = self._rack_id = self._node_id = self._cluster_id = "001"
+        self.sent = 0
+
+    def _write_internal_msgQ(self, toModule, jsonMsg, event=None):
+        self.sent += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20000,
+                        help="number of IEMs in the synthetic syslog file")
+    args = parser.parse_args()
+
+    schema_registry._resource_path = SCHEMA_PATH
+    codes = mapped_codes()
+    work_dir = tempfile.mkdtemp()
+    syslog_path = os.path.join(work_dir, "iem_messages")
+    write_syslog(syslog_path, args.count, codes)
+
+    lookups = [random.choice(codes) for _ in range(args.count)]
+    mapping = IECMapping(MAPPING_PATH)
+    print("decode, csv scan:      %10.1f lookups/sec" % rate(csv_scan_decode, lookups))
+    print("decode, in memory map: %10.1f lookups/sec" % rate(mapping.decode, lookups))
+
+    checkpoint_path = os.path.join(work_dir, "last_processed_msg_time")
+    sensor = ReplayIEMSensor(checkpoint_path)
+    with open(syslog_path) as f:
+        lines = [line.rstrip() for line in f]
+    print("_process_iem replay:   %10.1f IEMs/sec (%d sent)"
+          % (rate(sensor._process_iem, lines), sensor.sent))
+    print("per line checkpoint:   %10.1f IEMs/sec"
+          % timed(per_line_checkpoint, sensor, lines))
+    os.remove(checkpoint_path)
+    print("LogTailer checkpoint:  %10.1f IEMs/sec"
+          % timed(tailer_checkpoint, sensor, syslog_path, checkpoint_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Reports signed egress messages/sec for the none and pki
+                    libsspl_sec methods, generating a session token per
+                    message as the egress processors did before and through
+                    MessageSigner reusing one session token.
+ ****************************************************************************
+"""
+
+import os
+import sys
+import json
+import time
+import ctypes
+import argparse
+
+LOW_LEVEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+sys.path.insert(0, LOW_LEVEL)
+
+from framework.utils.message_signer import MessageSigner
+
+METHODS = {"none": "sspl_none.so.0", "pki": "sspl_pki.so.0"}
+USERNAME = "sspl-bench"
+AUTHN_TOKEN = "FAKETOKEN1234"
+SESSION_LENGTH = 3600
+
+
+def sample_message(index):
+    return {
+        "username": USERNAME, "expires": SESSION_LENGTH, "time": str(int(time.time())),
+        "message": {"sensor_response_type": {"info": {
+            "resource_type": "enclosure:fru:psu", "resource_id": str(index),
+            "event_time": str(int(time.time()))},
+            "specific_info": json.dumps({"health": "OK", "status": "Up"})}}}
+
+
+def token_per_message(sec_lib, msgs):
+    """Signing as done before MessageSigner, a new session token per message"""
+    sig = ctypes.create_string_buffer(sec_lib.sspl_get_sig_length())
+    for msg in msgs:
+        token = ctypes.create_string_buffer(sec_lib.sspl_get_token_length())
+        sec_lib.sspl_generate_session_token(USERNAME, len(AUTHN_TOKEN) + 1, AUTHN_TOKEN,
+                                            ctypes.c_long(SESSION_LENGTH), token)
+        sec_lib.sspl_sign_message(len(msg) + 1, str(msg), USERNAME, token, sig)
+
+
+def signer(sec_lib, msgs):
+    message_signer = MessageSigner(sec_lib, USERNAME, AUTHN_TOKEN, SESSION_LENGTH)
+    for msg in msgs:
+        message_signer.sign(len(msg) + 1, str(msg))
+
+
+def rate(func, sec_lib, msgs):
+    start = time.time()
+    func(sec_lib, msgs)
+    return len(msgs) / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200,
+                        help="messages signed per run")
+    parser.add_argument("--lib-dir", default="/usr/lib64/libsspl_sec",
+                        help="directory of the sspl_none and sspl_pki method modules")
+    args = parser.parse_args()
+
+    msgs = [sample_message(index) for index in range(args.count)]
+    for method, module in METHODS.items():
+        try:
+            sec_lib = ctypes.CDLL(os.path.join(args.lib_dir, module))
+        except OSError as err:
+            print(f"{method}: skipped, {err}")
+            continue
+        print("%-4s token per message: %10.1f msgs/sec"
+              % (method, rate(token_per_message, sec_lib, msgs)))
+        print("%-4s MessageSigner:     %10.1f msgs/sec"
+              % (method, rate(signer, sec_lib, msgs)))
+
+
+if __name__ == "__main__":
+    main()
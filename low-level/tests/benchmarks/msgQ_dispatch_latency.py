@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Measures end-to-end alert latency through a chain of
+                    internal message queues (sensor -> handler -> egress)
+                    with the 1 second polling scheduler and with event
+                    driven dispatch.
+ ****************************************************************************
+"""
+
+import os
+import sys
+import time
+import queue
+import threading
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from framework.base.module_thread import ScheduledModuleThread
+from framework.base.internal_msgQ import InternalMsgQ
+
+
+class BenchConfReader(object):
+    """Stands in for ConfigReader, returns the dispatch mode under test"""
+
+    def __init__(self, event_driven):
+        self._event_driven = event_driven
+
+    def _get_value_with_default(self, section, key, default_value):
+        if key == ScheduledModuleThread.EVENT_DRIVEN_DISPATCH:
+            return str(self._event_driven).lower()
+        return default_value
+
+
+class ChainModule(ScheduledModuleThread, InternalMsgQ):
+    """Drains its queue like a message handler and forwards each message to
+       the next module, the last module records the arrival time."""
+
+    DISPATCH_ON_MSGQ = True
+
+    def __init__(self, module_name, next_module, latencies):
+        super(ChainModule, self).__init__(module_name, 1)
+        self._next_module = next_module
+        self._latencies = latencies
+
+    def name(self):
+        return self._module_name
+
+    def initialize(self, conf_reader, msgQlist, product):
+        super(ChainModule, self).initialize(conf_reader)
+        self.initialize_msgQ(msgQlist)
+
+    def run(self):
+        while not self._is_my_msgQ_empty():
+            jsonMsg, _ = self._read_my_msgQ()
+            if jsonMsg is None:
+                continue
+            if self._next_module:
+                self._write_internal_msgQ(self._next_module, jsonMsg)
+            else:
+                self._latencies.append(time.time() - jsonMsg["sent"])
+        if self._running:
+            self._scheduler.enter(1, self._priority, self.run, ())
+
+    def _check_debug(self, jsonMsg):
+        return False, jsonMsg
+
+    def _log_debug(self, message):
+        pass
+
+
+def measure(event_driven, alerts, interval):
+    latencies = []
+    names = ["DiskMsgHandler", "RabbitMQegressProcessor"]
+    msgQlist = {"Sensor": queue.Queue()}
+    modules = []
+    for index, name in enumerate(names):
+        next_module = names[index + 1] if index + 1 < len(names) else None
+        msgQlist[name] = queue.Queue()
+        modules.append(ChainModule(name, next_module, latencies))
+
+    # The sensor is only a writer, it never consumes its queue
+    sensor = ChainModule("Sensor", names[0], latencies)
+    sensor.initialize_msgQ(msgQlist)
+
+    threads = []
+    for module in modules:
+        module.initialize(BenchConfReader(event_driven), msgQlist, None)
+        thread = threading.Thread(target=module.start, daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    for _ in range(alerts):
+        time.sleep(interval)
+        sensor._write_internal_msgQ(names[0], {"sent": time.time()})
+
+    deadline = time.time() + 5
+    while len(latencies) < alerts and time.time() < deadline:
+        time.sleep(0.05)
+    for module in modules:
+        module._running = False
+    return sorted(latencies)
+
+
+def report(label, latencies):
+    if not latencies:
+        print("%-14s no alert delivered" % label)
+        return
+    avg = sum(latencies) / len(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print("%-14s alerts=%-5d avg=%8.2f ms  p99=%8.2f ms  max=%8.2f ms"
+          % (label, len(latencies), avg * 1000, p99 * 1000, latencies[-1] * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=20,
+                        help="number of alerts sent through the chain")
+    parser.add_argument("--interval", type=float, default=0.37,
+                        help="seconds between two alerts")
+    args = parser.parse_args()
+
+    report("polling", measure(False, args.alerts, args.interval))
+    report("event driven", measure(True, args.alerts, args.interval))
+
+
+if __name__ == "__main__":
+    main()
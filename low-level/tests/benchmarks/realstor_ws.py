@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Times a RealStor poll cycle (one request per CLI API
+                    resource) against a local mock MC serving the
+                    sspl_test/mock_data responses: a new connection per
+                    request, pooled keep-alive connections, and pooled
+                    connections with concurrent requests.
+ ****************************************************************************
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+LOW_LEVEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+sys.path.insert(0, LOW_LEVEL)
+
+from framework.utils.webservices import WebServices
+
+MOCK_DATA = os.path.join(LOW_LEVEL, '..', 'sspl_test', 'mock_data')
+ENDPOINTS = ["/show/disks", "/show/fan-modules", "/show/power-supplies",
+             "/show/controllers", "/show/enclosure", "/show/system",
+             "/show/sensor-status", "/show/disk-groups", "/show/sas-link-health"]
+
+
+class MockMCHandler(BaseHTTPRequestHandler):
+    """Serves /api/show/<resource> from mock_data/<resource>.txt"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body in one segment, as an MC would send them
+    disable_nagle_algorithm = True
+    latency = 0
+
+    def do_GET(self):
+        name = self.path.replace("/api/show/", "", 1).replace("/", "-")
+        try:
+            with open(os.path.join(MOCK_DATA, f"{name}.txt")) as f:
+                mock = json.load(f)
+            status, body = mock.get("status_code", 200), mock.get("api-response")
+        except (IOError, ValueError):
+            status, body = 404, {}
+        time.sleep(self.latency)
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def new_connection_cycle(base_url, headers):
+    """What WebServices did before, requests.get without a Session"""
+    for endpoint in ENDPOINTS:
+        requests.get(base_url + endpoint, headers=headers, timeout=20).content
+
+
+def pooled_cycle(ws, base_url, headers):
+    for endpoint in ENDPOINTS:
+        ws.ws_request(ws.HTTP_GET, base_url + endpoint, headers, None, 20).content
+
+
+def concurrent_cycle(ws, base_url, headers):
+    urls = [base_url + endpoint for endpoint in ENDPOINTS]
+    for response in ws.ws_request_many(ws.HTTP_GET, urls, headers, None, 20):
+        response.content
+
+
+def rate(func, cycles, *args):
+    start = time.time()
+    for _ in range(cycles):
+        func(*args)
+    return cycles / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=100,
+                        help="poll cycles per client")
+    parser.add_argument("--mc-latency", type=float, default=5,
+                        help="milliseconds the mock MC takes per request")
+    args = parser.parse_args()
+
+    MockMCHandler.latency = args.mc_latency / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockMCHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = "http://127.0.0.1:%d/api" % server.server_address[1]
+    headers = {"datatype": "json", "sessionKey": "benchmark"}
+
+    ws = WebServices()
+    print("new connection per request: %8.1f cycles/sec"
+          % rate(new_connection_cycle, args.cycles, base_url, headers))
+    print("pooled connections:         %8.1f cycles/sec"
+          % rate(pooled_cycle, args.cycles, ws, base_url, headers))
+    print("pooled, concurrent:         %8.1f cycles/sec"
+          % rate(concurrent_cycle, args.cycles, ws, base_url, headers))
+
+    print("\nper endpoint latency (pooled clients):")
+    for endpoint, metric in sorted(ws.get_metrics().items()):
+        print("  %-28s count=%-5d errors=%-3d avg=%7.2f ms  max=%7.2f ms"
+              % (endpoint, metric["count"], metric["errors"],
+                 metric["avg_ms"], metric["max_ms"]))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+"""
+ ****************************************************************************
+  Description:       Times one poll of the SAS phy link rates, walking each
+                    phy directory and reading the negotiated_linkrate file
+                    by name as SysFS did before, and with SASPhyMonitor
+                    reading the files kept open with pread. Uses a fake
+                    sas_phy tree unless --sas-phy-dir is given.
+ ****************************************************************************
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+LOW_LEVEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+sys.path.insert(0, LOW_LEVEL)
+
+from framework.utils.sas_phy_monitor import SASPhyMonitor
+
+# Other attributes of a sysfs sas_phy directory, walked by the former reader
+PHY_ATTRIBUTES = ("device_type", "enable", "initiator_port_protocols",
+                  "invalid_dword_count", "link_reset", "loss_of_dword_sync_count",
+                  "maximum_linkrate", "maximum_linkrate_hw", "minimum_linkrate",
+                  "minimum_linkrate_hw", "phy_identifier", "phy_reset_problem_count",
+                  "running_disparity_error_count", "sas_address",
+                  "target_port_protocols")
+
+
+def make_sas_phy_dir(root, phys):
+    sas_phy_dir = os.path.join(root, "sas_phy")
+    for index in range(phys):
+        phy_dir = os.path.join(sas_phy_dir, f"phy-{index // 16}:{index % 16}")
+        os.makedirs(phy_dir)
+        for attribute in PHY_ATTRIBUTES:
+            with open(os.path.join(phy_dir, attribute), "w") as attribute_file:
+                attribute_file.write("0\n")
+        with open(os.path.join(phy_dir, "negotiated_linkrate"), "w") as link_rate:
+            link_rate.write("12.0 Gbit\n")
+    return sas_phy_dir
+
+
+def walk_poll(phy_dirs):
+    """SysFS.get_phy_negotiated_link_rate before"""
+    link_rates = {}
+    for phy_name, phy_dir in phy_dirs.items():
+        for entry in phy_dir.iterdir():
+            if 'negotiated_linkrate' in str(entry).lower() and entry.is_file():
+                link_rates[phy_name] = entry.read_text()
+    return link_rates
+
+
+def time_polls(poll, polls):
+    start = time.perf_counter()
+    for _ in range(polls):
+        poll()
+    return (time.perf_counter() - start) / polls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phys", type=int, default=1024,
+                        help="phys of the fake sas_phy tree")
+    parser.add_argument("--polls", type=int, default=50,
+                        help="polls timed per reader")
+    parser.add_argument("--sas-phy-dir",
+                        help="read this directory, e.g. /sys/class/sas_phy, instead")
+    args = parser.parse_args()
+
+    root = None
+    sas_phy_dir = args.sas_phy_dir
+    if sas_phy_dir is None:
+        root = tempfile.mkdtemp(prefix="sas_phy_poll")
+        sas_phy_dir = make_sas_phy_dir(root, args.phys)
+
+    try:
+        phy_dirs = {name: Path(sas_phy_dir, name) for name in os.listdir(sas_phy_dir)}
+        monitor = SASPhyMonitor(sas_phy_dir)
+        monitor.get_link_rates()
+
+        walk = time_polls(lambda: walk_poll(phy_dirs), args.polls)
+        pread = time_polls(monitor.get_changes, args.polls)
+        print(f"{len(phy_dirs)} phys")
+        print("%-10s %10.3f ms/poll" % ("walk", walk * 1000))
+        print("%-10s %10.3f ms/poll" % ("pread", pread * 1000))
+        monitor.close()
+    finally:
+        if root is not None:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
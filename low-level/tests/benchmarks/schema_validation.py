@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Compares sensor messages/sec when every message reads,
+                    parses and checks its schema (previous behaviour) with
+                    validation through the process wide schema registry.
+ ****************************************************************************
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+LOW_LEVEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+sys.path.insert(0, LOW_LEVEL)
+
+from jsonschema import Draft3Validator
+from jsonschema import validate
+
+from json_msgs.schema_registry import schema_registry
+from json_msgs.messages.sensors.service_watchdog import ServiceWatchdogMsg
+
+SCHEMA_PATH = os.path.join(LOW_LEVEL, 'json_msgs', 'schemas')
+
+
+def new_msg():
+    return ServiceWatchdogMsg("sshd.service", "active", "inactive",
+                              "running", "dead", "1234", "0")
+
+
+def per_message_schema(msg):
+    """What BaseSensorMsg did for every alert before the registry"""
+    fileName = os.path.join(SCHEMA_PATH, schema_registry.SENSOR_RESPONSE)
+    with open(fileName, 'r') as f:
+        _schema = f.read()
+    schema = json.loads(' '.join(_schema.split()))
+    Draft3Validator.check_schema(schema)
+    validate(msg.normalize_kv(msg._json), schema)
+
+
+def registry(msg):
+    msg.getJson()
+
+
+def rate(func, count):
+    start = time.time()
+    for _ in range(count):
+        func(new_msg())
+    return count / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=2000,
+                        help="number of messages validated per run")
+    args = parser.parse_args()
+
+    # Use the schemas from the source tree rather than the installed ones
+    schema_registry._resource_path = SCHEMA_PATH
+
+    print("per message schema load: %10.1f msgs/sec" % rate(per_message_schema, args.count))
+    print("schema registry:         %10.1f msgs/sec" % rate(registry, args.count))
+
+
+if __name__ == "__main__":
+    main()
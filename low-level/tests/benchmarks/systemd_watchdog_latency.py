@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Runs a SystemdWatchdog against fake systemd and UDisks2
+                    services on a private dbus-daemon, injects synthetic
+                    UDisks2 InterfacesAdded signals and measures the delay
+                    until SystemdWatchdog._interface_added() is called from
+                    the main loop of run(). Also reports the CPU time used
+                    while no signal arrives.
+ ****************************************************************************
+"""
+
+import os
+import sys
+import time
+import queue
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+import collections
+
+import dbus
+import dbus.bus
+import dbus.service
+import dbus.exceptions
+from gi.repository import GObject as gobject
+from dbus.mainloop.glib import DBusGMainLoop
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from sensors.impl.centos_7.systemd_watchdog import SystemdWatchdog
+
+SYSTEMD_NAME = "org.freedesktop.systemd1"
+SYSTEMD_PATH = "/org/freedesktop/systemd1"
+MANAGER_INTERFACE = "org.freedesktop.systemd1.Manager"
+UDISKS_NAME = "org.freedesktop.UDisks2"
+UDISKS_PATH = "/org/freedesktop/UDisks2"
+OBJECT_MANAGER = "org.freedesktop.DBus.ObjectManager"
+# Interface of the synthetic objects, ignored by _interface_added()
+BENCH_INTERFACE = "org.freedesktop.UDisks2.Bench"
+
+
+class FakeSystemd(dbus.service.Object):
+    """systemd1 Manager without any unit"""
+
+    @dbus.service.method(MANAGER_INTERFACE, out_signature="a(ssssssouso)")
+    def ListUnits(self):
+        return dbus.Array([], signature="(ssssssouso)")
+
+    @dbus.service.method(MANAGER_INTERFACE)
+    def Subscribe(self):
+        pass
+
+    @dbus.service.method(MANAGER_INTERFACE, in_signature="s", out_signature="o")
+    def GetUnit(self, unit_name):
+        raise dbus.exceptions.DBusException(f"Unit {unit_name} not loaded.",
+                                            name="org.freedesktop.systemd1.NoSuchUnit")
+
+
+class FakeUDisks(dbus.service.Object):
+    """UDisks2 ObjectManager without any drive, emits InterfacesAdded for
+       synthetic objects on request"""
+
+    @dbus.service.method(OBJECT_MANAGER, out_signature="a{oa{sa{sv}}}")
+    def GetManagedObjects(self):
+        return dbus.Dictionary({}, signature="oa{sa{sv}}")
+
+    @dbus.service.signal(OBJECT_MANAGER, signature="oa{sa{sv}}")
+    def InterfacesAdded(self, object_path, interfaces_and_properties):
+        pass
+
+    @dbus.service.method(BENCH_INTERFACE, in_signature="ud")
+    def Emit(self, signals, interval):
+        """Emits signals InterfacesAdded, one every interval seconds"""
+        sent = iter(range(signals))
+
+        def emit_next():
+            index = next(sent, None)
+            if index is None:
+                return False
+            self.InterfacesAdded(dbus.ObjectPath(f"{UDISKS_PATH}/bench/{index}"),
+                                 {BENCH_INTERFACE: {"Sent": dbus.Double(time.time())}})
+            return True
+
+        gobject.timeout_add(int(interval * 1000), emit_next)
+
+
+def serve(address):
+    """Runs the fake services until terminated, in a process of their own
+       so that the synchronous calls of SystemdWatchdog are answered"""
+    DBusGMainLoop(set_as_default=True)
+    bus = dbus.bus.BusConnection(address)
+    # The names are released once their BusName is collected
+    names = [dbus.service.BusName(SYSTEMD_NAME, bus), dbus.service.BusName(UDISKS_NAME, bus)]
+    FakeSystemd(bus, SYSTEMD_PATH)
+    FakeUDisks(bus, UDISKS_PATH)
+    gobject.MainLoop().run()
+
+
+class BenchConfReader(object):
+    """Stands in for ConfigReader, keeps SystemdWatchdog's data under
+       data_path and monitors no service"""
+
+    def __init__(self, data_path):
+        self._data_path = data_path
+
+    def _get_value_with_default(self, section, key, default_value):
+        if default_value == SystemdWatchdog.DEFAULT_RAS_VOL:
+            return self._data_path
+        return default_value
+
+    def _get_value_list(self, section, key):
+        return []
+
+
+def start_bus():
+    """Starts a private dbus-daemon and returns it with its address"""
+    daemon = subprocess.Popen(["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+                              stdout=subprocess.PIPE, encoding="utf-8")
+    return daemon, daemon.stdout.readline().strip()
+
+
+def wait_for(condition, timeout):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def measure(address, signals, interval, idle):
+    latencies = []
+    data_path = tempfile.mkdtemp(prefix="systemd_watchdog_latency.")
+
+    watchdog = SystemdWatchdog()
+    # No drive is exported, don't ask facter whether SMART can be used
+    watchdog._is_smart_supported = lambda: False
+
+    # Bound before run() connects it to InterfacesAdded
+    interface_added = watchdog._interface_added
+
+    def timed_interface_added(object_path, interfaces_and_properties):
+        sent = interfaces_and_properties.get(BENCH_INTERFACE, {}).get("Sent")
+        if sent is not None:
+            latencies.append(time.time() - sent)
+        interface_added(object_path, interfaces_and_properties)
+
+    watchdog._interface_added = timed_interface_added
+
+    # The messages sent by the watchdog are left in their queues, its own
+    # is created up front as _wait_my_msgQ() looks it up with get()
+    msgQlist = collections.defaultdict(queue.Queue)
+    msgQlist[SystemdWatchdog.name()] = queue.Queue()
+    watchdog.initialize(BenchConfReader(data_path), msgQlist, "")
+    watchdog._running = True
+    thread = threading.Thread(target=watchdog.run, daemon=True)
+    thread.start()
+
+    try:
+        if not wait_for(lambda: watchdog._loop is not None and watchdog._loop.is_running(), 30):
+            sys.exit("SystemdWatchdog did not reach its main loop")
+
+        bench = dbus.bus.BusConnection(address)
+        bench.call_blocking(UDISKS_NAME, UDISKS_PATH, BENCH_INTERFACE, "Emit", "ud",
+                            (signals, interval))
+        wait_for(lambda: len(latencies) >= signals, signals * interval + 5)
+        bench.close()
+
+        # Nothing is sent while idle, only the watchdog's loop and msgQ
+        # watcher use CPU
+        cpu = time.process_time()
+        time.sleep(idle)
+        cpu = time.process_time() - cpu
+    finally:
+        watchdog.shutdown()
+        thread.join(5)
+        shutil.rmtree(data_path, ignore_errors=True)
+    return sorted(latencies), cpu
+
+
+def report(latencies, cpu, idle):
+    if not latencies:
+        print("no signal dispatched")
+        return
+    avg = sum(latencies) / len(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print("signals=%-5d avg=%8.2f ms  p99=%8.2f ms  max=%8.2f ms  idle cpu=%6.2f ms/s"
+          % (len(latencies), avg * 1000, p99 * 1000, latencies[-1] * 1000,
+             cpu * 1000 / idle))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signals", type=int, default=20,
+                        help="number of InterfacesAdded signals sent")
+    parser.add_argument("--interval", type=float, default=0.37,
+                        help="seconds between two signals")
+    parser.add_argument("--idle", type=float, default=5,
+                        help="seconds without signals over which CPU time is measured")
+    parser.add_argument("--serve", metavar="ADDRESS", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return
+
+    try:
+        daemon, address = start_bus()
+    except OSError as err:
+        sys.exit(f"Can't start dbus-daemon: {err}")
+
+    services = None
+    try:
+        services = subprocess.Popen([sys.executable, os.path.abspath(__file__),
+                                     "--serve", address])
+        bus = dbus.bus.BusConnection(address)
+        if not wait_for(lambda: bus.name_has_owner(SYSTEMD_NAME) and
+                                bus.name_has_owner(UDISKS_NAME), 10):
+            sys.exit("The fake systemd and UDisks2 services did not start")
+        bus.close()
+
+        # SystemdWatchdog connects to the system bus
+        os.environ["DBUS_SYSTEM_BUS_ADDRESS"] = address
+        latencies, cpu = measure(address, args.signals, args.interval, args.idle)
+        report(latencies, cpu, args.idle)
+    finally:
+        if services is not None:
+            services.terminate()
+            services.wait()
+        daemon.terminate()
+        daemon.wait()
+
+
+if __name__ == "__main__":
+    main()